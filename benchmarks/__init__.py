@@ -0,0 +1,4 @@
+#!/usr/bin/python
+# encoding:utf-8
+# 
+# copyright (c) Alex Lee, All rights reserved.
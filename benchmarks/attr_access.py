@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Microbenchmark of the attribute access of the pbx-objects.
+
+usage:
+    python benchmarks/attr_access.py [--number N] [--repeat R]
+
+the result is printed as json, the times are nanoseconds per access, the best of R runs of N accesses
+minus the cost of the empty loop.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import json
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxproj
+
+def make_objects(project_dir):
+    """ return {name: object} of the objects to access """
+    xcproj = pbxproj.XcodeProj.create(project_dir, u'Bench', u'8.0')
+    fileref = xcproj.new_object(u'PBXFileReference')
+    fileref.pbx_name = u'main.m'
+    fileref.pbx_sourceTree = u'<group>'
+    fileref.pbx_path = u'main.m'
+    fileref.pbx_usesTabs = u'1' # not declared by PBXFileReference
+    buildfile = xcproj.new_object(u'PBXBuildFile')
+    buildfile.pbx_fileRef = fileref
+    return {
+        u'xcproj': xcproj,
+        u'fileref': fileref,
+        u'buildfile': buildfile,
+        u'group': xcproj.main_group(),
+    }
+
+CASES = [
+    # (name, statement)
+    (u'get_declared', u'fileref.pbx_name'),
+    (u'get_unset', u'fileref.pbx_explicitFileType'),
+    (u'get_undeclared', u'fileref.pbx_usesTabs'),
+    (u'get_isa', u'fileref.isa'),
+    (u'get_guid', u'fileref.guid'),
+    (u'get_method', u'fileref.project'),
+    (u'get_list', u'group.pbx_children'),
+    (u'set_declared', u'fileref.pbx_lastKnownFileType = u"sourcecode.c.objc"'),
+    (u'set_private', u'fileref._set_origin(None)'),
+    (u'set_typed', u'buildfile.pbx_fileRef = fileref'),
+]
+
+def measure(stmt, namespace, number, repeat):
+    """ return the best time of 'repeat' runs of 'number' executions of 'stmt' (seconds) """
+    import time
+    code = u'def _run():\n    for _ in _range:\n        {0}\n'.format(stmt)
+    namespace = dict(namespace, _range=range(number))
+    exec(compile(code, u'<attr_access>', u'exec'), namespace)
+    run = namespace[u'_run']
+    best = None
+    for i in range(repeat):
+        begin = time.time()
+        run()
+        cost = time.time() - begin
+        best = cost if best is None else min(best, cost)
+    return best
+
+def bench(number, repeat):
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-bench-')
+    try:
+        objects = make_objects(os.path.join(workdir, u'project'))
+        loop = measure(u'pass', objects, number, repeat)
+        result = {}
+        for name, stmt in CASES:
+            cost = measure(stmt, objects, number, repeat) - loop
+            result[name] = round(max(cost, 0) * 1e9 / number, 1)
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=u'pbx-object attribute access benchmark')
+    parser.add_argument(u'--number', type=int, default=20000, help=u"number of accesses per run")
+    parser.add_argument(u'--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(bench(args.number, args.repeat), indent=2, sort_keys=True))
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# encoding:utf-8
+# 
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Benchmark the in-process pbxproj parser against the `plutil -convert json` path.
+
+usage:
+    python benchmarks/plist_load.py [path/to/project.pbxproj] [--repeat N] [--scale N ...]
+
+without a pbxproj path, only the synthetic scaling benchmark is run.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import json
+import time
+import subprocess
+
+from xcodeproj.pbxproj import pbxparser
+
+PLUTIL = u'/usr/bin/plutil'
+
+def load_with_plutil(path):
+    """ the old loading path: spawn plutil and decode its json output """
+    p = subprocess.Popen([PLUTIL, u'-convert', u'json', u'-o', u'-', path], \
+        stdout=subprocess.PIPE)
+    stdout, stderr = p.communicate()
+    if not p.returncode == 0:
+        raise ValueError(u'plutil failed: {0}'.format(stderr))
+    return json.loads(stdout)
+
+def timeit(action, repeat):
+    """ return the best wall time of 'repeat' runs """
+    best = None
+    for i in range(repeat):
+        begin = time.time()
+        action()
+        cost = time.time() - begin
+        best = cost if best is None else min(best, cost)
+    return best
+
+def synthetic_pbxproj(count):
+    """ return pbxproj content with 'count' file references and build files """
+    lines = [b'// !$*UTF8*$!', b'{', b'\tarchiveVersion = 1;', b'\tobjects = {']
+    for idx in range(count):
+        fileref = (u'%024X' % (idx * 2)).encode('ascii')
+        buildfile = (u'%024X' % (idx * 2 + 1)).encode('ascii')
+        lines.append(b'\t\t' + buildfile + b' /* f.m in Sources */ = {isa = PBXBuildFile; '
+                     b'fileRef = ' + fileref + b' /* f.m */; settings = {COMPILER_FLAGS = '
+                     b'"-fno-objc-arc -DNAME=\\"x\\""; }; };')
+        lines.append(b'\t\t' + fileref + b' /* f.m */ = {isa = PBXFileReference; '
+                     b'fileEncoding = 4; lastKnownFileType = sourcecode.c.objc; '
+                     b'path = "dir/f' + str(idx).encode('ascii') + b'.m"; '
+                     b'sourceTree = "<group>"; };')
+    lines.extend([b'\t};', b'\trootObject = 000000000000000000000000;', b'}', b''])
+    return b'\n'.join(lines)
+
+def bench_file(path, repeat):
+    result = {
+        u'file': path,
+        u'size': os.path.getsize(path),
+        u'pbxparser': timeit(lambda: pbxparser.load(path), repeat),
+    }
+    if os.path.isfile(PLUTIL):
+        result[u'plutil'] = timeit(lambda: load_with_plutil(path), repeat)
+        assert load_with_plutil(path) == pbxparser.load(path), u'parsers disagree'
+    return result
+
+def bench_scaling(counts, repeat):
+    results = []
+    for count in counts:
+        data = synthetic_pbxproj(count)
+        cost = timeit(lambda: pbxparser.loads(data), repeat)
+        results.append({
+            u'objects': count * 2,
+            u'size': len(data),
+            u'pbxparser': cost,
+            u'us_per_kb': cost * 1e6 / (len(data) / 1024.0),
+        })
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=u'pbxproj load benchmark')
+    parser.add_argument(u'pbxproj', nargs=u'?', help=u'path to a project.pbxproj')
+    parser.add_argument(u'--repeat', type=int, default=3)
+    parser.add_argument(u'--scale', type=int, nargs=u'*', default=[1000, 4000, 16000])
+    args = parser.parse_args()
+
+    report = {u'scaling': bench_scaling(args.scale, args.repeat)}
+    if not args.pbxproj is None:
+        report[u'file'] = bench_file(args.pbxproj, args.repeat)
+    print(json.dumps(report, indent=2, sort_keys=True))
@@ -0,0 +1,171 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Benchmark load / validate / save / addfile / buildsettings on synthetic projects.
+
+A project is generated with XcodeProj.create, PBXProject.new_native_target and projhelper.addfile:
+N targets, each with a source tree of M files nested D directories deep, and C build configurations.
+
+usage:
+    python benchmarks/project_ops.py [--targets N] [--files M] [--depth D] [--configs C]
+                                     [--repeat R] [--keep DIR]
+
+the result is printed as json, the times are the best wall time of R runs (seconds),
+the memory is the peak resident size of the process after each step (KB).
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import json
+import time
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxproj
+from xcodeproj.pbxproj import projhelper
+
+PRODUCT_NAME = u'Bench'
+
+def peak_memory():
+    """ return the peak resident size of the process in KB, None if unknown """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == u'darwin' else rss # bytes on macOS
+
+def timeit(action, repeat):
+    """ return (best wall time of 'repeat' runs, result of the last run) """
+    best = None
+    result = None
+    for i in range(repeat):
+        begin = time.time()
+        result = action()
+        cost = time.time() - begin
+        best = cost if best is None else min(best, cost)
+    return best, result
+
+def make_source_tree(rootdir, files, depth):
+    """ write 'files' source files into a directory chain 'depth' levels deep under 'rootdir' """
+    dirs = [rootdir]
+    for level in range(depth):
+        dirs.append(os.path.join(dirs[-1], u'd{0}'.format(level)))
+    os.makedirs(dirs[-1])
+
+    for idx in range(files):
+        dirpath = dirs[idx % len(dirs)]
+        ext = u'.h' if idx % 3 == 0 else u'.m'
+        with open(os.path.join(dirpath, u'f{0}{1}'.format(idx, ext)), 'w') as fp:
+            fp.write('//\n')
+
+def generate(project_dir, targets, files, depth, configs):
+    """
+    generate a project at 'project_dir', return (project, addfile time)
+    """
+    xcproj = pbxproj.XcodeProj.create(project_dir, PRODUCT_NAME, u'8.0')
+    project = xcproj.pbx_rootObject
+    for idx in range(1, targets):
+        project.new_native_target(u'{0}{1}'.format(PRODUCT_NAME, idx), deployment_target=u'8.0')
+
+    for target in project.pbx_targets:
+        for idx in range(configs):
+            config = target.getconfig(u'Config{0}'.format(idx), auto_create=True)
+            config.set_build_setting(u'GCC_PREPROCESSOR_DEFINITIONS', \
+                [u'$(inherited)', u'CONFIG_{0}=1'.format(idx)])
+
+    cost = 0
+    for target in project.pbx_targets:
+        srcdir = os.path.join(project_dir, target.pbx_name)
+        make_source_tree(srcdir, files, depth)
+        begin = time.time()
+        projhelper.addfile(xcproj, srcdir, xcproj.main_group(), target)
+        cost += time.time() - begin
+    return xcproj, cost
+
+def query_buildsettings(xcproj, resolve=False):
+    """ look up a build setting of every config of every target, return the number of lookups """
+    count = 0
+    for target in xcproj.pbx_rootObject.pbx_targets:
+        for config in target.configurations():
+            xcproj.buildsettings(u'GCC_PREPROCESSOR_DEFINITIONS', target=target, config=config, \
+                resolve=resolve)
+            xcproj.buildsettings(u'PRODUCT_NAME', target=target.pbx_name, config=config.pbx_name, \
+                resolve=resolve)
+            count += 2
+    return count
+
+def bench(workdir, targets, files, depth, configs, repeat):
+    project_dir = os.path.join(workdir, u'project')
+    xcprojpath = os.path.join(project_dir, PRODUCT_NAME + u'.xcodeproj')
+    memory = {}
+    result = {
+        u'params': {
+            u'targets': targets,
+            u'files': files,
+            u'depth': depth,
+            u'configs': configs,
+            u'repeat': repeat,
+        },
+        u'memory_kb': memory,
+    }
+
+    begin = time.time()
+    xcproj, result[u'addfile'] = generate(project_dir, targets, files, depth, configs)
+    result[u'generate'] = time.time() - begin
+    memory[u'generate'] = peak_memory()
+
+    result[u'validate'], _ = timeit(xcproj.validate, 1)
+    result[u'save'], _ = timeit(xcproj.save, 1)
+    result[u'save_unchanged'], _ = timeit(xcproj.save, repeat) # reuses the rendered text
+    memory[u'save'] = peak_memory()
+    result[u'objects'] = len(xcproj.objects().guids())
+    result[u'size'] = os.path.getsize(os.path.join(xcprojpath, u'project.pbxproj'))
+
+    result[u'load'], xcproj = timeit(lambda: pbxproj.XcodeProj.load(xcprojpath), repeat)
+    memory[u'load'] = peak_memory()
+    result[u'load_lazy'], _ = timeit(lambda: pbxproj.XcodeProj.load(xcprojpath, lazy=True), repeat)
+    pbxproj.XcodeProj.clear_cache(xcprojpath)
+    pbxproj.XcodeProj.load(xcprojpath, use_cache=True) # writes the cache
+    result[u'load_cached'], _ = timeit(\
+        lambda: pbxproj.XcodeProj.load(xcprojpath, use_cache=True), repeat)
+    pbxproj.XcodeProj.clear_cache(xcprojpath)
+
+    result[u'validate_loaded'], _ = timeit(xcproj.validate, 1)
+    memory[u'validate'] = peak_memory()
+    result[u'save_minimal_diff'], _ = timeit(lambda: xcproj.save(minimal_diff=True), repeat)
+
+    cost, lookups = timeit(lambda: query_buildsettings(xcproj), repeat)
+    result[u'buildsettings'] = cost
+    result[u'buildsettings_lookups'] = lookups
+    result[u'buildsettings_resolved'], _ = timeit(lambda: query_buildsettings(xcproj, True), repeat)
+    memory[u'peak'] = peak_memory()
+    return result
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=u'xcodeproj operations benchmark')
+    parser.add_argument(u'--targets', type=int, default=4, help=u'number of targets')
+    parser.add_argument(u'--files', type=int, default=500, help=u'number of files per target')
+    parser.add_argument(u'--depth', type=int, default=8, help=u'depth of the group tree')
+    parser.add_argument(u'--configs', type=int, default=4, \
+        help=u'number of extra build configurations per target')
+    parser.add_argument(u'--repeat', type=int, default=3)
+    parser.add_argument(u'--keep', help=u'generate the project in this directory and keep it')
+    args = parser.parse_args()
+
+    workdir = args.keep if not args.keep is None else tempfile.mkdtemp(prefix=u'xcodeproj-bench-')
+    try:
+        report = bench(workdir, args.targets, args.files, args.depth, args.configs, args.repeat)
+    finally:
+        if args.keep is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(report, indent=2, sort_keys=True))
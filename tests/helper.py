@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Shared fixtures of the tests: the projects created from a few source files,
+and the text that a project would be saved as.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import io
+
+from xcodeproj.pbxproj import pbxproj
+from xcodeproj.pbxproj import pbxpath
+from xcodeproj.pbxproj import abstract
+
+DEPLOYMENT_TARGET = u'8.0'
+
+def source_files(count):
+    """ return the names of 'count' source files, 'f{idx}.m' """
+    return [u'f{0}.m'.format(idx) for idx in range(count)]
+
+def write_file(path, data=b'//\n'):
+    """ write 'data' (bytes or unicode) to 'path', the directories are created if needed """
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+    with open(path, 'wb') as fp:
+        fp.write(data)
+
+def read_file(path):
+    with open(path, 'rb') as fp:
+        return fp.read()
+
+def write_files(dirpath, files):
+    """
+    write the files in 'dirpath'
+    :param files:   [name] or {name: data}, the names are relative paths
+    """
+    items = files.items() if isinstance(files, dict) else [(name, b'//\n') for name in files]
+    for name, data in items:
+        write_file(os.path.join(dirpath, name), data)
+
+def create_project(project_dir, product_name, files=()):
+    """
+    create a project, the 'files' (see write_files()) are written in '{project_dir}/{product_name}',
+    which is added to the main group and the first target. return the validated project.
+    """
+    xcproj = pbxproj.XcodeProj.create(project_dir, product_name, DEPLOYMENT_TARGET)
+    if len(files) > 0:
+        srcdir = os.path.join(project_dir, product_name)
+        write_files(srcdir, files)
+        xcproj.addfile(srcdir, xcproj.main_group(), xcproj.pbx_rootObject.pbx_targets[0])
+    xcproj.validate()
+    return xcproj
+
+def make_project(project_dir, product_name, files=()):
+    """ save the project of create_project(), return the path of the xcodeproj """
+    xcproj = create_project(project_dir, product_name, files)
+    xcproj.save()
+    return os.path.join(project_dir, product_name + u'.xcodeproj')
+
+def text(xcproj):
+    """ return the text that save() would write """
+    data = io.BytesIO()
+    buff = abstract.PBXWriter(data)
+    xcproj.write(buff)
+    buff.flush()
+    return data.getvalue()
+
+def check_paths(xcproj, tag=u''):
+    """ the cached paths and the path index must agree with the paths computed from scratch """
+    for fileref in xcproj.objects().get(u'PBXFileReference', default={}).values():
+        path = pbxpath.realpath(xcproj, pbxpath.abspath(fileref))
+        assert fileref.realpath() == path, u'{0}: stale realpath of {1}'.format(tag, fileref)
+        if not path is None:
+            assert xcproj.fileref_for_path(path) is fileref, \
+                u'{0}: {1} is not indexed by {2}'.format(tag, fileref, path)
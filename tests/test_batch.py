@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Batch test: a batch raising an exception must restore the objects changed, added and removed
+in it, and the paths, index and text derived from them.
+
+usage:
+    python tests/test_batch.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+import helper
+
+PRODUCT_NAME = u'Batch'
+
+def test_rollback():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-batch-')
+    try:
+        project_dir = os.path.join(workdir, u'project')
+        xcproj = helper.create_project(project_dir, PRODUCT_NAME, \
+            [u'a.m', u'b.m', u'c.h', u'sub/d.m'])
+        target = xcproj.pbx_rootObject.pbx_targets[0]
+        srcdir = os.path.join(project_dir, PRODUCT_NAME)
+        before = helper.text(xcproj) # the rendered text is cached
+        helper.check_paths(xcproj) # the path index is built
+        count = len(xcproj.objects().guids())
+
+        newdir = os.path.join(project_dir, u'new')
+        helper.write_files(newdir, [u'e.m'])
+        group = xcproj.fileref_for_path(os.path.join(srcdir, u'a.m')).owners().values()[0]
+        cfg = target.pbx_buildConfigurationList.pbx_buildConfigurations[0]
+        try:
+            with xcproj.batch():
+                xcproj.addfile(newdir, xcproj.main_group(), target)
+                xcproj.remove_object(xcproj.fileref_for_path(os.path.join(srcdir, u'b.m')))
+                group.pbx_path = u'renamed'
+                target.pbx_name = u'Renamed' # the comments of the others are derived from it
+                cfg.pbx_buildSettings[u'IN_BATCH'] = u'YES'
+                with xcproj.batch():
+                    xcproj.main_group().pbx_name = u'Main'
+                helper.check_paths(xcproj)
+                assert b'Renamed' in helper.text(xcproj) # cached from the changed states
+                raise RuntimeError(u'rollback')
+        except RuntimeError as e:
+            pass
+        else:
+            assert False, u'the exception is swallowed'
+
+        assert helper.text(xcproj) == before
+        assert len(xcproj.objects().guids()) == count
+        assert xcproj.fileref_for_path(os.path.join(newdir, u'e.m')) is None
+        assert not xcproj.fileref_for_path(os.path.join(srcdir, u'b.m')) is None
+        helper.check_paths(xcproj)
+
+        # the project is usable after the rollback
+        with xcproj.batch():
+            target.pbx_name = u'Renamed'
+        assert b'Renamed' in helper.text(xcproj)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Build settings test: the layers and the $(inherited) / $(VAR) expansion of the effective build
+settings, and the invalidation of the memoized values by the changes of the project and the
+xcconfig files, whose parsed contents are cached in bounded caches.
+
+usage:
+    python tests/test_buildsettings.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import xcconfig
+import helper
+
+PRODUCT_NAME = u'Settings'
+CONFIG_NAME = u'Debug'
+
+def make_project(project_dir):
+    """
+    create a project whose target config is based on 'Configs/target.xcconfig',
+    return (xcproj, target, project config, target config)
+    """
+    xcproj = helper.create_project(project_dir, PRODUCT_NAME)
+    target = xcproj.pbx_rootObject.pbx_targets[0]
+    confdir = os.path.join(project_dir, u'Configs')
+    helper.write_file(os.path.join(confdir, u'target.xcconfig'), \
+        u'FLAGS = $(inherited) -xcconfig\nFROM_XCCONFIG = x\n')
+    xcproj.addfile(confdir, xcproj.main_group())
+    xcproj.validate()
+
+    pcfg = xcproj.pbx_rootObject.pbx_buildConfigurationList.getconfig(CONFIG_NAME)
+    tcfg = target.pbx_buildConfigurationList.getconfig(CONFIG_NAME)
+    tcfg.pbx_baseConfigurationReference = \
+        xcproj.fileref_for_path(os.path.join(confdir, u'target.xcconfig'))
+    pcfg.pbx_buildSettings[u'FLAGS'] = u'-project'
+    tcfg.pbx_buildSettings[u'FLAGS'] = u'$(inherited) -target'
+    return xcproj, target, pcfg, tcfg
+
+def settings(xcproj, target):
+    return xcproj.effective_buildsettings(target, CONFIG_NAME)
+
+def test_inherited():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-settings-')
+    try:
+        xcproj, target, pcfg, tcfg = make_project(os.path.join(workdir, u'project'))
+        assert settings(xcproj, None).get(u'FLAGS') == u'-project'
+        assert settings(xcproj, target).get(u'FLAGS') == u'-project -xcconfig -target'
+        assert settings(xcproj, target).get(u'FROM_XCCONFIG') == u'x'
+        assert settings(xcproj, target).get(u'TARGET_NAME') == PRODUCT_NAME
+
+        tcfg.pbx_buildSettings[u'LIST'] = [u'$(inherited)', u'b']
+        pcfg.pbx_buildSettings[u'LIST'] = [u'a']
+        assert settings(xcproj, target).get(u'LIST') == u'a b'
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_expansion():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-settings-')
+    try:
+        xcproj, target, pcfg, tcfg = make_project(os.path.join(workdir, u'project'))
+        # the names are looked up from the highest layer, whichever layer refers to them
+        pcfg.pbx_buildSettings[u'WHO'] = u'project'
+        pcfg.pbx_buildSettings[u'GREETING'] = u'hello $(WHO)'
+        tcfg.pbx_buildSettings[u'WHO'] = u'target'
+        # nested names, braces and modifiers
+        tcfg.pbx_buildSettings[u'KIND'] = u'PATH'
+        tcfg.pbx_buildSettings[u'SOME_PATH'] = u'/a/b/File.ext'
+        tcfg.pbx_buildSettings[u'NESTED'] = u'$(SOME_$(KIND):base)-${SOME_PATH:suffix}'
+        tcfg.pbx_buildSettings[u'CYCLE'] = u'$(CYCLE)'
+        tcfg.pbx_buildSettings[u'FALLBACK'] = u'$(UNDEFINED:default=none)'
+
+        values = settings(xcproj, target)
+        assert values.get(u'GREETING') == u'hello target'
+        assert values.get(u'NESTED') == u'File-.ext'
+        assert values.get(u'CYCLE') == u''
+        assert values.get(u'FALLBACK') == u'none'
+        assert settings(xcproj, None).get(u'GREETING') == u'hello project'
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_invalidation():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-settings-')
+    try:
+        project_dir = os.path.join(workdir, u'project')
+        xcproj, target, pcfg, tcfg = make_project(project_dir)
+        assert settings(xcproj, target).get(u'FLAGS') == u'-project -xcconfig -target'
+
+        pcfg.pbx_buildSettings[u'FLAGS'] = u'-changed' # in place
+        assert settings(xcproj, target).get(u'FLAGS') == u'-changed -xcconfig -target'
+
+        del tcfg.pbx_buildSettings[u'FLAGS']
+        assert settings(xcproj, target).get(u'FLAGS') == u'-changed -xcconfig'
+
+        target.pbx_name = u'Renamed'
+        assert settings(xcproj, target).get(u'TARGET_NAME') == u'Renamed'
+
+        # the xcconfig file is changed on disk
+        helper.write_file(os.path.join(project_dir, u'Configs', u'target.xcconfig'), \
+            u'FLAGS = $(inherited) -edited\n// a longer file, so the stamp differs\n')
+        assert settings(xcproj, target).get(u'FLAGS') == u'-changed -edited'
+
+        # the xcconfig file is moved with its group
+        group = tcfg.pbx_baseConfigurationReference.owners().values()[0]
+        helper.write_file(os.path.join(project_dir, u'Moved', u'target.xcconfig'), u'FLAGS = -moved\n')
+        group.pbx_path = u'Moved'
+        assert settings(xcproj, target).get(u'FLAGS') == u'-moved'
+
+        # the xcconfig file has no path on disk, its layer is ignored
+        group.removechild(tcfg.pbx_baseConfigurationReference)
+        assert tcfg.pbx_baseConfigurationReference.realpath() is None
+        assert settings(xcproj, target).get(u'FLAGS') == u'-changed'
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_xcconfig_includes():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-settings-')
+    try:
+        project_dir = os.path.join(workdir, u'project')
+        xcproj, target, pcfg, tcfg = make_project(project_dir)
+        confdir = os.path.join(project_dir, u'Configs')
+        # $(inherited) of a key assigned again refers to its earlier assignment
+        helper.write_file(os.path.join(confdir, u'base.xcconfig'), \
+            u'FLAGS = $(inherited) -base\nOTHER_LDFLAGS = -ObjC\n')
+        helper.write_file(os.path.join(confdir, u'target.xcconfig'), u'#include "base.xcconfig"\n' \
+            u'FLAGS = $(inherited) -xcconfig\n' \
+            u'OTHER_LDFLAGS = $(inherited) -lz\nOTHER_LDFLAGS = ${inherited} -lc++\n')
+        assert xcconfig.load(os.path.join(confdir, u'target.xcconfig')) == {
+            u'FLAGS': u'$(inherited) -base -xcconfig', u'OTHER_LDFLAGS': u'-ObjC -lz -lc++'}
+
+        values = settings(xcproj, target)
+        assert values.get(u'OTHER_LDFLAGS') == u'-ObjC -lz -lc++'
+        assert values.get(u'FLAGS') == u'-project -base -xcconfig -target'
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_xcconfig_cache():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-settings-')
+    try:
+        # an include renamed over by a file of the same size and mtime
+        path = os.path.join(workdir, u'main.xcconfig')
+        shared = os.path.join(workdir, u'shared.xcconfig')
+        helper.write_file(path, u'#include "shared.xcconfig"\n')
+        helper.write_file(shared, u'A = 1\n')
+        os.utime(shared, (1500000000, 1500000000))
+        assert xcconfig.load(path) == {u'A': u'1'}
+
+        other = os.path.join(workdir, u'other.xcconfig')
+        helper.write_file(other, u'A = 2\n')
+        os.utime(other, (1500000000, 1500000000))
+        os.rename(shared, os.path.join(workdir, u'keep.xcconfig')) # the old inode is not reused
+        os.rename(other, shared)
+        assert xcconfig.load(path) == {u'A': u'2'}
+
+        # the caches are bounded, the files dropped are parsed again
+        for idx in range(xcconfig.CACHE_SIZE + 10):
+            helper.write_file(os.path.join(workdir, u'f{0}.xcconfig'.format(idx)), u'B = {0}\n'.format(idx))
+            assert xcconfig.load(os.path.join(workdir, u'f{0}.xcconfig'.format(idx))) == \
+                {u'B': u'{0}'.format(idx)}
+        assert len(xcconfig._FILE_CACHE) <= xcconfig.CACHE_SIZE
+        assert len(xcconfig._FLAT_CACHE) <= xcconfig.CACHE_SIZE
+        assert xcconfig.load(os.path.join(workdir, u'f0.xcconfig')) == {u'B': u'0'}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
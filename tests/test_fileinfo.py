@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+File info test: the mimetype and charset detected from the file header, memoized in a bounded
+cache which must not return the info of a file replaced by another of the same size and mtime.
+
+usage:
+    python tests/test_fileinfo.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+from xcodeproj.utils import template
+from xcodeproj.pbxproj import pbxhelper
+import helper
+
+def test_file_info():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-fileinfo-')
+    try:
+        cases = [
+            (b'', (u'inode/x-empty', u'binary')),
+            (b'int a;\n', (u'text/plain', u'us-ascii')),
+            (u'é\n'.encode('utf-8'), (u'text/plain', u'utf-8')),
+            (b'\xef\xbb\xbfa', (u'text/plain', u'utf-8')),
+            (b'\x89PNG\r\n\x1a\n\0\0', (u'image/png', u'binary')),
+            (b'a\0b', (u'application/octet-stream', u'binary')),
+        ]
+        for idx, (data, info) in enumerate(cases):
+            path = os.path.join(workdir, u'f{0}'.format(idx))
+            helper.write_file(path, data)
+            assert pbxhelper.get_file_info(path) == info, u'{0!r}'.format(data)
+        assert pbxhelper.get_file_info(workdir) == (u'inode/directory', u'binary')
+        assert pbxhelper.get_file_info(os.path.join(workdir, u'none')) == (None, None)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_replaced_file():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-fileinfo-')
+    try:
+        path = os.path.join(workdir, u'file')
+        helper.write_file(path, b'text')
+        os.utime(path, (1500000000, 1500000000))
+        assert pbxhelper.get_file_info(path) == (u'text/plain', u'us-ascii')
+
+        # renamed over by a file of the same size and mtime
+        other = os.path.join(workdir, u'other')
+        helper.write_file(other, b'\0\0\0\0')
+        os.utime(other, (1500000000, 1500000000))
+        keep = os.path.join(workdir, u'keep') # the old inode is not reused
+        os.rename(path, keep)
+        os.rename(other, path)
+        assert pbxhelper.get_file_info(path) == (u'application/octet-stream', u'binary')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_lru_cache():
+    cache = template.LRUCache(3)
+    for key in [u'a', u'b', u'c']:
+        cache[key] = key.upper()
+    assert cache.get(u'a') == u'A' # 'b' is the least recently used now
+    cache[u'd'] = u'D'
+    assert len(cache) == 3
+    assert not u'b' in cache and cache.get(u'b') is None
+    assert [cache.get(k) for k in [u'a', u'c', u'd']] == [u'A', u'C', u'D']
+    cache[u'a'] = u'A2' # replaced, not added
+    assert len(cache) == 3 and cache.get(u'a') == u'A2'
+    cache.clear()
+    assert len(cache) == 0
+
+    assert pbxhelper._FILE_INFO_CACHE.capacity() > 0 # the file info is bounded
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Leak test: load and discard projects with the cycle collector disabled,
+a released project must free all its objects at once, 
+and the objects held out of it must stay readable.
+
+usage:
+    python tests/test_leak.py [--count N]
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import gc
+import shutil
+import tempfile
+import weakref
+
+from xcodeproj.pbxproj import pbxproj
+from xcodeproj.pbxproj import baseobject
+import helper
+
+PRODUCT_NAME = u'Leak'
+
+def make_project(project_dir):
+    """ create a project with 2 targets depending on each other by a container proxy """
+    xcproj = helper.create_project(project_dir, PRODUCT_NAME, helper.source_files(20))
+    project = xcproj.pbx_rootObject
+    extension = project.new_native_target(PRODUCT_NAME + u'Ext', \
+        deployment_target=helper.DEPLOYMENT_TARGET)
+
+    # proxy.containerPortal refers to rootObject, a cycle made of pbx-attributes
+    proxy = xcproj.new_object(u'PBXContainerItemProxy')
+    proxy.pbx_containerPortal = project
+    proxy.pbx_proxyType = u'1'
+    proxy.pbx_remoteGlobalIDString = extension.guid
+    proxy.pbx_remoteInfo = extension.pbx_name
+    dependency = xcproj.new_object(u'PBXTargetDependency')
+    dependency.pbx_target = extension
+    dependency.pbx_targetProxy = proxy
+    project.pbx_targets[0].pbx_dependencies = [dependency]
+
+    xcproj.validate()
+    xcproj.save()
+    return os.path.join(project_dir, PRODUCT_NAME + u'.xcodeproj')
+
+def count_objects():
+    """ return the number of live pbx-objects """
+    return len([o for o in gc.get_objects() if isinstance(o, baseobject.PBXBaseObject)])
+
+def load_and_discard(xcprojpath, count, **kwargs):
+    """
+    load the project 'count' times with the cycle collector disabled,
+    return (number of the projects alive, number of the pbx-objects alive) after that.
+    """
+    refs = []
+    gc.collect()
+    gc.disable()
+    try:
+        for idx in range(count):
+            xcproj = pbxproj.XcodeProj.load(xcprojpath, **kwargs)
+            xcproj.validate()
+            refs.append(weakref.ref(xcproj))
+            xcproj = None
+        alive = len([r for r in refs if not r() is None])
+        return alive, count_objects()
+    finally:
+        gc.enable()
+
+def test_leak(count=1000):
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-leak-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        baseline = count_objects()
+        for kwargs in [{}, {u'lazy': True}]:
+            alive, objects = load_and_discard(xcprojpath, count, **kwargs)
+            assert alive == 0, u'{0} projects are not freed, {1}'.format(alive, kwargs)
+            assert objects == baseline, \
+                u'{0} pbx-objects are not freed, {1}'.format(objects - baseline, kwargs)
+        assert len(gc.garbage) == 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def load_target(xcprojpath, **kwargs):
+    """ return the target of a loaded project, which is released on return """
+    return pbxproj.XcodeProj.load(xcprojpath, **kwargs).get_target(PRODUCT_NAME)
+
+def source_paths(target):
+    """ return [path] of the source files of 'target' """
+    return [f.pbx_fileRef.pbx_path for p in target.pbx_buildPhases \
+        if p.isa == u'PBXSourcesBuildPhase' for f in p.pbx_files]
+
+def released_error(change):
+    """ return True if 'change' raises the error of the released project """
+    try:
+        change()
+    except ReferenceError as e:
+        return True
+    return False
+
+def test_held_objects():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-leak-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        baseline = count_objects()
+        gc.collect()
+        gc.disable()
+        try:
+            targets = pbxproj.XcodeProj.load(xcprojpath).pbx_rootObject.pbx_targets
+            assert list(map(lambda t: t.pbx_name, targets)) == [PRODUCT_NAME, PRODUCT_NAME + u'Ext']
+
+            target = load_target(xcprojpath)
+            assert target.project() is None
+            assert target.pbx_name == PRODUCT_NAME
+            configs = target.pbx_buildConfigurationList.pbx_buildConfigurations
+            assert len(configs) == 2 and len(configs[0].pbx_buildSettings) > 0
+            assert sorted(source_paths(target)) == sorted(helper.source_files(20))
+
+            # the changes need the project
+            changes = [
+                lambda: setattr(target, u'pbx_name', u'Renamed'),
+                lambda: configs[0].pbx_buildSettings.update({u'A': u'1'}),
+                lambda: target.markdirty(),
+                # the lazily loaded objects are parsed by the project
+                lambda: load_target(xcprojpath, lazy=True).pbx_buildConfigurationList.pbx_name,
+            ]
+            for change in changes:
+                assert released_error(change)
+            assert target.pbx_name == PRODUCT_NAME and not u'A' in configs[0].pbx_buildSettings
+
+            targets = target = configs = None
+            assert count_objects() == baseline
+        finally:
+            gc.enable()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description=u'load and discard projects')
+    parser.add_argument(u'--count', type=int, default=1000, help=u'number of loaded projects')
+    args = parser.parse_args()
+    test_leak(args.count)
+    test_held_objects()
+    print(u'ok')
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Objects test: the sections of PBXObjects must match its objects after every kind of change,
+and be written in the order of isa, with the objects of each in the order of guid.
+
+usage:
+    python tests/test_objects.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import io
+import re
+import random
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxobjects
+from xcodeproj.pbxproj import abstract
+import helper
+
+PRODUCT_NAME = u'Objects'
+
+def make_objects(workdir):
+    """ return [object] of a created project, shuffled """
+    xcproj = helper.create_project(os.path.join(workdir, u'project'), PRODUCT_NAME, \
+        [u'a.m', u'b.h', u'c.png'])
+    objs = [o for g, o in xcproj.objects().guid_items()]
+    random.Random(0).shuffle(objs)
+    return xcproj, objs
+
+def sections_of(objs):
+    """ return {isa: set(guid)} of the {guid: object} 'objs' """
+    sections = {}
+    for guid, obj in objs.items():
+        sections.setdefault(obj.isa, set()).add(guid)
+    return sections
+
+def check(store, expected, tag):
+    """ 'store' must have the objects {guid: object} 'expected', in their sections """
+    assert sorted(store.guids()) == sorted(expected.keys()), tag
+    for guid, obj in expected.items():
+        assert store.get(guid) is obj and store[guid] is obj and guid in store, tag
+    sections = sections_of(expected)
+    assert sorted(store.sections()) == sorted(sections.keys()), tag
+    for isa, guids in sections.items():
+        assert set(store.get(isa).keys()) == guids and isa in store, u'{0}: {1}'.format(tag, isa)
+
+def written(store):
+    """ return [(isa, [guid])] of the sections in the order written """
+    data = io.BytesIO()
+    buff = abstract.PBXWriter(data)
+    store.write(buff)
+    buff.flush()
+    sections = []
+    for line in data.getvalue().decode('utf-8').splitlines():
+        match = re.match(u'^/\\* Begin (\\w+) section \\*/$', line)
+        if not match is None:
+            sections.append((match.group(1), []))
+            continue
+        match = re.match(u'^\t+([0-9A-F]{24})(?: /\\*.*?\\*/)? = \\{', line) # not the children
+        if not match is None:
+            sections[-1][1].append(match.group(1))
+    return sections
+
+def check_order(store, expected, tag):
+    """ 'store' must be written in order, with the objects {guid: object} 'expected' """
+    sections = sections_of(expected)
+    result = written(store)
+    assert [isa for isa, guids in result] == sorted([isa for isa, guids in result]), tag
+    # the sections emptied are kept, and written empty
+    assert [(isa, guids) for isa, guids in result if len(guids) > 0] == \
+        [(isa, sorted(sections[isa])) for isa in sorted(sections.keys())], tag
+
+def test_sections():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-objects-')
+    checks = pbxobjects.ENABLE_CHECKS
+    pbxobjects.ENABLE_CHECKS = True # the internal orders are checked after every change
+    try:
+        xcproj, objs = make_objects(workdir)
+        store = pbxobjects.PBXObjects()
+        expected = {}
+        for obj in objs:
+            store[obj.guid] = obj
+            expected[obj.guid] = obj
+        check(store, expected, u'added')
+
+        # a guid taken by an object of another isa moves to the other section
+        fileref = [o for o in objs if o.isa == u'PBXFileReference'][0]
+        group = [o for o in objs if o.isa == u'PBXGroup'][0]
+        store[fileref.guid] = group
+        expected[fileref.guid] = group
+        check(store, expected, u'replaced')
+        store[fileref.guid] = fileref
+        expected[fileref.guid] = fileref
+        check(store, expected, u'restored')
+
+        buildfile = [o for o in objs if o.isa == u'PBXBuildFile'][0]
+        assert store.pop(buildfile.guid) is buildfile
+        expected.pop(buildfile.guid)
+        assert store.pop(buildfile.guid, u'none') == u'none'
+        del store[fileref.guid]
+        expected.pop(fileref.guid)
+        check(store, expected, u'removed')
+
+        section = store.pop(u'PBXBuildFile')
+        assert len(section) > 0
+        del store[u'XCBuildConfiguration']
+        expected = {g: o for g, o in expected.items() \
+            if not o.isa in [u'PBXBuildFile', u'XCBuildConfiguration']}
+        check(store, expected, u'sections removed')
+        assert store.pop(u'PBXBuildFile', u'none') == u'none'
+
+        store[buildfile.guid] = buildfile # a section removed is created again
+        expected[buildfile.guid] = buildfile
+        check(store, expected, u'added again')
+    finally:
+        pbxobjects.ENABLE_CHECKS = checks
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_write_order():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-objects-')
+    try:
+        xcproj, objs = make_objects(workdir)
+        store = pbxobjects.PBXObjects()
+        expected = {}
+        for obj in objs[:len(objs) // 2]: # appended out of order
+            store[obj.guid] = obj
+            expected[obj.guid] = obj
+        check_order(store, expected, u'added')
+        check_order(store, expected, u'written again')
+
+        for obj in objs[:len(objs) // 4]: # removed from the sections sorted by the write
+            store.pop(obj.guid)
+            expected.pop(obj.guid)
+        check_order(store, expected, u'removed after written')
+        for obj in objs[len(objs) // 2:]:
+            store[obj.guid] = obj
+            expected[obj.guid] = obj
+        check_order(store, expected, u'added after written')
+
+        for obj in objs[:len(objs) // 4]:
+            store[obj.guid] = obj
+        for obj in objs[:len(objs) // 8]: # removed from the unsorted sections
+            del store[obj.guid]
+        for obj in objs[len(objs) // 8:len(objs) // 4]:
+            expected[obj.guid] = obj
+        check_order(store, expected, u'changed before written')
+        assert sum([len(g) for isa, g in written(store)]) == len(expected)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
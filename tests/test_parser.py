@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Parser test: the structure, comments, quoted strings, data literals and spans of the parsed
+plist, and the errors of the malformed data, which must fail fast.
+
+usage:
+    python tests/test_parser.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import time
+
+from xcodeproj.pbxproj import pbxparser
+
+def parse_error(data):
+    """ return the message of the PBXParseError raised by parsing 'data', None if parsed """
+    try:
+        pbxparser.loads(data)
+    except pbxparser.PBXParseError as e:
+        return u'{0}'.format(e)
+    return None
+
+def test_structure():
+    data = b'// !$*UTF8*$!\n{\n\tarchiveVersion = 1;\n\tlist = (a, "b c", );\n' \
+        b'\tempty = {};\n\tnested = {key = (); };\n}\n'
+    assert pbxparser.loads(data) == {
+        u'archiveVersion': u'1',
+        u'list': [u'a', u'b c'],
+        u'empty': {},
+        u'nested': {u'key': []},
+    }
+    assert pbxparser.loads(b'( )') == []
+    assert pbxparser.loads(b'abc') == u'abc'
+
+def test_comments():
+    data = b'/* head */ { /* a ** b */ a /**/ = // line\n 1 /***/; b = "/* x */"; } // tail'
+    assert pbxparser.loads(data) == {u'a': u'1', u'b': u'/* x */'}
+    assert pbxparser.loads(b'{a = b; } // end of file') == {u'a': u'b'}
+    assert pbxparser.loads(b'{a = b; } /* end */\n\n') == {u'a': u'b'}
+
+def test_quoted():
+    data = b'{"a b" = "x\\"y"; c = "\\\\\\n\\t"; d = "\\U00e9\\101"; e = "\xc3\xa9"; f = "";}'
+    assert pbxparser.loads(data) == {
+        u'a b': u'x"y',
+        u'c': u'\\\n\t',
+        u'd': u'éA',
+        u'e': u'é',
+        u'f': u'',
+    }
+
+def test_data():
+    # json has no type for the data literals, they are rejected as plutil does
+    for data in [b'{a = <0fA1 20>;}', b'(a,\n<>)']:
+        error = parse_error(data)
+        assert not error is None and u'data literal' in error, u'{0!r}: {1}'.format(data, error)
+    assert u'line 2' in parse_error(b'(a,\n<>)')
+
+def test_shared_strings():
+    root = pbxparser.loads(b'{a = (GUID, GUID); GUID = GUID;}')
+    assert root[u'a'][0] is root[u'a'][1]
+    assert root[u'GUID'] is root[u'a'][0]
+
+def test_spans():
+    data = b'{objects = {\n\tG1 /* x */ = {isa = A; };\n\t"G2" = {isa = B; };\n};\n}'
+    spans = {}
+    pbxparser.loads(data, spans=spans)
+    assert data[spans[u'G1'][0]:spans[u'G1'][1]] == b'G1 /* x */ = {isa = A; };'
+    assert data[spans[u'G2'][0]:spans[u'G2'][1]] == b'"G2" = {isa = B; };'
+
+def test_malformed():
+    cases = [
+        (b'', u'unexpected end of data'),
+        (b'{a = b;', u'unexpected end of data'),
+        (b'{a = b', u'unexpected end of data'),
+        (b'{a = "b;}', u'unexpected character'),
+        (b'{a = b;}}', u'unexpected data after the root object'),
+        (b'{a b;}', u'unexpected "b"'),
+        (b'{a = b}', u'unexpected "}"'),
+        (b'{(a) = b;}', u'unexpected "("'),
+        (b'{<00> = b;}', u'invalid dict key'),
+        (b'(a b)', u'unexpected "b"'),
+        (b'{a = /* b; }', u'unexpected character'),
+        (b'{\n\na = #;}', u'line 3'),
+        (b'{\na = "\xff";}', u'invalid utf-8 byte'),
+        (b'{\na = "\xc3\xa9";\n"\xe9" = b;}', u'line 3'),
+        (b'{a = "\xff" b;}', u'invalid utf-8 byte'),
+    ]
+    for data, message in cases:
+        error = parse_error(data)
+        assert not error is None and message in error, u'{0!r}: {1}'.format(data, error)
+
+def test_malformed_is_fast():
+    # the spaces / comments before an illegal character must not be re-split on backtracking
+    cases = [
+        b'{a = ' + b' ' * 4000 + b'#;}',
+        b'{a = ' + b'// ' * 4000 + b'#;}',
+        b'{a = ' + b'/* */ ' * 4000 + b'/* #;}',
+        b'{a = ' + b'/**/' * 4000 + b'#;}',
+        b'{a = ' + b'\n' * 4000 + b'#',
+    ]
+    for data in cases:
+        start = time.time()
+        assert not parse_error(data) is None
+        assert time.time() - start < 0.5, u'{0!r}...'.format(data[:16])
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
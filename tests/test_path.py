@@ -0,0 +1,71 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Path test: the cached paths and the path index of the file references must follow the changes
+of the path, sourceTree and owner of their groups, at any depth.
+
+usage:
+    python tests/test_path.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+import helper
+
+PRODUCT_NAME = u'Path'
+
+def make_project(project_dir):
+    """ create a project with the tree 'Path/{a,b}/{c,d}/f{0,1}.m' """
+    return helper.create_project(project_dir, PRODUCT_NAME, [os.path.join(sub, name) \
+        for sub in [u'a/c', u'a/d', u'b/c', u'b/d'] for name in helper.source_files(2)])
+
+def child_group(group, name):
+    return [c for c in group.pbx_children if c.isa == u'PBXGroup' and c.displayname() == name][0]
+
+def test_group_changes():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-path-')
+    try:
+        xcproj = make_project(os.path.join(workdir, u'project'))
+        root = child_group(xcproj.main_group(), PRODUCT_NAME)
+        helper.check_paths(xcproj, u'added') # the index is built
+
+        srcpath = os.path.join(workdir, u'project', PRODUCT_NAME, u'a', u'c', u'f0.m')
+        fileref = xcproj.fileref_for_path(srcpath)
+        assert not fileref is None
+
+        group_a = child_group(root, u'a')
+        group_a.pbx_path = u'renamed'
+        helper.check_paths(xcproj, u'path')
+        assert xcproj.fileref_for_path(srcpath) is None
+        assert xcproj.fileref_for_path(srcpath.replace(u'/a/', u'/renamed/')) is fileref
+
+        group_a.pbx_sourceTree = u'SOURCE_ROOT'
+        helper.check_paths(xcproj, u'sourceTree')
+
+        xcproj.main_group().addchild(child_group(group_a, u'c')) # moved to another owner
+        helper.check_paths(xcproj, u'owner')
+        assert fileref.realpath() == os.path.join(workdir, u'project', u'c', u'f0.m')
+
+        xcproj.main_group().removechild(root)
+        helper.check_paths(xcproj, u'removed')
+        xcproj.main_group().addchild(root)
+        helper.check_paths(xcproj, u'added again')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
@@ -0,0 +1,62 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+PBXList test: the guid index and positions must agree with the items after every kind of change.
+
+usage:
+    python tests/test_pbxlist.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+from xcodeproj.pbxproj import pbxlist
+
+class Item(object):
+    def __init__(self, guid):
+        self.guid = guid
+
+ITEMS = [Item(u'G{0}'.format(idx)) for idx in range(6)]
+
+def check(items, tag):
+    for item in ITEMS:
+        expected = [i.guid for i in items].index(item.guid) if item in items else -1
+        assert items.guid_index(item.guid) == expected, \
+            u'{0}: {1} at {2}'.format(tag, item.guid, items.guid_index(item.guid))
+        assert items.hasguid(item.guid) == (expected >= 0)
+
+def test_guid_index():
+    items = pbxlist.PBXList(ITEMS[:3])
+    check(items, u'init')
+    items.append(ITEMS[3])
+    items.extend([ITEMS[0], ITEMS[4]])
+    check(items, u'append')
+    items.insert(0, ITEMS[5])
+    check(items, u'insert')
+    items.pop(1)
+    items.remove(ITEMS[1])
+    check(items, u'remove')
+    items.pop()
+    check(items, u'pop')
+    items[0] = ITEMS[2]
+    items[1:3] = [ITEMS[1]]
+    check(items, u'set')
+    del items[0]
+    check(items, u'del')
+    items.reverse()
+    check(items, u'reverse')
+    items.sort(key=lambda i: i.guid)
+    check(items, u'sort')
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
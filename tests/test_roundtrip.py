@@ -0,0 +1,198 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Round-trip test: whichever way a project is loaded (parsed, lazy, restored from the cache)
+and saved (formatted, minimal diff), the text must be the same as a fresh parse formats it.
+the lazy load must parse the objects only when they are reached, and the cache must never be
+restored for a file changed since it was written.
+
+usage:
+    python tests/test_roundtrip.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxproj
+from xcodeproj.pbxproj import pbxcache
+from xcodeproj.pbxproj import pbxparser
+import helper
+
+PRODUCT_NAME = u'Roundtrip'
+
+# (lazy, use_cache) of the ways to load a project, the cache is written by the first one using it
+LOAD_MODES = [(False, False), (True, False), (False, True), (False, True)]
+
+def make_project(project_dir):
+    """ create and save a project of 2 targets, return the path of its pbxproj file """
+    files = {name: b'//\n' for name in [u'a.m', u'a.h', u'b c.m', u'nested/dir/d.swift', \
+        u'en.lproj/L.strings', u'de.lproj/L.strings']}
+    files[u'img.png'] = b'\x89PNG\r\n\x1a\n\0'
+    xcproj = helper.create_project(project_dir, PRODUCT_NAME, files)
+    project = xcproj.pbx_rootObject
+    target = project.pbx_targets[0]
+    extension = project.new_native_target(PRODUCT_NAME + u'Ext', \
+        deployment_target=helper.DEPLOYMENT_TARGET)
+
+    helper.write_file(os.path.join(project_dir, u'Ext', u'e.m'))
+    xcproj.addfile(os.path.join(project_dir, u'Ext'), xcproj.main_group(), extension)
+
+    cfg = target.pbx_buildConfigurationList.pbx_buildConfigurations[0]
+    cfg.pbx_buildSettings[u'OTHER_LDFLAGS'] = [u'$(inherited)', u'-ObjC', u'-l"quoted"']
+    cfg.pbx_buildSettings[u'PRODUCT_NAME'] = u'名字 with spaces'
+    xcproj.validate()
+    xcproj.save()
+    return os.path.join(project_dir, PRODUCT_NAME + u'.xcodeproj', u'project.pbxproj')
+
+def formatted(pbxprojpath):
+    """ return the text of the file formatted by a fresh parse, without any cache """
+    return helper.text(pbxproj.XcodeProj.load(os.path.dirname(pbxprojpath)))
+
+def edit(xcproj):
+    """ change some objects without adding any, so the results of all the modes are the same """
+    project = xcproj.pbx_rootObject
+    target = project.pbx_targets[0]
+    target.pbx_name = u'Renamed'
+    cfg = target.pbx_buildConfigurationList.pbx_buildConfigurations[0]
+    cfg.pbx_buildSettings[u'OTHER_LDFLAGS'].append(u'-lz')
+    del cfg.pbx_buildSettings[u'PRODUCT_NAME']
+    group = xcproj.main_group()
+    group.pbx_children.reverse()
+    project.removetarget(project.pbx_targets[1])
+    xcproj.validate()
+
+def test_roundtrip():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-roundtrip-')
+    environ = os.environ.get(pbxcache.CACHE_DIR_ENV)
+    os.environ[pbxcache.CACHE_DIR_ENV] = os.path.join(workdir, u'cache')
+    try:
+        pbxprojpath = make_project(os.path.join(workdir, u'project'))
+        xcprojpath = os.path.dirname(pbxprojpath)
+        origin = helper.read_file(pbxprojpath)
+        assert formatted(pbxprojpath) == origin
+
+        # the project name of the comments is the name of the xcodeproj
+        outpath = os.path.join(workdir, u'out', PRODUCT_NAME + u'.xcodeproj', u'project.pbxproj')
+        os.makedirs(os.path.dirname(outpath))
+        edited = None
+        for lazy, use_cache in LOAD_MODES:
+            for minimal_diff in [False, True]:
+                tag = u'lazy={0}, cache={1}, minimal_diff={2}'.format(lazy, use_cache, minimal_diff)
+                xcproj = pbxproj.XcodeProj.load(xcprojpath, lazy=lazy, use_cache=use_cache)
+                xcproj.save(outpath, minimal_diff=minimal_diff)
+                assert helper.read_file(outpath) == origin, u'{0}: changed without any edit'.format(tag)
+
+                edit(xcproj)
+                xcproj.save(outpath, minimal_diff=minimal_diff)
+                edited = helper.read_file(outpath) if edited is None else edited
+                assert helper.read_file(outpath) == edited, u'{0}: differs from the others'.format(tag)
+        assert formatted(outpath) == edited
+        assert not b'Renamed' in origin and b'Renamed' in edited
+    finally:
+        if environ is None:
+            os.environ.pop(pbxcache.CACHE_DIR_ENV, None)
+        else:
+            os.environ[pbxcache.CACHE_DIR_ENV] = environ
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_lazy_faulting():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-roundtrip-')
+    try:
+        pbxprojpath = make_project(os.path.join(workdir, u'project'))
+        xcprojpath = os.path.dirname(pbxprojpath)
+        plist = pbxparser.load(pbxprojpath)[u'objects']
+        bfguid = [g for g, o in plist.items() if o[u'isa'] == u'PBXBuildFile'][0]
+        refguid = plist[bfguid][u'fileRef']
+        eager = pbxproj.XcodeProj.load(xcprojpath)
+
+        xcproj = pbxproj.XcodeProj.load(xcprojpath, lazy=True)
+        target = xcproj.pbx_rootObject.pbx_targets[0]
+        assert target.isfault() # reached, not parsed
+        assert target.pbx_name == PRODUCT_NAME
+        assert not target.isfault()
+
+        buildfile = xcproj.get_object(bfguid)
+        assert buildfile.isfault()
+        assert buildfile.pbx_fileRef.guid == refguid
+        assert buildfile.pbx_fileRef.pbx_path == plist[refguid][u'path']
+        # the referrers are loaded on demand, from the objects not reached yet
+        fileref = xcproj.get_object(refguid)
+        assert sorted(fileref.referrers().keys()) == \
+            sorted(eager.get_object(refguid).referrers().keys())
+
+        assert helper.text(xcproj) == helper.read_file(pbxprojpath)
+        assert len([o for g, o in xcproj.objects().guid_items() if o.isfault()]) == 0
+        assert sorted(xcproj.objects().guids()) == sorted(eager.objects().guids())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_cache_invalidation():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-roundtrip-')
+    environ = os.environ.get(pbxcache.CACHE_DIR_ENV)
+    os.environ[pbxcache.CACHE_DIR_ENV] = os.path.join(workdir, u'cache')
+    try:
+        pbxprojpath = make_project(os.path.join(workdir, u'project'))
+        xcprojpath = os.path.dirname(pbxprojpath)
+        def __restored():
+            """ return True if the cache of the current file would be restored """
+            header = pbxcache.file_header(pbxprojpath, helper.read_file(pbxprojpath))
+            return not pbxcache.load(pbxproj.XcodeProj(), pbxprojpath, header) is None
+        # end of __restored
+
+        os.utime(pbxprojpath, (1500000000, 1500000000)) # restorable by utime() exactly
+        assert not __restored()
+        pbxproj.XcodeProj.load(xcprojpath, use_cache=True) # written
+        assert __restored()
+
+        # the layout of the objects changed
+        version = pbxcache.CACHE_VERSION
+        pbxcache.CACHE_VERSION = version + 1
+        try:
+            assert not __restored()
+        finally:
+            pbxcache.CACHE_VERSION = version
+        assert __restored()
+
+        # the content changed, while the size and mtime did not
+        size = os.stat(pbxprojpath).st_size
+        data = helper.read_file(pbxprojpath)
+        assert data.count(PRODUCT_NAME.encode('utf-8') + b'Ext') > 0
+        helper.write_file(pbxprojpath, data.replace(PRODUCT_NAME.encode('utf-8') + b'Ext', \
+            PRODUCT_NAME[::-1].encode('utf-8') + b'Ext'))
+        os.utime(pbxprojpath, (1500000000, 1500000000))
+        assert os.stat(pbxprojpath).st_size == size
+        assert not __restored()
+        xcproj = pbxproj.XcodeProj.load(xcprojpath, use_cache=True) # parsed and written again
+        assert xcproj.pbx_rootObject.pbx_targets[1].pbx_name == PRODUCT_NAME[::-1] + u'Ext'
+        assert __restored()
+
+        # the cache file is broken
+        helper.write_file(pbxcache.cache_path(pbxprojpath), b'broken')
+        assert not __restored()
+        xcproj = pbxproj.XcodeProj.load(xcprojpath, use_cache=True)
+        assert helper.text(xcproj) == helper.read_file(pbxprojpath)
+
+        pbxproj.XcodeProj.clear_cache(xcprojpath)
+        assert not os.path.exists(pbxcache.cache_path(pbxprojpath))
+    finally:
+        if environ is None:
+            os.environ.pop(pbxcache.CACHE_DIR_ENV, None)
+        else:
+            os.environ[pbxcache.CACHE_DIR_ENV] = environ
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
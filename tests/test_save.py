@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Save test: the saved file must contain every change made after the load, including the
+containers of the attributes changed in place, whatever text is reused from the caches.
+
+usage:
+    python tests/test_save.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxproj
+from xcodeproj.pbxproj import pbxparser
+import helper
+
+PRODUCT_NAME = u'Save'
+
+def make_project(project_dir):
+    return helper.make_project(project_dir, PRODUCT_NAME, helper.source_files(10))
+
+def edit_in_place(xcproj):
+    """ change the containers of some attributes in place, return the checker of the saved plist """
+    cfg = xcproj.pbx_rootObject.pbx_buildConfigurationList.pbx_buildConfigurations[0]
+    cfg.pbx_buildSettings[u'IN_PLACE'] = u'YES'
+    cfg.pbx_buildSettings.setdefault(u'IN_PLACE_LIST', []).append(u'a')
+    cfg.pbx_buildSettings[u'IN_PLACE_LIST'].append(u'b')
+    group = xcproj.main_group()
+    child = group.pbx_children[-1]
+    group.pbx_children.remove(child)
+    group.pbx_children.insert(0, child)
+
+    def __check(plist):
+        settings = plist[u'objects'][cfg.guid][u'buildSettings']
+        assert settings.get(u'IN_PLACE') == u'YES'
+        assert settings.get(u'IN_PLACE_LIST') == [u'a', u'b']
+        assert plist[u'objects'][group.guid][u'children'][0] == child.guid
+    return __check
+
+def test_edit_in_place():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-save-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        outpath = os.path.join(workdir, u'out.pbxproj')
+        for lazy in [False, True]:
+            for minimal_diff in [False, True]:
+                xcproj = pbxproj.XcodeProj.load(xcprojpath, lazy=lazy)
+                xcproj.save(outpath, minimal_diff=minimal_diff) # fill the caches
+                revision = xcproj.revision()
+                check = edit_in_place(xcproj)
+                assert xcproj.revision() > revision, u'the changes in place are not notified'
+                xcproj.save(outpath, minimal_diff=minimal_diff)
+                check(pbxparser.load(outpath))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_helpers_in_place():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-save-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        outpath = os.path.join(workdir, u'out.pbxproj')
+        xcproj = pbxproj.XcodeProj.load(xcprojpath)
+        xcproj.save(outpath) # fill the caches
+        # the helpers edit the containers in place, which notify their owners
+        project = xcproj.pbx_rootObject
+        cfg = project.pbx_buildConfigurationList.pbx_buildConfigurations[0]
+        cfg.set_build_setting(u'BY_HELPER', u'YES')
+        cfg.add_str_build_settings(u'OTHER_CFLAGS', [u'-a', u'-b'])
+        cfg.remove_build_setting(u'BY_HELPER')
+        group = xcproj.main_group()
+        fileref = xcproj.objects().get(u'PBXFileReference').values()[0]
+        project.add_project_reference({u'ProductGroup': group, u'ProjectRef': fileref})
+        xcproj.save(outpath)
+
+        objects = pbxparser.load(outpath)[u'objects']
+        assert not u'BY_HELPER' in objects[cfg.guid][u'buildSettings']
+        assert objects[cfg.guid][u'buildSettings'][u'OTHER_CFLAGS'].split()[-2:] == [u'-a', u'-b']
+        assert objects[project.guid][u'projectReferences'] == \
+            [{u'ProductGroup': group.guid, u'ProjectRef': fileref.guid}]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_minimal_diff_in_place():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-save-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        pbxprojpath = os.path.join(xcprojpath, u'project.pbxproj')
+        for tofile in [None, pbxprojpath]:
+            xcproj = pbxproj.XcodeProj.load(xcprojpath)
+            target = xcproj.pbx_rootObject.pbx_targets[0]
+            target.pbx_name = target.pbx_name + u'X'
+            xcproj.save(tofile, minimal_diff=True) # the loaded file is mapped as the origin
+            assert os.listdir(xcprojpath) == [u'project.pbxproj']
+            plist = pbxparser.load(pbxprojpath)
+            assert plist[u'objects'][target.guid][u'name'] == target.pbx_name
+
+            xcproj.save(tofile, minimal_diff=True) # the origin is gone with the loaded file
+            assert pbxparser.load(pbxprojpath) == plist
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_orphans():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-save-')
+    try:
+        for lazy in [False, True]:
+            xcprojpath = make_project(os.path.join(workdir, u'project-{0}'.format(lazy)))
+            xcproj = pbxproj.XcodeProj.load(xcprojpath, lazy=lazy)
+            target = xcproj.pbx_rootObject.pbx_targets[0]
+            orphans = [target.guid] + [p.guid for p in target.pbx_buildPhases]
+            xcproj.pbx_rootObject.removetarget(target) # validate() is not called
+            xcproj.save()
+            objects = pbxparser.load(os.path.join(xcprojpath, u'project.pbxproj'))[u'objects']
+            assert len([guid for guid in orphans if guid in objects]) == 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
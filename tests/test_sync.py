@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Sync test: sync_group() must mirror the files added, removed and moved on disk into the group,
+keep the build files of the moved files, and leave the hidden files of the group untouched.
+the file trees are walked by a shared pool, bounded and never running more than 'jobs' threads
+for a walk.
+
+usage:
+    python tests/test_sync.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+import threading
+import time
+
+from xcodeproj.pbxproj import projhelper
+import helper
+
+PRODUCT_NAME = u'Sync'
+
+def files_in_group(group):
+    """ return [realpath] of the file references in the subtree of 'group' """
+    paths = []
+    for child in group.pbx_children:
+        if child.isa == u'PBXFileReference':
+            paths.append(child.realpath())
+        else:
+            paths.extend(files_in_group(child))
+    return sorted(paths)
+
+def files_on_disk(dirpath):
+    """ return [path] of the files in 'dirpath', except the hidden ones """
+    paths = []
+    for root, dirs, files in os.walk(dirpath):
+        dirs[:] = [d for d in dirs if not d.startswith(u'.')]
+        paths.extend([os.path.join(root, f) for f in files if not f.startswith(u'.')])
+    return sorted(paths)
+
+def built_files(target):
+    """ return [realpath] of the files built by 'target' """
+    return sorted([bf.pbx_fileRef.realpath() for phase in target.pbx_buildPhases \
+        for bf in phase.pbx_files])
+
+def test_sync():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-sync-')
+    try:
+        project_dir = os.path.join(workdir, u'project')
+        xcproj = helper.create_project(project_dir, PRODUCT_NAME)
+        target = xcproj.pbx_rootObject.pbx_targets[0]
+        srcdir = os.path.join(project_dir, PRODUCT_NAME)
+        helper.write_files(srcdir, [u'a.m', u'b.m', u'sub/c.m', u'sub/deep/d.m'])
+        group = xcproj.main_group().addgroup(srcdir)
+
+        added, removed, moved = xcproj.sync_group(group, srcdir, target)
+        assert len(added) == 4 and len(removed) == 0 and len(moved) == 0
+        assert files_in_group(group) == files_on_disk(srcdir)
+        assert built_files(target) == files_on_disk(srcdir)
+        assert xcproj.sync_group(group, srcdir, target) == ([], [], [])
+
+        # a hidden file in the group is not listed on disk, but must be kept
+        helper.write_file(os.path.join(srcdir, u'.hidden.m'))
+        group.addfile(os.path.join(srcdir, u'.hidden.m'))
+        hidden = xcproj.fileref_for_path(os.path.join(srcdir, u'.hidden.m'))
+        assert not hidden is None
+
+        helper.write_file(os.path.join(srcdir, u'sub', u'e.m'))
+        os.remove(os.path.join(srcdir, u'b.m'))
+        shutil.rmtree(os.path.join(srcdir, u'sub', u'deep'))
+        os.rename(os.path.join(srcdir, u'a.m'), os.path.join(srcdir, u'sub', u'a2.m'))
+        added, removed, moved = xcproj.sync_group(group, srcdir, target)
+        assert added == [os.path.join(srcdir, u'sub', u'e.m')]
+        assert sorted(removed) == sorted([os.path.join(srcdir, u'b.m'), \
+            os.path.join(srcdir, u'sub', u'deep', u'd.m')])
+        assert moved == [(os.path.join(srcdir, u'a.m'), os.path.join(srcdir, u'sub', u'a2.m'))]
+        assert xcproj.fileref_for_path(os.path.join(srcdir, u'.hidden.m')) is hidden
+        assert files_in_group(group) == sorted(files_on_disk(srcdir) + [hidden.realpath()])
+        assert built_files(target) == files_on_disk(srcdir) # the moved file is still built
+        subgroup = [g for g in group.pbx_children if g.displayname() == u'sub'][0]
+        assert len([g for g in subgroup.pbx_children if g.displayname() == u'deep']) == 0
+
+        # the group is changed while the directory is not
+        xcproj.remove_object(xcproj.fileref_for_path(os.path.join(srcdir, u'sub', u'e.m')))
+        added, removed, moved = xcproj.sync_group(group, srcdir, target)
+        assert added == [os.path.join(srcdir, u'sub', u'e.m')]
+        assert xcproj.sync_group(group, srcdir, target) == ([], [], [])
+
+        # the changes out of the group do not make the sync visit it again
+        visits = []
+        detect_filetypes = projhelper._detect_filetypes
+        projhelper._detect_filetypes = lambda *args: visits.append(args)
+        try:
+            target.pbx_name = u'Renamed'
+            assert xcproj.sync_group(group, srcdir, target) == ([], [], [])
+            assert len(visits) == 0
+        finally:
+            projhelper._detect_filetypes = detect_filetypes
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_thread_pool():
+    running = [0, 0] # [running, max running]
+    lock = threading.Lock()
+    def __square(value):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.001)
+        with lock:
+            running[0] -= 1
+        return value * value
+
+    for jobs in [1, 2, 3, 100]:
+        for count in [0, 1, 5, 40]:
+            running[1] = 0
+            assert projhelper._map(__square, list(range(count)), jobs) == \
+                [v * v for v in range(count)]
+            assert running[1] <= jobs, u'{0} threads run for {1} jobs'.format(running[1], jobs)
+
+    # one pool is shared, bounded, and re-created after it is closed at exit
+    pool = projhelper._thread_pool(2)
+    assert projhelper._thread_pool(2) is pool
+    projhelper._thread_pool(1000)
+    assert projhelper._THREAD_POOL[u'size'] == projhelper.MAX_SCAN_JOBS
+    projhelper._close_thread_pool()
+    assert projhelper._THREAD_POOL[u'pool'] is None
+    assert projhelper._map(__square, [1, 2, 3], 2) == [1, 4, 9]
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
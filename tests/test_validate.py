@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Validate test: validate() must visit only the objects changed since the last validation
+(all of them after loaded), and leave the project as validating all the objects does.
+
+usage:
+    python tests/test_validate.py
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import shutil
+import tempfile
+
+from xcodeproj.pbxproj import pbxproj
+import helper
+
+PRODUCT_NAME = u'Validate'
+
+def make_project(project_dir):
+    return helper.make_project(project_dir, PRODUCT_NAME, helper.source_files(10))
+
+class Visits(object):
+    """ record the guids of the objects validated, while it is entered """
+    def __init__(self, xcproj):
+        self.__classes = set([type(o) for g, o in xcproj.objects().guid_items()])
+        self.__origins = {}
+        self.guids = set()
+
+    def __enter__(self):
+        def __wrap(validate):
+            def __validate(obj):
+                self.guids.add(obj.guid)
+                return validate(obj)
+            return __validate
+        # end of __wrap
+
+        for cls in self.__classes:
+            self.__origins[cls] = cls.__dict__.get(u'validate')
+            setattr(cls, u'validate', __wrap(cls.validate))
+        return self
+
+    def __exit__(self, *args):
+        for cls, validate in self.__origins.items():
+            if validate is None:
+                delattr(cls, u'validate')
+            else:
+                setattr(cls, u'validate', validate)
+
+def edit(xcproj):
+    """ 
+    make some changes, including the ones validate() must resolve,
+    return ([guid] of the objects changed, guid of the file reference to be removed)
+    """
+    target = xcproj.pbx_rootObject.pbx_targets[0]
+    target.pbx_name = u'Renamed'
+    fileref = [c for c in xcproj.main_group().pbx_children[-1].pbx_children \
+        if c.isa == u'PBXFileReference'][0]
+    owner = list(fileref.owners().values())[0]
+    owner.removechild(fileref) # its build file is left, see validate()
+    return set([target.guid, owner.guid]), fileref.guid
+
+def test_changed_only():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-validate-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        xcproj = pbxproj.XcodeProj.load(xcprojpath)
+        with Visits(xcproj) as visits:
+            xcproj.validate() # the loaded objects are validated once
+            assert len(visits.guids) == len(xcproj.objects().guids())
+            assert not xcproj.need_validate()
+            visits.guids.clear()
+            xcproj.validate()
+            assert len(visits.guids) == 0
+
+            changed, removed = edit(xcproj)
+            assert xcproj.need_validate()
+            xcproj.validate()
+            assert changed.issubset(visits.guids)
+            assert xcproj.get_object(removed) is None # out of the group tree
+            # the objects validate their children, but the ones out of the changes are not visited
+            unrelated = [g for g, o in xcproj.objects().guid_items() \
+                if o.isa in [u'PBXProject', u'XCBuildConfiguration']]
+            assert len(unrelated) > 0
+            assert len([g for g in unrelated if g in visits.guids]) == 0
+            assert not xcproj.need_validate()
+
+            visits.guids.clear()
+            xcproj.validate()
+            assert len(visits.guids) == 0
+
+            # deferred to the end of the batch
+            with xcproj.batch():
+                xcproj.pbx_rootObject.pbx_targets[0].pbx_name = u'Batch'
+                xcproj.validate()
+                assert len(visits.guids) == 0
+            assert len(visits.guids) > 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def test_same_as_full():
+    workdir = tempfile.mkdtemp(prefix=u'xcodeproj-validate-')
+    try:
+        xcprojpath = make_project(os.path.join(workdir, u'project'))
+        results = []
+        for full in [False, True]:
+            xcproj = pbxproj.XcodeProj.load(xcprojpath)
+            xcproj.validate()
+            edit(xcproj)
+            if full:
+                for guid, obj in xcproj.objects().guid_items():
+                    obj.markdirty()
+            xcproj.validate()
+            results.append(helper.text(xcproj))
+        assert results[0] == results[1]
+        assert results[0].count(b'PBXBuildFile;') == 9 # the build file of the removed file
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    for name, test in sorted(globals().items()):
+        if name.startswith(u'test_') and callable(test):
+            test()
+    print(u'ok')
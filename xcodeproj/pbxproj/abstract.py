@@ -14,21 +14,82 @@ from xcodeproj.utils import logger
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import pbxconsts
 from xcodeproj.pbxproj import attr
+from xcodeproj.pbxproj import pbxlist
+
+class PBXWriter(object):
+    """
+    buffered writer for formatting objects in pbxproj format.
+    collects unicode fragments, and writes them utf-8 encoded to 'fp' in chunks, 
+    so the whole file is never held in memory.
+    """
+
+    def __init__(self, fp, bufsize=64 * 1024, origin=None):
+        """
+        :param fp:      file object opened in binary mode
+        :param bufsize: the number of characters to buffer before flushing to 'fp'
+        :param origin:  bytes (eg: mmap) of the loaded pbxproj file, for write_origin()
+        """
+        self.__fp = fp
+        self.__bufsize = bufsize
+        self.__origin = origin
+        self.__fragments = []
+        self.__size = 0
+
+    def write(self, val):
+        """ write unicode fragment """
+        self.__fragments.append(val)
+        self.__size += len(val)
+        if self.__size >= self.__bufsize:
+            self.flush()
+
+    def flush(self):
+        if len(self.__fragments) > 0:
+            self.__fp.write(u''.join(self.__fragments).encode('utf-8'))
+            self.__fragments = []
+            self.__size = 0
+
+    def hasorigin(self):
+        """ return True if the bytes of the loaded file are available """
+        return not self.__origin is None
+
+    def write_origin(self, start, end):
+        """ copy the bytes [start, end) of the loaded file verbatim """
+        self.flush()
+        self.__fp.write(self.__origin[start:end])
+
+
+class PBXStringWriter(object):
+    """ writer that collects the formatted text in memory """
+
+    def __init__(self):
+        self.__fragments = []
+
+    def write(self, val):
+        self.__fragments.append(val)
+
+    def hasorigin(self):
+        return False
+
+    def getvalue(self):
+        return u''.join(self.__fragments)
+
 
 class PBXAbstract(object):
 
-    def __getattribute__(self, name):
+    __slots__ = () # the layout is defined by subclasses
+
+    def __getattr__(self, name):
+        """ called only if the normal lookup fails, the pbx-attributes not set are None """
         if func.hasprefix(name, pbxconsts.PBX_ATTR_PREFIX):
-            try:
-                return super(PBXAbstract, self).__getattribute__(name)
-            except AttributeError as e:
-                return None #attr.getvalue(self, name)
-        else:
-            return super(PBXAbstract, self).__getattribute__(name)
+            return None
+        raise AttributeError(u'\'{cls}\' object has no attribute \'{name}\''\
+            .format(cls=self.__class__.__name__, name=name))
 
     def canonical_arg(self, arg):
         def __dispatch(obj):
-            if func.isseq(obj):
+            if isinstance(obj, pbxlist.PBXList):
+                return obj # list of pbx-objects, already canonical
+            elif func.isseq(obj):
                 return __canonical_list(list(obj))
             elif func.isdict(obj):
                 return __canonical_dict(obj)
@@ -114,84 +175,87 @@ class PBXAbstract(object):
             elif func.isdict(v):
                 self.__parse_dict_attr_val(v, depkey)
 
+    def _pbxattrs(self):
+        """ return {pbxkey: value} of the pbx-attributes that are set """
+        return {k: v for k, v in self.__dict__.items() \
+            if func.hasprefix(k, pbxconsts.PBX_ATTR_PREFIX)}
+
     def pbxdict(self):
         """ return dict with pbx-attr and values (exclude guid) """
-        dic = {k[len(pbxconsts.PBX_ATTR_PREFIX):]:v \
-            for k, v in self.__dict__.items() if func.hasprefix(k, pbxconsts.PBX_ATTR_PREFIX)}
+        dic = {k[len(pbxconsts.PBX_ATTR_PREFIX):]:v for k, v in self._pbxattrs().items()}
         return dic
 
-    def safely_write(self, buff, val):
-        buff.append(func.to_unicode(val))
+    def _pbxpairs(self):
+        """ return [(pbxkey, value)] of pbxdict() in the order they are written, 'isa' first """
+        return sorted(self.pbxdict().items(), key=lambda e: 0 if e[0] == u'isa' else e[0])
 
     def write(self, buff, identstr=u''):
         """
         format object to str in xcode pbxproj format
-        :param  buff    list, the buff to write to
+        :param  buff    PBXWriter, the buff to write to
         """
-        self.safely_write(buff, identstr)
-        self.safely_write(buff, pbxhelper.pbxstr_escape(self.guid))
+        buff.write(identstr)
+        buff.write(pbxhelper.pbxstr_escape(self.guid))
 
-        comment = self.comment()
+        comment = self._pbxcomment()
         if not comment is None:
-            self.safely_write(buff, u' /* {cmt} */'.format(cmt=comment))
+            buff.write(u' /* {cmt} */'.format(cmt=comment))
 
-        self.safely_write(buff, u' = ')
-        pairs = sorted(self.pbxdict().items(), key=lambda e: 0 if e[0] == u'isa' else e[0])
-        self._print_pairs(buff, pairs, identstr, singleline=self._print_in_one_line())
-        self.safely_write(buff, u';')
+        buff.write(u' = ')
+        self._print_pairs(buff, self._pbxpairs(), identstr, singleline=self._print_in_one_line())
+        buff.write(u';')
 
     def _print_pairs(self, buff, pairs, identstr, singleline=False):
-        self.safely_write(buff, u'{')
+        buff.write(u'{')
         if not singleline:
-            self.safely_write(buff, u'{sep}'.format(sep=os.linesep))
+            buff.write(u'{sep}'.format(sep=os.linesep))
 
         for k, v in pairs:
             self._print_kv(buff, k, v, identstr + u'\t', singleline)
 
         if not singleline:
-            self.safely_write(buff, identstr)
-        self.safely_write(buff, u'}')
+            buff.write(identstr)
+        buff.write(u'}')
 
     def _print_value(self, buff, val, identstr, singleline=False):
         from xcodeproj.pbxproj import baseobject
-        # self.safely_write(buff, u'')
+        # buff.write(u'')
         
         if func.isdict(val):
-            pairs = sorted(val.items(), key=lambda e: e)
-            self._print_pairs(buff, pairs, identstr, singleline)
+            self._print_pairs(buff, sorted(val.items()), identstr, singleline)
         elif func.isseq(val):
             self._print_list(buff, val, identstr, singleline)
         elif isinstance(val, baseobject.PBXBaseObject):
-            self.safely_write(buff, pbxhelper.pbxstr_escape(val.guid))
-            comment = val.comment()
+            buff.write(pbxhelper.pbxstr_escape(val.guid))
+            comment = val._pbxcomment()
             if not comment is None:
-                self.safely_write(buff, u' /* {comment} */'.format(comment=comment))
+                buff.write(u' /* {comment} */'.format(comment=comment))
         else:
-            self.safely_write(buff, pbxhelper.pbxstr_escape(val))
+            buff.write(pbxhelper.pbxstr_escape(val))
 
     def _print_list(self, buff, obj, identstr, singleline=False):
-        self.safely_write(buff, u'(')
+        buff.write(u'(')
         if not singleline:
-            self.safely_write(buff, u'{sep}'.format(sep=os.linesep))
+            buff.write(u'{sep}'.format(sep=os.linesep))
 
         for o in obj:
             if not o is None:
                 if not singleline:
-                    self.safely_write(buff, identstr + u'\t')
+                    buff.write(identstr + u'\t')
                 self._print_value(buff, o, identstr+u'\t', singleline)
-                self.safely_write(buff, u',{sep}'.format(sep=u' ' if singleline else os.linesep))
+                buff.write(u',{sep}'.format(sep=u' ' if singleline else os.linesep))
 
         if not singleline:
-            self.safely_write(buff, identstr)
-        self.safely_write(buff, u')')
+            buff.write(identstr)
+        buff.write(u')')
 
     def _print_kv(self, buff, key, val, identstr, singleline=False):
         if not key is None and not val is None:
-            self.safely_write(buff, u'' if singleline else identstr)
-            self.safely_write(buff, u'{key} = '.format(key=pbxhelper.pbxstr_escape(key)))
+            buff.write(u'' if singleline else identstr)
+            buff.write(u'{key} = '.format(key=pbxhelper.pbxstr_escape(key)))
 
             self._print_value(buff, val, identstr, singleline)
-            self.safely_write(buff, u';{sep}'.format(sep=u' ' if singleline else os.linesep))
+            buff.write(u';{sep}'.format(sep=u' ' if singleline else os.linesep))
         # else:
         #     raise ValueError(u'invalid value. {k} = {v}'.format(k=key, v=val))
 
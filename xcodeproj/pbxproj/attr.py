@@ -9,81 +9,140 @@ ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
+import weakref
 
 class Attribute(object):
-
-    def __init__(self, name, type=None, **kwargs):
+    """
+    data descriptor of a declared pbx-attribute, installed on the pbx-object classes by reg_attrs().
+    the value is stored in the slot of the same name, 'slot' is its member descriptor.
+    reading fires the lazy fault of the object, and returns 'default' if the attribute is not set.
+    writing calls the typed setter 'setter(obj, value)' of the class, 
+    or obj._setpbxattr(name, value) if the class has no one.
+    a 'weak' attribute refers back to an ancestor of the object, its value is stored as a weakref,
+    see deref().
+    """
+
+    __slots__ = (u'name', u'slot', u'setter', u'default', u'weak')
+
+    def __init__(self, name, slot, setter=None, default=None, weak=False):
         super(Attribute, self).__init__()
-        self.__name = name
-        self.__type = type
-
-        if u'default' in kwargs:
-            self.__default = kwargs[u'default']
-
-    def __getattribute__(self, name):
-        if name == u'name':
-            return self.__name
-        elif name == u'type':
-            return self.__type
-        # elif name in self.__kwargs:
-        #     return self.__kwargs[name]
-        return super(Attribute, self).__getattribute__(name)
+        self.name = name
+        self.slot = slot
+        self.setter = setter
+        self.default = default
+        self.weak = weak
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        obj.fire_fault()
+        try:
+            return deref(self.slot.__get__(obj, objtype))
+        except AttributeError as e:
+            return self.default
+
+    def __set__(self, obj, value):
+        if self.setter is None:
+            obj._setpbxattr(self.name, value)
+        else:
+            self.setter(obj, value)
+
+    def __delete__(self, obj):
+        obj._delpbxattr(self.name)
 
     def getdefault(self):
-        return self.__default
-
-        # try:
-        #     return super(type(obj), obj).__getattribute__(self.__name)
-        # except AttributeError as e:
-        #     return self.__default
-        
-    
-    # def setvalue(self, obj, value):
-    #     if self.__type is None or isinstance(value, self.__type):
-    #         super(type(obj), obj).__setattr__(self.__name, value)
-    #     else:
-    #         raise ValueError(u'"{obj}.{attr}" expected "{t}" but not "{bad}".'\
-    #             .format(obj=type(obj), attr=self.__name, t=self.__type, bad=type(value)))
-
-__OBJ_ATTRS = dict()
-
-def reg_attr(objtype, attr):
-    clsname = objtype.__name__
-    if clsname in __OBJ_ATTRS:
-        __OBJ_ATTRS[clsname][attr.name] = attr
-    else:
-        __OBJ_ATTRS[clsname] = {attr.name: attr}
-
-def has_reg_attr(obj, attr):
-    for clstype in type(obj).__mro__:
-        dic = __OBJ_ATTRS.get(clstype.__name__, None)
-        if not dic is None:
-            return attr in dic
-    return False
-
-def getvalue(obj, attr):
-    try:
-        for clstype in type(obj).__mro__:
-            dic = __OBJ_ATTRS.get(clstype.__name__, None)
-            if not dic is None:
-                if attr in dic:
-                    return dic[attr].getdefault()
-    except KeyError as e:
-        raise AttributeError(u'\'{o}\' object has no attribute \'{a}\''.format(o=obj, a=attr))
-
-# def setvalue(obj, attr, value):
-#     for clstype in type(obj).__mro__:
-#         dic = __OBJ_ATTRS.get(clstype.__name__, None)
-#         if not dic is None:
-#             if attr in dic:
-#                 return dic[attr].setvalue(obj, vaule)
-#             else:
-#                 return super(type(obj), obj).__setattr__(attr, value)
-#     return super(type(obj), obj).__setattr__(attr, value)
-
-
-
-
-
-
-
+        return self.default
+
+    def getraw(self, obj):
+        """ return the stored value, raise AttributeError if it is not set """
+        return deref(self.slot.__get__(obj, type(obj)))
+
+    def setraw(self, obj, value):
+        """ store the value without notification """
+        self.slot.__set__(obj, weakref.ref(value) if self.weak and not value is None else value)
+
+    def delraw(self, obj):
+        """ remove the value without notification, raise AttributeError if it is not set """
+        self.slot.__delete__(obj)
+
+
+def slots(pbxattrs, private=()):
+    """
+    return __slots__ for a pbx-object class, 
+    the declared pbx-attributes are prefixed with 'pbx_', the 'private' names are used as is.
+    the attributes not declared are kept in the overflow mapping of the object.
+    """
+    return tuple([u'pbx_{0}'.format(a) for a in pbxattrs]) + tuple(private)
+
+def deref(value):
+    """ return the value stored in a slot, the weakly held one is dereferenced """
+    return value() if type(value) is weakref.ref else value
+
+def reg_attrs(cls, defaults=None, weak=()):
+    """
+    install the Attribute descriptors of the pbx-attributes declared by 'cls' and its base classes,
+    it must be called after the class statement of every class that declares pbx-attributes 
+    or typed setters.
+    the method '_set_<pbx-attribute>(self, value)' of 'cls', if any, is the typed setter.
+    :param defaults: {pbx-attribute: value} the values of the attributes not set, None by default
+    :param weak:    [pbx-attribute] the attributes referring back to an ancestor (eg: the project),
+                    they hold the objects weakly, so that the object graph has no cycle.
+    """
+    defaults = defaults if not defaults is None else {}
+    members = dict(pbx_slot_members(cls))
+    for name in pbx_slot_names(cls):
+        inherited = attribute(cls, name)
+        default = inherited.default if not inherited is None else None
+        isweak = name in weak or (not inherited is None and inherited.weak)
+        setattr(cls, name, Attribute(name, members[name], \
+            setter=getattr(cls, u'_set_{0}'.format(name), None), default=defaults.get(name, default), \
+            weak=isweak))
+
+def attribute(cls, name):
+    """ return the Attribute descriptor of pbx-attribute 'name' of 'cls', None if not declared """
+    desc = getattr(cls, name, None)
+    return desc if isinstance(desc, Attribute) else None
+
+__CLS_SLOTS = dict() # {class: (slot members, pbx slot members, ordered pbx slot members)}
+
+def __class_slots(cls):
+    members = __CLS_SLOTS.get(cls, None)
+    if members is None:
+        allmembers = []
+        for clstype in reversed(cls.__mro__):
+            for name in clstype.__dict__.get(u'__slots__', ()):
+                if name in [u'__dict__', u'__weakref__']:
+                    continue
+                elif name.startswith(u'__') and not name.endswith(u'__'):
+                    name = u'_{0}{1}'.format(clstype.__name__.lstrip(u'_'), name) # mangled
+                member = clstype.__dict__[name]
+                if isinstance(member, Attribute):
+                    member = member.slot
+                allmembers.append((name, member))
+        pbxmembers = [m for m in allmembers if m[0].startswith(u'pbx_')]
+        ordered = sorted([(name[len(u'pbx_'):], member) for name, member in pbxmembers])
+        members = (tuple(allmembers), tuple(pbxmembers), tuple(ordered))
+        __CLS_SLOTS[cls] = members
+    return members
+
+def slot_members(cls):
+    """ 
+    return ((name, member descriptor)) of all the slots of 'cls' and its base classes,
+    the member descriptors access the stored values without the Attribute descriptors
+    """
+    return __class_slots(cls)[0]
+
+def pbx_slot_members(cls):
+    """ return ((name, member descriptor)) of the pbx-attribute slots of 'cls' and its base classes """
+    return __class_slots(cls)[1]
+
+def pbx_ordered_members(cls):
+    """ 
+    return ((pbxkey, member descriptor)) of the pbx-attribute slots of 'cls' and its base classes,
+    sorted by pbxkey (the name without 'pbx_'), which is the order they are written in.
+    """
+    return __class_slots(cls)[2]
+
+def pbx_slot_names(cls):
+    """ return the names of the pbx-attribute slots of 'cls' and its base classes """
+    return tuple([name for name, member in pbx_slot_members(cls)])
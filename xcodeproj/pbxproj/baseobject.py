@@ -12,38 +12,222 @@ ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
+import weakref
+
 from xcodeproj.utils import func
 from xcodeproj.utils import logger
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import abstract
 from xcodeproj.pbxproj import pbxconsts
+from xcodeproj.pbxproj import pbxlist
+from xcodeproj.pbxproj import attr
+
+
+def copy_value(val):
+    """ 
+    return a copy of the containers in 'val', the pbx-objects and strings are shared.
+    the copied attribute containers are bound to the same owner.
+    """
+    cls = type(val)
+    if cls is dict or cls is pbxlist.PBXDict:
+        copied = cls([(k, copy_value(v) if type(v) in _CONTAINERS else v) for k, v in val.items()])
+    elif cls is list or cls is pbxlist.PBXArray:
+        copied = cls([copy_value(v) if type(v) in _CONTAINERS else v for v in val])
+    elif cls is pbxlist.PBXList:
+        copied = pbxlist.PBXList(val)
+    elif cls is set:
+        return set(val)
+    else:
+        return val
+    return copied if cls is dict or cls is list else copied._bind(val.owner())
+
+_CONTAINERS = frozenset([dict, list, pbxlist.PBXDict, pbxlist.PBXArray, pbxlist.PBXList, set])
+
+def _deref_values(refs):
+    """ return {key: object} of the alive objects in {key: weakref} 'refs' """
+    objs = {}
+    for key, ref in refs.items():
+        obj = ref()
+        if not obj is None:
+            objs[key] = obj
+    return objs
 
 
 class PBXBaseObject(abstract.PBXAbstract):
+    """
+    the attributes are stored in slots, the pbx-attributes are declared by 'attr.slots()' 
+    in each subclass and accessed by the descriptors installed by 'attr.reg_attrs()',
+    the undeclared pbx-attributes are kept in an overflow dict.
+    """
+
+    __slots__ = attr.slots([], private=(u'guid', u'__xcproj', u'__referrers', u'__owners', \
+        u'__dirty', u'__dependencies', u'__fault', u'__referrers_fault', u'__comment', \
+        u'__comment_published', u'__rendered', u'__origin', u'__extra', u'__weakref__'))
     
     def __init__(self, xcproj, guid):
         super(PBXBaseObject, self).__init__()
         self.guid = func.to_unicode(guid)
-        self.__xcproj = xcproj
+        self.__xcproj = weakref.ref(xcproj) # the project owns the objects, not vice versa
 
-        self.__referrers = {} # {guid: referrer}
-        self.__owners = None # {guid: owner}
+        self.__referrers = None # {guid: weakref of referrer}, see __referrers_dict()
+        self.__owners = None # {guid: weakref of owner}
         self.__dirty = True
-        self.__dependencies = {} # {guid:set(keypath)}
-
-    def __getattribute__(self, name):
-        if name == u'isa':
-            return self.__class__.__name__
-        else:
-            return super(PBXBaseObject, self).__getattribute__(name)
+        self.__dependencies = None # {guid: keypath or set(keypath)}, see __dependencies_dict()
+        self.__fault = False # lazy load: attributes are not parsed yet
+        self.__referrers_fault = False # lazy load: referrers are not loaded yet
+        self.__comment = None # (comment,), memoized comment()
+        self.__comment_published = False # if the comment may be contained in any text
+        self.__rendered = None # (identstr, text), the text of last write()
+        self.__origin = None # (start, end), the byte range in the loaded file, if unchanged
+        self.__extra = None # {pbxkey: value}, the undeclared pbx-attributes
+
+    @property
+    def isa(self):
+        """ the isa of the object is its class name """
+        return self.__class__.__name__
+
+    def __getattr__(self, name):
+        """ 
+        called only if the normal lookup fails, 
+        that is the undeclared pbx-attributes, they are kept in the overflow dict.
+        the declared ones are served by their attr.Attribute descriptors.
+        """
+        if not func.hasprefix(name, pbxconsts.PBX_ATTR_PREFIX):
+            raise AttributeError(u'\'{cls}\' object has no attribute \'{name}\''\
+                .format(cls=self.__class__.__name__, name=name))
+        self.fire_fault()
+        return self.__extra.get(name) if not self.__extra is None else None
 
     def __setattr__(self, name, value):
+        try:
+            object.__setattr__(self, name, value) # the slots and the declared pbx-attributes
+        except AttributeError as e:
+            if not func.hasprefix(name, pbxconsts.PBX_ATTR_PREFIX) \
+                or not attr.attribute(type(self), name) is None:
+                raise
+            self._setpbxattr(name, value) # not declared
+
+    def __delattr__(self, name):
+        try:
+            object.__delattr__(self, name)
+        except AttributeError as e:
+            if not func.hasprefix(name, pbxconsts.PBX_ATTR_PREFIX) \
+                or not attr.attribute(type(self), name) is None:
+                raise
+            self._delpbxattr(name)
+
+    def canonical_arg(self, arg):
+        """ 
+        override, the containers are copied into the ones notifying 'self' of the changes in place,
+        see pbxlist.owned()
+        """
+        return pbxlist.owned(arg, self)
+
+    def _setpbxattr(self, name, value):
+        """ 
+        set pbx-attribute 'name' and mark up the change, bypassing the typed setter. 
+        the typed setters store the checked value by it.
+        """
         value = self.canonical_arg(value)
-        if func.hasprefix(name, pbxconsts.PBX_ATTR_PREFIX):
-            super(PBXBaseObject, self).__setattr__(name, value)
-            self.__dirty = True
+        self.fire_fault()
+        self.__set_pbx_value(name, value)
+        self.markdirty()
+
+    def _delpbxattr(self, name):
+        """ remove pbx-attribute 'name' and mark up the change, raise AttributeError if not set """
+        self.fire_fault()
+        if not self.__del_pbx_value(name):
+            raise AttributeError(name)
+        self.markdirty()
+
+    def __get_pbx_value(self, name):
+        """ return the value of pbx-attribute 'name', None if not set """
+        desc = attr.attribute(type(self), name)
+        if not desc is None:
+            try:
+                return desc.getraw(self)
+            except AttributeError as e:
+                return None
+        return self.__extra.get(name) if not self.__extra is None else None
+
+    def __set_pbx_value(self, name, value):
+        """ set the value of pbx-attribute 'name' without notification """
+        self.__willchange()
+        desc = attr.attribute(type(self), name)
+        if not desc is None:
+            desc.setraw(self, value)
         else:
-            super(PBXBaseObject, self).__setattr__(name, value)
+            if self.__extra is None:
+                self.__extra = {}
+            self.__extra[name] = value
+
+    def __del_pbx_value(self, name):
+        """ remove pbx-attribute 'name' without notification, return False if not set """
+        self.__willchange()
+        desc = attr.attribute(type(self), name)
+        if not desc is None:
+            try:
+                desc.delraw(self)
+                return True
+            except AttributeError as e:
+                return False
+        elif not self.__extra is None and name in self.__extra:
+            self.__extra.pop(name)
+            return True
+        return False
+
+    def _pbxattrs(self):
+        """ override """
+        attrs = {}
+        for name, member in attr.pbx_slot_members(type(self)):
+            try:
+                attrs[name] = attr.deref(member.__get__(self, type(self)))
+            except AttributeError as e:
+                pass # not set
+        if not self.__extra is None:
+            attrs.update(self.__extra)
+        return attrs
+
+    def __getstate__(self):
+        """ return {name: value} of all the attributes, for pickling """
+        state = {}
+        for name, member in attr.slot_members(type(self)):
+            try:
+                state[name] = member.__get__(self, type(self))
+            except AttributeError as e:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for name, member in attr.slot_members(type(self)):
+            if name in state:
+                member.__set__(self, state[name])
+
+    def _snapshot(self):
+        """ return a copy of all the attributes, which can be restored by _restore() """
+        state = self.__getstate__()
+        for name, val in state.items():
+            if type(val) in _CONTAINERS:
+                state[name] = copy_value(val)
+        return state
+
+    def __willchange(self):
+        """ 
+        called before any change of the attributes or the references of 'self', 
+        so that the batch of the project can record the state to roll back
+        """
+        self.__project()._will_change(self)
+
+    def _restore(self, state):
+        """ restore all the attributes from _snapshot(), the attributes set after it are dropped """
+        for name, member in attr.slot_members(type(self)):
+            if name in state:
+                member.__set__(self, state[name])
+            else:
+                try:
+                    member.__delete__(self)
+                except AttributeError as e:
+                    pass # not set
 
     def __str__(self):
         return self.__unicode__().encode('utf-8')
@@ -61,29 +245,128 @@ class PBXBaseObject(abstract.PBXAbstract):
         return super(PBXBaseObject, self).__unicode__()
 
     def project(self):
-        return self.__xcproj
+        """ return the project, None if it has been released """
+        return self.__xcproj()
+
+    def __project(self):
+        """ return the project, raise ReferenceError if it has been released """
+        xcproj = self.__xcproj()
+        if xcproj is None:
+            raise ReferenceError(u'[XcodeProj] the project of {isa} {guid} has been released'\
+                .format(isa=self.isa, guid=self.guid))
+        return xcproj
+
+    def _mark_fault(self):
+        """ 
+        mark up that the object is created lazily,
+        its attributes and referrers will be loaded when they are first reached
+        """
+        self.__fault = True
+        self.__referrers_fault = True
+
+    def isfault(self):
+        """ return True if the attributes of the object are not loaded yet """
+        return self.__fault
+
+    def fire_fault(self):
+        """ load the attributes of a lazily created object """
+        if self.__fault:
+            self.__fault = False
+            self.__project()._fire_fault(self)
+
+    def __fire_referrers_fault(self):
+        if self.__referrers_fault:
+            self.__referrers_fault = False
+            self.__project()._fire_referrers_fault(self)
+
+    def __referrers_dict(self):
+        """ 
+        return {guid: referrer}. 
+        the referrers are held weakly, they are owned by the project, so that the object graph
+        has no cycle and is freed at once with the project.
+        to save memory, a single referrer is stored as its weakref without the dict, 
+        and no referrer as None
+        """
+        refs = self.__referrers
+        if refs is None:
+            return {}
+        elif isinstance(refs, dict):
+            return _deref_values(refs)
+        refer = refs()
+        return {refer.guid: refer} if not refer is None else {}
+
+    def __add_referrer_ref(self, refer):
+        refs = self.__referrers
+        if isinstance(refs, dict):
+            refs[refer.guid] = weakref.ref(refer)
+        elif refs is None or refs() is None or refs().guid == refer.guid:
+            self.__referrers = weakref.ref(refer)
+        else:
+            self.__referrers = {refs().guid: refs, refer.guid: weakref.ref(refer)}
+
+    def __pop_referrers(self, guids):
+        refs = self.__referrers
+        if isinstance(refs, dict):
+            for guid in guids:
+                refs.pop(guid, None)
+            if len(refs) <= 1:
+                self.__referrers = next(iter(refs.values())) if len(refs) == 1 else None
+        elif not refs is None and (refs() is None or refs().guid in guids):
+            self.__referrers = None
+
+    def __dependencies_dict(self):
+        """ 
+        return {guid: keypath or set(keypath)}. 
+        to save memory, a single dependency is stored as tuple (guid, keypath), and no one as None
+        """
+        deps = self.__dependencies
+        if deps is None:
+            return {}
+        elif isinstance(deps, tuple):
+            return {deps[0]: deps[1]}
+        return deps
+
+    def __set_dependencies(self, deps):
+        if len(deps) > 1:
+            self.__dependencies = deps
+        else:
+            self.__dependencies = next(iter(deps.items())) if len(deps) == 1 else None
 
     def __add_dependency_attr(self, obj, keypath):
         """ self is the referrer of 'obj' """
         assert isinstance(obj, PBXBaseObject)
+        self.__willchange()
         guid = obj.guid
-        keypaths = self.__dependencies.get(guid)
+        deps = self.__dependencies_dict()
+        keypaths = deps.get(guid)
         if keypaths is None:
-            self.__dependencies[guid] = set([keypath])
-        elif keypath in keypaths:
+            keypaths = keypath # mostly an object is referred by one keypath
+        elif keypaths == keypath:
             return
+        elif isinstance(keypaths, set):
+            keypaths.add(keypath)
         else:
-            self.__dependencies[guid].add(keypath)
+            keypaths = set([keypaths, keypath])
+        deps[guid] = keypaths
+        self.__set_dependencies(deps)
 
     def __remove_dependency_attr(self, obj):
         assert isinstance(obj, PBXBaseObject)
+        self.__willchange()
         guid = obj.guid
-        keypaths = self.__dependencies.get(guid)
-        
-        if not keypaths is None:
-            for kp in keypaths:
-                self.__check_and_replace_reference_object(kp, obj, None)
-        self.__dependencies.pop(guid, None)
+        for kp in self.__dependency_keypaths(guid):
+            self.__check_and_replace_reference_object(kp, obj, None)
+        deps = self.__dependencies_dict()
+        if guid in deps:
+            deps.pop(guid)
+            self.__set_dependencies(deps)
+
+    def __dependency_keypaths(self, guid):
+        """ return [keypath] of the attributes that refer to the object with 'guid' """
+        keypaths = self.__dependencies_dict().get(guid)
+        if keypaths is None:
+            return []
+        return list(keypaths) if isinstance(keypaths, set) else [keypaths]
 
     def __check_and_replace_reference_object(self, keypath, oldval, newval):
         """
@@ -98,10 +381,11 @@ class PBXBaseObject(abstract.PBXAbstract):
                 while idx < len(array):
                     subval = array[idx]
                     if isinstance(subval, PBXBaseObject) and subval.guid == oldval.guid:
+                        self.markdirty()
                         if newval is None:
                             array.pop(idx)
                         else:
-                            if len(func.take(lambda a:a.guid == newval.guid, array)) == 0:
+                            if not pbxlist.hasguid(array, newval.guid):
                                 array[idx] = newval
                                 newval.add_referrer(self, keypath)
                         subval.remove_referrer(self)
@@ -109,20 +393,25 @@ class PBXBaseObject(abstract.PBXAbstract):
         # end of __replace_array_item
 
         def __recursively_check_and_replace(obj, keys, oldval, newval):
-            if isinstance(obj, PBXBaseObject):
-                __recursively_check_and_replace(obj.__dict__, keys, oldval, newval)
-            elif func.isseq(obj):
+            if func.isseq(obj):
                 __replace_array_item(obj, keys, oldval, newval)
 
-            elif func.isdict(obj):
+            elif isinstance(obj, PBXBaseObject) or func.isdict(obj):
                 k = keys.pop(0)
-                v = obj.get(k)
+                v = obj.__get_pbx_value(k) if isinstance(obj, PBXBaseObject) else obj.get(k)
 
                 if isinstance(v, PBXBaseObject) and v.guid == oldval.guid:
-                    if newval is None:
+                    self.markdirty()
+                    if isinstance(obj, PBXBaseObject):
+                        if newval is None:
+                            obj.__del_pbx_value(k)
+                        else:
+                            obj.__set_pbx_value(k, newval)
+                    elif newval is None:
                         obj.pop(k, None)
                     else:
                         obj[k] = newval
+                    if not newval is None:
                         newval.add_referrer(self, keypath)
                     v.remove_referrer(self)
                 elif func.isdict(v):
@@ -149,10 +438,11 @@ class PBXBaseObject(abstract.PBXAbstract):
             for kp in ref.__keypaths_for_object(obj):
                 ref.__check_and_replace_reference_object(kp, obj, self)
         assert len(obj.referrers()) == 0
+        self.__project().remove_object(obj)
 
     def remove_from_project(self):
         """ remove 'self' from project's object-tree, and remove from all referrers """
-        self.__xcproj.remove_object(self)
+        self.__project().remove_object(self)
 
     def __keypaths_for_object(self, attrval):
         guid = None
@@ -161,8 +451,8 @@ class PBXBaseObject(abstract.PBXAbstract):
         elif pbxhelper.is_valid_guid(attrval):
             guid = attrval
 
-        if not guid is None and guid in self.__dependencies:
-            return list(self.__dependencies[guid])
+        if not guid is None:
+            return self.__dependency_keypaths(guid)
         return []
                     
     def referrers(self):
@@ -173,7 +463,8 @@ class PBXBaseObject(abstract.PBXAbstract):
             so,
             PBXFileReference.referrs contains PBXBuildFile
         """
-        return self.__referrers if not self.__referrers is None else {}
+        self.__fire_referrers_fault()
+        return self.__referrers_dict()
 
     def add_referrer(self, obj, keypath):
         """
@@ -181,55 +472,154 @@ class PBXBaseObject(abstract.PBXAbstract):
         """
         refer = None
         if isinstance(obj, abstract.PBXAbstract):
-            self.__xcproj.add_object(obj)
+            self.__project().add_object(obj)
             refer = obj
         elif func.isstr(obj):
-            refer = self.__xcproj.get_object(obj)
+            refer = self.__project().get_object(obj)
             if refer is None:
                 raise ValueError(u'[XcodeProj] object not found:{0}'.format(obj))
 
         if not refer is None:
-            self.__referrers[refer.guid] = refer
+            self.__willchange()
+            self.__add_referrer_ref(refer)
             refer.__add_dependency_attr(self, keypath)
             self.__owners = None # need to re-caculate owners
+            if self._path_depends_on_owners() and self._accepted_owner(refer):
+                self.__project()._path_changed(self)
+            self.__project()._object_changed(self)
+            if self._comment_depends_on_owners():
+                self._invalidate_comment()
 
     def remove_referrer(self, obj):
         """
-        mark up that 'obj' no longer referred to self
+        mark up that 'obj' no longer referred to self.
+        if 'self' becomes unreachable, it is removed by the garbage collection of next validate().
         """
+        self.__fire_referrers_fault()
+        self.__willchange()
+        guid = None
         if isinstance(obj, abstract.PBXAbstract):
-            self.__referrers.pop(obj.guid, None)
+            guid = obj.guid
+            self.__pop_referrers([guid])
             obj.__remove_dependency_attr(self)
         elif func.isstr(obj):
             guid = unicode(obj)
-            self.__referrers.pop(guid, None)
-            obj = self.__xcproj.get_object(obj)
+            self.__pop_referrers([guid])
+            obj = self.__project().get_object(obj)
             if not obj is None:
                 obj.__remove_dependency_attr(self)
 
-        if len(self.__referrers) == 0:
-            self.__xcproj.remove_object(self)
+        if self._path_depends_on_owners() and (self.__owners is None or guid in self.__owners):
+            self.__project()._path_changed(self) # an owner is removed
         self.__owners = None # need to re-caculate owners
+        self.__project()._referrer_removed(self)
+        if self._comment_depends_on_owners():
+            self._invalidate_comment()
+
+    def _drop_referrers(self, guids):
+        """
+        forget the referrers with 'guids', which have been removed from project.
+        unlike remove_referrer(), the attributes of the referrers are not changed.
+        """
+        self.__fire_referrers_fault()
+        self.__willchange()
+        self.__pop_referrers(guids)
+        if self._path_depends_on_owners() and (self.__owners is None \
+            or len([g for g in guids if g in self.__owners]) > 0):
+            self.__project()._path_changed(self)
+        self.__owners = None
+        self.__project()._object_changed(self)
+        if self._comment_depends_on_owners():
+            self._invalidate_comment()
+
+    def dependencies(self):
+        """ return [guid] of the objects that 'self' refers to """
+        return list(self.__dependencies_dict().keys())
 
     def comment(self):
         """ xcode pbxproj comment """
         return None
 
+    def _pbxcomment(self):
+        """ memoized comment(), it is invalidated by markdirty() """
+        if self.__comment is None:
+            self.__comment = (self.comment(),)
+            self.__comment_published = True
+        return self.__comment[0]
+
+    def _comment_depends_on_references(self):
+        """ return True if comment() is derived from the objects that 'self' refers to """
+        return False
+
+    def _comment_depends_on_owners(self):
+        """ return True if comment() is derived from the owners of 'self' """
+        return False
+
+    def _invalidate_comment(self):
+        """
+        drop the memoized comment of 'self' and of the objects whose comment is derived from it,
+        and drop the rendered text of them and of their referrers, which contains the comments.
+        the derived objects and referrers are skipped if the comment is not used since the last
+        invalidation, so repeated changes of an object cost O(1).
+        """
+        if self.__project().isloading():
+            return # the loaded text is up to date
+        if self.__project()._defer_invalidation(self):
+            return # done at the end of the batch
+
+        pending = [self]
+        visited = set()
+        while len(pending) > 0:
+            obj = pending.pop()
+            if obj.guid in visited:
+                continue
+            visited.add(obj.guid)
+            obj.__comment = None
+            obj.__rendered = None
+            obj.__origin = None
+            if not obj.__comment_published:
+                continue
+            obj.__comment_published = False
+
+            for refer in obj.__referrers_dict().values():
+                refer.__rendered = None
+                refer.__origin = None
+                if refer._comment_depends_on_references():
+                    pending.append(refer)
+
+            for guid in list(obj.__dependencies_dict().keys()):
+                dep = obj.__project().get_object(guid)
+                if not dep is None and dep._comment_depends_on_owners():
+                    pending.append(dep)
+
     def allow_multi_owners(self):
         """ if 'self' can have more than 1 parent object """
         return False
 
     def owners(self):
-        """ return the parent objects """
+        """ return the parent objects, {guid: owner} """
         if self.__owners is None:
-            self.__owners = {guid:ref \
+            owners = {guid:ref \
                 for guid, ref in self.referrers().items() if self._accepted_owner(ref)}
-        return self.__owners
+            self.__owners = {guid: weakref.ref(o) for guid, o in owners.items()} # a back-edge
+            return owners
+        return _deref_values(self.__owners)
 
     def _accepted_owner(self, obj):
         """ return True if obj can be accepted as parent of self """
         return False
 
+    def _path_depends_on_owners(self):
+        """ return True if abspath() is derived from the owners of 'self' """
+        return False
+
+    def _invalidate_path(self):
+        """ 
+        drop the cached paths of 'self', called by XcodeProj._path_changed() when its path or
+        owners changed. the objects whose paths are derived from 'self' are reported to it too.
+        """
+        pass
+
     def hasowner(self, owner):
         """ return True if 'owner' is the parent object of self """
         if isinstance(owner, PBXBaseObject):
@@ -248,10 +638,11 @@ class PBXBaseObject(abstract.PBXAbstract):
         :param xcproj: if is not None, the new-duplicted object will add to xcproj
         """
         if xcproj is None:
-            xcproj = self.__xcproj
+            xcproj = self.__project()
+        self.fire_fault()
         cpobj = xcproj.new_object(self.isa)
-        for attr, val in self.__dict__.items():
-            cpobj._duplicate_attr(attr, val)
+        for name, val in self._pbxattrs().items():
+            cpobj._duplicate_attr(name, val)
         return cpobj
 
     def _duplicate_attr(self, attr, val):
@@ -269,12 +660,48 @@ class PBXBaseObject(abstract.PBXAbstract):
             return self.pbxdict() == other.pbxdict() 
         return False               
 
+    def _set_origin(self, span):
+        """ mark up the byte range (start, end) of 'self' in the loaded file """
+        self.__origin = span
+        self.__comment_published = not span is None
+
+    def write(self, buff, identstr=u''):
+        """ 
+        override, copy the loaded text or reuse the text of last write() 
+        if the object has not changed since then 
+        """
+        if not self.__origin is None and buff.hasorigin():
+            buff.write(identstr)
+            buff.write_origin(*self.__origin)
+            return
+
+        if self.__rendered is None or not self.__rendered[0] == identstr:
+            textbuff = abstract.PBXStringWriter()
+            super(PBXBaseObject, self).write(textbuff, identstr)
+            self.__rendered = (identstr, textbuff.getvalue())
+        buff.write(self.__rendered[1])
+
     def pbxdict(self):
         """ override """
+        self.fire_fault()
         dic = super(PBXBaseObject, self).pbxdict()
         dic[u'isa'] = self.isa
         return dic
 
+    def _pbxpairs(self):
+        """ override, walk the declared pbx-attributes in the order precomputed for the class """
+        self.fire_fault()
+        if self.__extra:
+            return super(PBXBaseObject, self)._pbxpairs()
+        cls = type(self)
+        pairs = [(u'isa', self.isa)]
+        for key, member in attr.pbx_ordered_members(cls):
+            try:
+                pairs.append((key, attr.deref(member.__get__(self, cls))))
+            except AttributeError as e:
+                pass # not set
+        return pairs
+
     def validate(self):
         """ validate the object """
 
@@ -296,13 +723,22 @@ class PBXBaseObject(abstract.PBXAbstract):
 
         if not pbxhelper.is_valid_guid(self.guid):
             issues.append(u'illegal guid:{guid}.'.format(self.guid))
-        if not self.__xcproj.get_object(self.guid) == self:
+        if not self.__project().get_object(self.guid) == self:
             issues.append(u'{o} not in project\'s object tree!!!'.format(o=self))
         return resolved, issues
 
     def markdirty(self):
-        """ mark up that the object has changed and need validate """
+        """ 
+        mark up that the object has changed and need validate.
+        the containers of the attributes call it before they are changed in place.
+        """
+        self.__willchange()
         self.__dirty = True
+        self.__project()._object_changed(self)
+        if not self.__project().isloading():
+            self.__rendered = None
+            self.__origin = None
+            self._invalidate_comment()
 
     def isdirty(self):
         """ return True if the object has changed since last validation """
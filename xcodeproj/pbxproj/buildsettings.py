@@ -0,0 +1,320 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Effective build settings of the (target, configuration) pairs of a project.
+
+The layers of a pair, from the lowest to the highest:
+    builtin:    PROJECT_DIR, SRCROOT, PROJECT_NAME, TARGET_NAME, CONFIGURATION, ...
+    project:    the xcconfig of the project configuration, then its buildSettings
+    target:     the xcconfig of the target configuration, then its buildSettings
+a value refers to the value of the lower layers by '$(inherited)', and to the other settings
+by $(VAR), ${VAR} or $(VAR:modifier), which are looked up from the highest layer.
+in a layer, the conditional setting (eg: 'NAME[sdk=iphoneos*]') matching the configuration,
+sdk and arch takes the place of the plain one.
+the values are resolved on demand and memoized until the project or the xcconfig files change.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import re
+import weakref
+
+from xcodeproj.utils import func
+from xcodeproj.utils import logger
+from xcodeproj.pbxproj import pbxhelper
+from xcodeproj.pbxproj import xcconfig
+
+_VAR_START_REG = re.compile(u'\\$[({]')
+_NOT_C99_IDENTIFIER_REG = re.compile(u'[^A-Za-z0-9_]')
+_NOT_RFC1034_IDENTIFIER_REG = re.compile(u'[^A-Za-z0-9.\\-]')
+
+def _c99_identifier(value):
+    value = _NOT_C99_IDENTIFIER_REG.sub(u'_', value)
+    return u'_' + value if value[:1].isdigit() else value
+
+# $(VAR:modifier)
+MODIFIERS = {
+    u'lower':               lambda v: v.lower(),
+    u'upper':               lambda v: v.upper(),
+    u'base':                lambda v: os.path.splitext(os.path.basename(v))[0],
+    u'file':                lambda v: os.path.basename(v),
+    u'dir':                 lambda v: os.path.dirname(v),
+    u'suffix':              lambda v: os.path.splitext(v)[1],
+    u'standardizepath':     lambda v: os.path.normpath(v) if len(v) > 0 else v,
+    u'identifier':          _c99_identifier,
+    u'c99extidentifier':    _c99_identifier,
+    u'rfc1034identifier':   lambda v: _NOT_RFC1034_IDENTIFIER_REG.sub(u'-', v),
+    u'quote':               lambda v: v.replace(u'\\', u'\\\\').replace(u' ', u'\\ '),
+}
+
+class BuildSettings(object):
+    """
+    the build settings of one (target, configuration) pair, resolved on demand.
+    the values of the list settings (eg: HEADER_SEARCH_PATHS) are joined by spaces.
+    """
+
+    def __init__(self, layers, environ=None, context=None):
+        """
+        :param layers:  [{name: value}] from the lowest to the highest
+        :param environ: function(name) to look up the settings not defined by any layer
+        :param context: {condition: value} to match the conditional settings, 
+                        eg: {'config': 'Debug', 'arch': 'arm64'}, 'sdk' defaults to SDKROOT
+        """
+        self.__layers = layers
+        self.__conditionals = [self.__conditional_settings(l) for l in layers]
+        self.__environ = environ
+        self.__context = {} if context is None else context
+        self.__values = {} # {(name, level): resolved value or None}
+        self.__resolving = set() # (name, level) being resolved, to break the reference cycles
+
+    def names(self):
+        """ return the names of all the settings defined by the layers """
+        names = set()
+        for layer in self.__layers:
+            names.update([xcconfig.split_conditions(k)[0] for k in layer.keys()])
+        return sorted(names)
+
+    def get(self, name, default=None):
+        """ return the resolved value of setting 'name' """
+        value = self.__value(name, len(self.__layers) - 1)
+        return default if value is None else value
+
+    def expand(self, text):
+        """ return 'text' with the $(VAR) in it expanded """
+        return self.__expand(text, None, len(self.__layers) - 1)
+
+    def resolved(self):
+        """ return {name: resolved value} of all the settings defined by the layers """
+        return {name: self.get(name) for name in self.names()}
+
+    def __value(self, name, level):
+        """ return the value of setting 'name' defined by layers[0 : level+1] """
+        key = (name, level)
+        try:
+            return self.__values[key]
+        except KeyError as e:
+            pass
+
+        if key in self.__resolving:
+            logger.warn(u'[BuildSettings] recursive reference of {0}'.format(name))
+            return None
+        self.__resolving.add(key)
+        try:
+            value = None
+            for idx in range(level, -1, -1):
+                raw = self.__lookup(idx, name)
+                if raw is None:
+                    continue
+                if func.isseq(raw):
+                    items = [self.__expand(item, name, idx) for item in raw]
+                    value = u' '.join([item for item in items if len(item) > 0])
+                elif u'$' in raw:
+                    value = self.__expand(raw, name, idx).strip() # eg: '$(inherited) -ObjC'
+                else:
+                    value = raw
+                break
+            else:
+                if not self.__environ is None:
+                    value = self.__environ(name)
+        finally:
+            self.__resolving.discard(key)
+
+        self.__values[key] = value
+        return value
+
+    def __conditional_settings(self, layer):
+        """ return {name: [(conditions, value)]} of the conditional settings in 'layer' """
+        conditionals = {}
+        for key, value in layer.items():
+            if u'[' in key:
+                name, conditions = xcconfig.split_conditions(key)
+                conditionals.setdefault(name, []).append((conditions, value))
+        for items in conditionals.values():
+            items.sort(key=lambda item: len(item[0]), reverse=True) # the most specific first
+        return conditionals
+
+    def __condition(self, name):
+        """ return the current value of the condition 'name' """
+        value = self.__context.get(name)
+        if value is None and name == u'sdk':
+            value = self.get(u'SDKROOT')
+        return value
+
+    def __lookup(self, level, name):
+        """ return the raw value of 'name' in layers[level], the matched conditional one first """
+        conditionals = self.__conditionals[level].get(name)
+        if not conditionals is None:
+            for conditions, raw in conditionals:
+                if xcconfig.match_conditions(conditions, self.__condition):
+                    return raw
+        return self.__layers[level].get(name)
+
+    def __expand(self, text, name, level):
+        """ expand the variables in 'text', which is the value of 'name' in layers[level] """
+        if not u'$' in text:
+            return text
+
+        result = []
+        pos = 0
+        top = len(self.__layers) - 1
+        while True:
+            match = _VAR_START_REG.search(text, pos)
+            if match is None:
+                break
+            close = u')' if match.group(0)[1] == u'(' else u'}'
+            end = self.__closing(text, match.end(), match.group(0)[1], close)
+            if end < 0:
+                break # not closed, keep it literally
+
+            result.append(text[pos:match.start()])
+            inner = self.__expand(text[match.end():end], name, level)
+            var, sep, modifiers = inner.partition(u':')
+            if var == u'inherited':
+                value = self.__value(name, level - 1) if not name is None and level > 0 else None
+            else:
+                value = self.__value(var, top)
+            result.append(self.__modify(u'' if value is None else value, modifiers))
+            pos = end + 1
+        result.append(text[pos:])
+        return u''.join(result)
+
+    def __closing(self, text, start, openchar, closechar):
+        """ return the index of the bracket closing the one before 'start', -1 if not found """
+        depth = 1
+        for idx in range(start, len(text)):
+            char = text[idx]
+            if char == openchar:
+                depth += 1
+            elif char == closechar:
+                depth -= 1
+                if depth == 0:
+                    return idx
+        return -1
+
+    def __modify(self, value, modifiers):
+        """ apply the modifiers 'mod1:mod2:default=xxx' to 'value' """
+        while len(modifiers) > 0:
+            if func.hasprefix(modifiers, u'default='):
+                return value if len(value) > 0 else modifiers[len(u'default='):]
+            modifier, sep, modifiers = modifiers.partition(u':')
+            if modifier in MODIFIERS:
+                value = MODIFIERS[modifier](value)
+            else:
+                logger.warn(u'[BuildSettings] unsupported modifier: {0}'.format(modifier))
+        return value
+
+
+class Resolver(object):
+    """ the memoized BuildSettings of the (target, configuration) pairs of a project """
+
+    def __init__(self, xcproj):
+        self.__xcproj = weakref.ref(xcproj) # owned by the project
+        self.__settings = {} # {(target guid, config name, sdk, arch): (BuildSettings, [xcconfig])}
+
+    def clear(self):
+        """ drop the memoized settings """
+        if len(self.__settings) > 0:
+            self.__settings = {}
+
+    def settings(self, target=None, config=None, sdk=None, arch=None):
+        """
+        return the BuildSettings of 'target' and 'config'.
+        :param target:  the 'PBXTarget' or 'guid' or 'target name', None for the project settings
+        :param config:  the 'XCBuildConfiguration' or 'guid' or 'config name',
+                        None for the default configuration
+        :param sdk:     the sdk to match the conditional settings, eg: 'iphoneos11.0', 
+                        the SDKROOT setting if None
+        :param arch:    the arch to match the conditional settings, eg: 'arm64'
+        """
+        xcproj = self.__xcproj()
+        from xcodeproj.pbxproj.objects import target as target_imp
+        from xcodeproj.pbxproj.objects import config as config_imp
+
+        tobj = target
+        if pbxhelper.is_valid_guid(target):
+            tobj = xcproj.get_object(target)
+        elif func.isstr(target):
+            tobj = xcproj.get_target(target)
+        if not target is None and not isinstance(tobj, target_imp.PBXTarget):
+            return None
+
+        project = xcproj.pbx_rootObject
+        cfglist = project.pbx_buildConfigurationList if tobj is None \
+            else tobj.pbx_buildConfigurationList
+
+        cfgname = config
+        if config is None:
+            cfg = cfglist.defaultConfiguration() if not cfglist is None else None
+            cfgname = cfg.pbx_name if not cfg is None else None
+        elif pbxhelper.is_valid_guid(config):
+            cfg = xcproj.get_object(config)
+            cfgname = cfg.pbx_name if isinstance(cfg, config_imp.XCBuildConfiguration) else None
+        elif isinstance(config, config_imp.XCBuildConfiguration):
+            cfgname = config.pbx_name
+        if cfgname is None:
+            return None
+
+        key = (None if tobj is None else tobj.guid, cfgname, sdk, arch)
+        settings, xcconfigs = self.__settings.get(key, (None, None))
+        if not settings is None \
+            and all([xcconfig.load(path) is layer for path, layer in xcconfigs]):
+            return settings
+
+        xcconfigs = []
+        context = {u'config': cfgname, u'sdk': sdk, u'arch': arch}
+        settings = BuildSettings(self.__layers(xcproj, tobj, cfgname, xcconfigs), \
+            environ=self.__environ, context=context)
+        self.__settings[key] = (settings, xcconfigs)
+        return settings
+
+    def __layers(self, xcproj, target, cfgname, xcconfigs):
+        """ 
+        return [{name: value}] of the layers from the lowest
+        :param xcconfigs:   filled with [(path, settings)] of the xcconfig layers
+        """
+        project_dir = xcproj.project_dir()
+        builtin = {
+            u'PROJECT_DIR':         project_dir,
+            u'SRCROOT':             project_dir,
+            u'SOURCE_ROOT':         project_dir,
+            u'PROJECT_NAME':        xcproj.project_name(),
+            u'PROJECT_FILE_PATH':   xcproj.buildsettings(u'PROJECT_FILE_PATH'),
+            u'CONFIGURATION':       cfgname,
+        }
+        if not target is None:
+            builtin[u'TARGET_NAME'] = target.pbx_name
+        layers = [{k: v for k, v in builtin.items() if not v is None}]
+
+        cfglists = [xcproj.pbx_rootObject.pbx_buildConfigurationList]
+        if not target is None:
+            cfglists.append(target.pbx_buildConfigurationList)
+        for cfglist in cfglists:
+            cfg = cfglist.getconfig(cfgname) if not cfglist is None else None
+            if cfg is None:
+                continue
+            ref = cfg.pbx_baseConfigurationReference
+            path = ref.realpath() if not ref is None else None
+            if not path is None:
+                xcconfigs.append((path, xcconfig.load(path)))
+                layers.append(xcconfigs[-1][1])
+            elif not ref is None:
+                logger.warn(u'[BuildSettings] ignore the xcconfig of {0}, no path on disk: {1}'\
+                    .format(cfg, ref))
+            layers.append(cfg.pbx_buildSettings)
+        return layers
+
+    def __environ(self, name):
+        """ the settings not defined by the project, from the environment of the build """
+        xcproj = self.__xcproj()
+        if xcproj is None \
+            or not os.getenv(u'PROJECT_FILE_PATH') == xcproj.buildsettings(u'PROJECT_FILE_PATH'):
+            return None
+        value = os.getenv(name)
+        return func.to_unicode(value) if not value is None else None
@@ -17,4 +17,30 @@ from xcodeproj.pbxproj.objects.project import *
 from xcodeproj.pbxproj.objects.target import *
 from xcodeproj.pbxproj.objects.config import *
 from xcodeproj.pbxproj.objects.dependency import *
-from xcodeproj.pbxproj.objects.proxy import *
\ No newline at end of file
+from xcodeproj.pbxproj.objects.proxy import *
+
+from xcodeproj.pbxproj import baseobject
+
+__ISA_CLASSES = dict() # {isa: class}
+
+def reg_isa_class(cls):
+    """
+    register 'cls', a subclass of PBXBaseObject, as the class of the objects with isa 'cls.__name__'.
+    it replaces the class registered before, so a custom class can extend or override the builtin one.
+    (the custom class that declares pbx-attributes must call attr.reg_attrs() too)
+    """
+    if not isinstance(cls, type) or not issubclass(cls, baseobject.PBXBaseObject):
+        raise ValueError(u'[XcodeProj] not a pbx-object class: {0}'.format(cls))
+    __ISA_CLASSES[cls.__name__] = cls
+
+def isa_class(isa):
+    """ return the class registered for 'isa', None if unknown """
+    return __ISA_CLASSES.get(isa)
+
+def __reg_builtin_classes():
+    for obj in list(globals().values()):
+        if isinstance(obj, type) and issubclass(obj, baseobject.PBXBaseObject) \
+            and not obj is baseobject.PBXBaseObject:
+            reg_isa_class(obj)
+
+__reg_builtin_classes()
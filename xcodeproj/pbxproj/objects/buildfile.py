@@ -14,6 +14,7 @@ from xcodeproj.pbxproj import pbxpath
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import attr
 from xcodeproj.utils import func
+from xcodeproj.utils import logger
 
 class PBXBuildFile(baseobject.PBXBaseObject):
     """
@@ -26,6 +27,9 @@ class PBXBuildFile(baseobject.PBXBaseObject):
         fileRef         allow_fileref_types(), nonnull
         settings        dict, nullable
     """
+
+    __slots__ = attr.slots([u'fileRef', u'settings'])
+
     @staticmethod
     def new_buildfile(fileref, **kwargs): # kwargs:settings
         obj = fileref.project().new_object(u'PBXBuildFile')
@@ -35,19 +39,14 @@ class PBXBuildFile(baseobject.PBXBaseObject):
         return obj
 
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_fileRef':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXBuildFile, name, value, self.is_valid_fileref)
-        elif name == u'pbx_settings':
-            self.__set_settings(value)
-        else:
-            super(PBXBuildFile, self).__setattr__(name, value)
+    def _set_pbx_fileRef(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_fileRef', value, self.is_valid_fileref)
 
-    def __set_settings(self, value):
+    def _set_pbx_settings(self, value):
         if value is None or func.isdict(value):
-            super(PBXBuildFile, self).__setattr__(u'pbx_settings', value)
+            self._setpbxattr(u'pbx_settings', value)
         else:
-            logger.error(u'[PBXBuildFile] illegal settings:{0}'.format(obj))
+            logger.error(u'[PBXBuildFile] illegal settings:{0}'.format(value))
 
     def allow_fileref_types(self):
         """ fileRef types """
@@ -74,17 +73,25 @@ class PBXBuildFile(baseobject.PBXBaseObject):
         parentcomment = None
 
         if not self.pbx_fileRef is None:
-            refcomment = self.pbx_fileRef.comment()
+            refcomment = self.pbx_fileRef._pbxcomment()
 
         owner = func.get_list_item(self.owners().values(), 0)
         if not owner is None:
-            parentcomment = owner.comment()
+            parentcomment = owner._pbxcomment()
 
         comment = u'{ref} in {parent}'.format(\
             ref=unicode(refcomment) if not refcomment is None else u'(null)', \
             parent=unicode(parentcomment) if not parentcomment is None else u'(null)')
         return comment
 
+    def _comment_depends_on_references(self):
+        """ override """
+        return True
+
+    def _comment_depends_on_owners(self):
+        """ override """
+        return True
+
     def _accepted_owner(self, obj):
         from xcodeproj.pbxproj.objects import buildphase
         return isinstance(obj, buildphase.PBXBuildPhase) and obj.hasfile(self)
@@ -123,5 +130,4 @@ class PBXBuildFile(baseobject.PBXBaseObject):
                 return self.pbx_fileRef.equalto(other.pbx_fileRef)
         return False
 
-
-
+attr.reg_attrs(PBXBuildFile)
@@ -11,6 +11,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
 
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.utils import logger
 from xcodeproj.utils import func
@@ -29,18 +30,17 @@ class PBXBuildPhase(baseobject.PBXBaseObject):
         name                str, nullable,
     """
 
+    __slots__ = attr.slots([u'files', u'buildActionMask', u'runOnlyForDeploymentPostprocessing', \
+        u'name'])
+
     def __init__(self, xcproj, guid):
         super(PBXBuildPhase, self).__init__(xcproj, guid)
         self.pbx_files = []
         self.pbx_buildActionMask = 2147483647 # int
         self.pbx_runOnlyForDeploymentPostprocessing = 0 # int
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_files':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, PBXBuildPhase, name, value, \
-                self.is_valid_buildfile)
-        else:
-            super(PBXBuildPhase, self).__setattr__(name, value)        
+    def _set_pbx_files(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_files', value, self.is_valid_buildfile)
 
     def comment(self):
         """ override """
@@ -78,13 +78,14 @@ class PBXBuildPhase(baseobject.PBXBaseObject):
 
     def add_file_reference(self, fileref, **kwargs): # kwargs=settings
         existsbf = None
-        for bf in self.pbx_files:
-            oldref = bf.pbx_fileRef
-            if oldref is None:
-                continue
-            if oldref == fileref or \
-                oldref.isa == fileref.isa and oldref.realpath() == fileref.realpath():
-                existsbf = bf
+        # the file references at the same path, looked up by the project's path index
+        samerefs = [fileref] + self.project()._objects_for_path(fileref.isa, fileref.realpath())
+        for ref in samerefs:
+            for bf in ref.referrers().values():
+                if bf.isa == u'PBXBuildFile' and bf.pbx_fileRef == ref and self.hasfile(bf):
+                    existsbf = bf
+                    break
+            if not existsbf is None:
                 break
         if not existsbf is None:
             if u'settings' in kwargs:
@@ -133,8 +134,12 @@ class PBXBuildPhase(baseobject.PBXBaseObject):
         self._validate_files(resolved, issues)
         return resolved, issues
 
+attr.reg_attrs(PBXBuildPhase)
+
 
 class PBXCopyFilesBuildPhase(PBXBuildPhase):
+    __slots__ = attr.slots([u'dstPath', u'dstSubfolderSpec'])
+
     def __init__(self, xcproj, guid):
         super(PBXCopyFilesBuildPhase, self).__init__(xcproj, guid)
         self.pbx_dstPath = u'' # str
@@ -144,7 +149,11 @@ class PBXCopyFilesBuildPhase(PBXBuildPhase):
         """ override """
         return self.pbx_name if not self.pbx_name is None else u'CopyFiles'
 
+attr.reg_attrs(PBXCopyFilesBuildPhase)
+
+
 class PBXFrameworksBuildPhase(PBXBuildPhase):
+    __slots__ = ()
 
     def displayname(self):
         """ override """
@@ -152,6 +161,7 @@ class PBXFrameworksBuildPhase(PBXBuildPhase):
 
 
 class PBXHeadersBuildPhase(PBXBuildPhase):
+    __slots__ = ()
 
     def displayname(self):
         """ override """
@@ -159,6 +169,7 @@ class PBXHeadersBuildPhase(PBXBuildPhase):
 
 
 class PBXResourcesBuildPhase(PBXBuildPhase):
+    __slots__ = ()
 
     def displayname(self):
         """ override """
@@ -166,6 +177,7 @@ class PBXResourcesBuildPhase(PBXBuildPhase):
 
 
 class PBXSourcesBuildPhase(PBXBuildPhase):
+    __slots__ = ()
     
     def displayname(self):
         """ override """
@@ -173,6 +185,9 @@ class PBXSourcesBuildPhase(PBXBuildPhase):
 
 
 class PBXShellScriptBuildPhase(PBXBuildPhase):
+    __slots__ = attr.slots([u'inputPaths', u'outputPaths', u'shellPath', u'shellScript', \
+        u'showEnvVarsInLog'])
+
     def __init__(self, xcproj, guid):
         super(PBXShellScriptBuildPhase, self).__init__(xcproj, guid)
         self.pbx_inputPaths = [] # [str]
@@ -184,6 +199,4 @@ class PBXShellScriptBuildPhase(PBXBuildPhase):
         """ override """
         return self.pbx_name if not self.pbx_name is None else u'ShellScript'
 
-
-
-
+attr.reg_attrs(PBXShellScriptBuildPhase)
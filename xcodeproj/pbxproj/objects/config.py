@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxpath
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.utils import func
@@ -48,22 +49,20 @@ class XCBuildConfiguration(baseobject.PBXBaseObject):
         buildSettings               dict                nonnull, default {}
         name                        str                 nonnull?
     """
+
+    __slots__ = attr.slots([u'baseConfigurationReference', u'buildSettings', u'name'])
+
     def __init__(self, xcproj, guid):
         super(XCBuildConfiguration, self).__init__(xcproj, guid)
         self.pbx_buildSettings = dict()
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_baseConfigurationReference':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, XCBuildConfiguration, name, value, \
-                self.is_valid_base_config_ref)
-        elif name == u'pbx_buildSettings':
-            self.__set_build_settings(value)
-        else:
-            super(XCBuildConfiguration, self).__setattr__(name, value)
+    def _set_pbx_baseConfigurationReference(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_baseConfigurationReference', value, \
+            self.is_valid_base_config_ref)
 
-    def __set_build_settings(self, value):
+    def _set_pbx_buildSettings(self, value):
         if func.isdict(value):
-            super(XCBuildConfiguration, self).__setattr__(u'pbx_buildSettings', value)
+            self._setpbxattr(u'pbx_buildSettings', value)
         else:
             logger.error(u'{0} illegal buildSettings:{1}'.format(self, value))
 
@@ -236,6 +235,8 @@ class XCBuildConfiguration(baseobject.PBXBaseObject):
 
         return resolved, issues
 
+attr.reg_attrs(XCBuildConfiguration)
+
 
 class XCConfigurationList(baseobject.PBXBaseObject):
     """
@@ -249,23 +250,24 @@ class XCConfigurationList(baseobject.PBXBaseObject):
         defaultConfigurationIsVisible   int, nonnull, default 0
         defaultConfigurationName        str, nonnull
     """
+
+    __slots__ = attr.slots([u'buildConfigurations', u'defaultConfigurationIsVisible', \
+        u'defaultConfigurationName'])
+
     def __init__(self, xcproj, guid):
         super(XCConfigurationList, self).__init__(xcproj, guid)
         # pbx attributes
         self.pbx_buildConfigurations = [] # [guid]
         self.pbx_defaultConfigurationIsVisible = 0 # int
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_buildConfigurations':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, XCConfigurationList, name, value, \
-                self.is_valid_config)
-        else:
-            super(XCConfigurationList, self).__setattr__(name, value)
+    def _set_pbx_buildConfigurations(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_buildConfigurations', value, \
+            self.is_valid_config)
 
     def duplicate(self):
         """ override """
         obj = super(XCConfigurationList, self).duplicate()
-        for attr, val in self.__dict__.items():
+        for attr, val in self._pbxattrs().items():
             if attr == u'pbx_buildConfigurations':
                 for cfg in val:
                     obj.addfile(cfg.duplicate())
@@ -281,6 +283,10 @@ class XCConfigurationList(baseobject.PBXBaseObject):
                     isa=u'(null)' if owner is None else owner.isa, \
                     name=u'(null)' if projname is None else projname)  
 
+    def _comment_depends_on_owners(self):
+        """ override """
+        return True
+
     def is_valid_config(self, config):
         """ check if 'config' is valid build configuration """
         return isinstance(config, XCBuildConfiguration)
@@ -356,4 +362,4 @@ class XCConfigurationList(baseobject.PBXBaseObject):
                 else:
                     idx += 1
 
-
+attr.reg_attrs(XCConfigurationList)
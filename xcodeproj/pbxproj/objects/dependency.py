@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 
 
@@ -24,15 +25,13 @@ class PBXTargetDependency(baseobject.PBXBaseObject):
         target          PBXTarget,  nullable
     """
 
-    def __setattr__(self, name, value): 
-        if name == u'pbx_targetProxy':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXTargetDependency, name, value, \
-                self.is_valid_target_proxy)
-        elif name == u'pbx_target':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXTargetDependency, name, value, \
-                self.is_valid_target)
-        else:
-            super(PBXTargetDependency, self).__setattr__(name, value)
+    __slots__ = attr.slots([u'name', u'targetProxy', u'target'])
+
+    def _set_pbx_targetProxy(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_targetProxy', value, self.is_valid_target_proxy)
+
+    def _set_pbx_target(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_target', value, self.is_valid_target)
 
     def is_valid_target_proxy(self, obj):
         """ attr validator """
@@ -65,3 +64,5 @@ class PBXTargetDependency(baseobject.PBXBaseObject):
         if not self.pbx_target is None:
             pbxhelper.pbxobj_validate_pbxobj_attr(self, u'pbx_target', throw_exception=True)
         return super(PBXTargetDependency, self)._validate()
+
+attr.reg_attrs(PBXTargetDependency)
@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxpath
 from xcodeproj.pbxproj import pbxconsts
 from xcodeproj.pbxproj import pbxhelper
@@ -38,17 +39,25 @@ class PBXFileReference(baseobject.PBXBaseObject):
         wrapsLines          int, nullable
 
     """
+
+    __slots__ = attr.slots([u'fileEncoding', u'lastKnownFileType', u'name', u'path', u'sourceTree', \
+        u'explicitFileType', u'includeInIndex', u'xcLanguageSpecificationIdentifier', \
+        u'lineEnding', u'wrapsLines'], \
+        private=(u'__abspath', u'__realpath'))
+
     def __init__(self, xcproj, guid):
         super(PBXFileReference, self).__init__(xcproj, guid)
-        self.pbx_sourceTree = pbxconsts.SOURCE_TREE.group # str; 
-        # self.__realpath = None # str, real path on disk
         self.__abspath = None # str, project relative path
+        self.__realpath = None # str, real path on disk
+        self.pbx_sourceTree = pbxconsts.SOURCE_TREE.group # str; 
+
+    def _set_pbx_path(self, value):
+        self.project()._path_changed(self)
+        pbxpath.set_group_file_path(self, value)
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_path':
-            pbxpath.set_group_file_path(self, PBXFileReference, value)
-        else:
-            super(PBXFileReference, self).__setattr__(name, value)
+    def _set_pbx_sourceTree(self, value):
+        self.project()._path_changed(self)
+        self._setpbxattr(u'pbx_sourceTree', value)
 
     def _accepted_owner(self, obj):
         """ override """
@@ -74,7 +83,21 @@ class PBXFileReference(baseobject.PBXBaseObject):
 
     def realpath(self):
         """ return path on disk """
-        return pbxpath.realpath(self.project(), self.abspath())
+        if self.__realpath is None:
+            path = pbxpath.realpath(self.project(), self.abspath())
+            if not pbxpath.is_project_path(self.abspath()):
+                return path # resolved by the environment
+            self.__realpath = path
+        return self.__realpath
+
+    def _path_depends_on_owners(self):
+        """ override """
+        return True
+
+    def _invalidate_path(self):
+        """ override """
+        self.__abspath = None
+        self.__realpath = None
 
     def displayname(self):
         """ return the name to displayed """
@@ -97,6 +120,8 @@ class PBXFileReference(baseobject.PBXBaseObject):
             issues.append(u'{0} invalid explicitFileType / lastKnownFileType.'.format(self))
         return resolved, issues
 
+attr.reg_attrs(PBXFileReference)
+
 
 class PBXReferenceProxy(baseobject.PBXBaseObject):
     """
@@ -109,21 +134,26 @@ class PBXReferenceProxy(baseobject.PBXBaseObject):
         remoteRef       PBXContainerItemProxy, nonnull
         sourceTree      str, nonnull, default 'BUILT_PRODUCTS_DIR'  
     """
+
+    __slots__ = attr.slots([u'fileType', u'path', u'remoteRef', u'sourceTree'], \
+        private=(u'__abspath', u'__realpath'))
+
     def __init__(self, xcproj, guid):
         super(PBXReferenceProxy, self).__init__(xcproj, guid)
-        self.pbx_sourceTree = pbxconsts.SOURCE_TREE.BUILT_PRODUCTS_DIR # str
-        # other attributes
         self.__abspath = None # str : $(SRCROOT)/path/to/file
-        # self.realpath = None # str : real path on dick
+        self.__realpath = None # str : real path on disk
+        self.pbx_sourceTree = pbxconsts.SOURCE_TREE.BUILT_PRODUCTS_DIR # str
+
+    def _set_pbx_remoteRef(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_remoteRef', value, self.is_valid_ref)
+
+    def _set_pbx_path(self, value):
+        self.project()._path_changed(self)
+        pbxpath.set_group_file_path(self, value)
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_remoteRef':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXReferenceProxy, name, value, \
-                self.is_valid_ref )
-        elif name == u'pbx_path':
-            pbxpath.set_group_file_path(self, PBXReferenceProxy, value)
-        else:
-            super(PBXReferenceProxy, self).__setattr__(name, value)
+    def _set_pbx_sourceTree(self, value):
+        self.project()._path_changed(self)
+        self._setpbxattr(u'pbx_sourceTree', value)
 
     def is_valid_ref(self, obj):
         return isinstance(obj, baseobject.PBXBaseObject) and obj.isa == 'PBXContainerItemProxy'
@@ -152,7 +182,21 @@ class PBXReferenceProxy(baseobject.PBXBaseObject):
 
     def realpath(self):
         """ return path on disk """
-        return pbxpath.realpath(self.project(), self.abspath())
+        if self.__realpath is None:
+            path = pbxpath.realpath(self.project(), self.abspath())
+            if not pbxpath.is_project_path(self.abspath()):
+                return path # resolved by the environment
+            self.__realpath = path
+        return self.__realpath
+
+    def _path_depends_on_owners(self):
+        """ override """
+        return True
+
+    def _invalidate_path(self):
+        """ override """
+        self.__abspath = None
+        self.__realpath = None
 
     def filetype(self):
         return self.pbx_fileType
@@ -163,3 +207,5 @@ class PBXReferenceProxy(baseobject.PBXBaseObject):
     def _validate(self):
         pbxhelper.pbxobj_validate_pbxobj_attr(self, u'pbx_remoteRef', throw_exception=True)
         return super(PBXReferenceProxy, self)._validate()
+
+attr.reg_attrs(PBXReferenceProxy)
@@ -12,6 +12,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
 import itertools
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import pbxconsts
 from xcodeproj.pbxproj import pbxpath
@@ -29,21 +30,27 @@ class PBXGroup(baseobject.PBXBaseObject):
         path            str, nullable
     """
 
+    __slots__ = attr.slots([u'children', u'name', u'sourceTree', u'path'], \
+        private=(u'__abspath', u'__realpath'))
+
     def __init__(self, xcproj, guid):
         super(PBXGroup, self).__init__(xcproj, guid)
+        self.__abspath = None # str, project relative path
+        self.__realpath = None # str, real path on disk
+
         self.pbx_children = [] # [pbxobject]
         self.pbx_sourceTree = pbxconsts.SOURCE_TREE.group # str
 
-        # self.__realpath = None # str, real path on disk
-        self.__abspath = None # str, project relative path
+    def _set_pbx_children(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_children', value, self.is_valid_child)
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_children':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, PBXGroup, name, value, self.is_valid_child)
-        elif name == u'pbx_path':
-            pbxpath.set_group_file_path(self, PBXGroup, value)
-        else:
-            super(PBXGroup, self).__setattr__(name, value)
+    def _set_pbx_path(self, value):
+        self.project()._path_changed(self)
+        pbxpath.set_group_file_path(self, value)
+
+    def _set_pbx_sourceTree(self, value):
+        self.project()._path_changed(self)
+        self._setpbxattr(u'pbx_sourceTree', value)
 
     def _accepted_owner(self, obj):
         if not isinstance(obj, baseobject.PBXBaseObject):
@@ -63,14 +70,18 @@ class PBXGroup(baseobject.PBXBaseObject):
         return isinstance(child, baseobject.PBXBaseObject) \
             and child.isa in self.allow_children_types()
 
-    def addfile(self, abspath, sourcetree=pbxconsts.SOURCE_TREE.group, move=True):
-        """ add file reference at abspath to this group """
+    def addfile(self, abspath, sourcetree=pbxconsts.SOURCE_TREE.group, move=True, filetype=None):
+        """
+        add file reference at abspath to this group
+        :param filetype:    the file type of the new file reference, detected from the file if None
+        """
         fileref = self.project().fileref_for_path(abspath)
         if fileref is None:
             fileref = self.project().new_object(u'PBXFileReference')
             pbxpath.set_path_with_source_tree(fileref, abspath, source_tree=sourcetree, \
                 parent_group=self)
-            fileref.pbx_lastKnownFileType = pbxhelper.get_filetype(abspath)
+            fileref.pbx_lastKnownFileType = pbxhelper.get_filetype(abspath) \
+                if filetype is None else filetype
         self.addchild(fileref, move=move)
         return fileref
 
@@ -100,9 +111,9 @@ class PBXGroup(baseobject.PBXBaseObject):
         :param rootpath: the directory to 'xxx.lproj', eg: rootpath/en.lproj
         :param filename: the locaized file, eg rootpath/en.lproj/filename
         """
-        vgroup = xcproj.get_variant_group(rootpath, filename)
+        vgroup = self.project().get_variant_group(rootpath, filename)
         if vgroup is None:
-            vgroup = xcproj.new_object(u'PBXVariantGroup')
+            vgroup = self.project().new_object(u'PBXVariantGroup')
             pbxpath.set_path_with_source_tree(vgroup, rootpath, parent_group=self)
             vgroup.pbx_name = filename
         self.addchild(vgroup, move=move)
@@ -174,7 +185,26 @@ class PBXGroup(baseobject.PBXBaseObject):
 
     def realpath(self):
         """ return path on disk """
-        return pbxpath.realpath(self.project(), self.abspath())
+        if self.__realpath is None:
+            path = pbxpath.realpath(self.project(), self.abspath())
+            if not pbxpath.is_project_path(self.abspath()):
+                return path # resolved by the environment
+            self.__realpath = path
+        return self.__realpath
+
+    def _path_depends_on_owners(self):
+        """ override """
+        return True
+
+    def _invalidate_path(self):
+        """ override, the paths of the descendants are derived from it """
+        xcproj = self.project()
+        if self.__abspath is None and xcproj.isloading():
+            return # the paths of the descendants are not cached or indexed yet
+        self.__abspath = None
+        self.__realpath = None
+        for child in self.pbx_children:
+            xcproj._path_changed(child)
 
     # def get_children(self, selector, recursively=False):
     #     """
@@ -233,9 +263,11 @@ class PBXGroup(baseobject.PBXBaseObject):
         """ override """
         return self.displayname()
 
+attr.reg_attrs(PBXGroup)
+
 
 class PBXVariantGroup(PBXGroup):
-    pass
+    __slots__ = ()
 
 
 
@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import pbxconsts
 from xcodeproj.utils import func
@@ -33,6 +34,10 @@ class PBXProject(baseobject.PBXBaseObject):
         targets                 [PBXTarget], nonnull, default []
     """
 
+    __slots__ = attr.slots([u'attributes', u'buildConfigurationList', u'compatibilityVersion', \
+        u'developmentRegion', u'hasScannedForEncodings', u'knownRegions', u'mainGroup', \
+        u'productRefGroup', u'projectDirPath', u'projectReferences', u'projectRoot', u'targets'])
+
     def __init__(self, xcproj, guid):
         super(PBXProject, self).__init__(xcproj, guid)
         # pbx attributes
@@ -44,35 +49,20 @@ class PBXProject(baseobject.PBXBaseObject):
         self.pbx_projectRoot = u'' # str
         self.pbx_targets = [] # [guid]
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_buildConfigurationList':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXProject, name, value, \
-                lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == 'XCConfigurationList')
-
-        elif name in [u'pbx_mainGroup', u'pbx_productRefGroup']:
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXProject, name, value, \
-                lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == 'PBXGroup')
-
-        elif name == u'pbx_targets':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, PBXProject, name, value, self.is_valid_target)
+    def _set_pbx_buildConfigurationList(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_buildConfigurationList', value, \
+            lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == 'XCConfigurationList')
 
-        elif name == u'pbx_projectReferences':
-            self.__set_project_references(value)
+    def _set_pbx_mainGroup(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_mainGroup', value, self.is_valid_group)
 
-        elif name == u'pbx_attributes':
-            if not func.isdict(value):
-                value = dict()
-            super(PBXProject, self).__setattr__(name, value)
+    def _set_pbx_productRefGroup(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_productRefGroup', value, self.is_valid_group)
 
-        elif name == u'pbx_knownRegions':
-            if not func.isseq(value):
-                value = [value]
-            super(PBXProject, self).__setattr__(name, value)
+    def _set_pbx_targets(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_targets', value, self.is_valid_target)
 
-        else:
-            super(PBXProject, self).__setattr__(name, value)
-
-    def __set_project_references(self, value):
+    def _set_pbx_projectReferences(self, value):
         if not func.isseq(value):
             return
 
@@ -81,7 +71,21 @@ class PBXProject(baseobject.PBXBaseObject):
             logger.warn(u'{0} ignore invalid project reference:\n\t{1}'\
                 .format(self, u'\n\t'.join(map(lambda o: str(o), rejects))))
 
-        super(PBXProject, self).__setattr__(u'pbx_projectReferences', value)
+        self._setpbxattr(u'pbx_projectReferences', value)
+
+    def _set_pbx_attributes(self, value):
+        if not func.isdict(value):
+            value = dict()
+        self._setpbxattr(u'pbx_attributes', value)
+
+    def _set_pbx_knownRegions(self, value):
+        if not func.isseq(value):
+            value = [value]
+        self._setpbxattr(u'pbx_knownRegions', value)
+
+    def is_valid_group(self, obj):
+        """ check if obj is valid mainGroup / productRefGroup value """
+        return isinstance(obj, baseobject.PBXBaseObject) and obj.isa == 'PBXGroup'
 
     def is_valid_project_reference(self, value):
         """ check if value is valid project reference """
@@ -125,9 +129,9 @@ class PBXProject(baseobject.PBXBaseObject):
 
         proj_refs = self.pbx_projectReferences
         if proj_refs is None:
-            proj_refs = [projref]
-        else:
-            proj_refs.append(projref)
+            self._setpbxattr(u'pbx_projectReferences', [])
+            proj_refs = self.pbx_projectReferences # the owned copy
+        proj_refs.append(projref)
 
         projref[u'ProductGroup'].add_referrer(self, u'pbx_projectReferences.ProductGroup')
         projref[u'ProjectRef'].add_referrer(self, u'pbx_projectReferences.ProjectRef')
@@ -146,7 +150,6 @@ class PBXProject(baseobject.PBXBaseObject):
             ref = proj_refs[idx]
             if ref[u'ProductGroup'].guid == projref[u'ProductGroup'].guid \
                 and ref[u'ProjectRef'].guid == projref[u'ProjectRef'].guid:
-                
                 proj_refs.pop(idx)
                 ref[u'ProductGroup'].remove_referrer(self)
                 ref[u'ProjectRef'].remove_referrer(self)
@@ -305,3 +308,4 @@ class PBXProject(baseobject.PBXBaseObject):
         self.__deduplicate_project_reference(resolved, issues)
         return resolved, issues
 
+attr.reg_attrs(PBXProject)
@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 
 
@@ -25,21 +26,22 @@ class PBXContainerItemProxy(baseobject.PBXBaseObject):
         remoteInfo              str, nullable
     """
 
+    __slots__ = attr.slots([u'containerPortal', u'proxyType', u'remoteGlobalIDString', \
+        u'remoteInfo'])
+
     def __init__(self, xcproj, guid):
         super(PBXContainerItemProxy, self).__init__(xcproj, guid)
         self.pbx_proxyType = 0 # int
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_containerPortal':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXContainerItemProxy, name, value, \
-                lambda o: isinstance(o, baseobject.PBXBaseObject)\
-                and o.isa in [u'PBXProject', u'PBXFileReference'])
-        elif name == u'pbx_remoteGlobalIDString':
-            if isinstance(value, baseobject.PBXBaseObject):
-                value = value.guid
-            super(PBXContainerItemProxy, self).__setattr__(name, value)
-        else:
-            super(PBXContainerItemProxy, self).__setattr__(name, value)
+    def _set_pbx_containerPortal(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_containerPortal', value, \
+            lambda o: isinstance(o, baseobject.PBXBaseObject)\
+            and o.isa in [u'PBXProject', u'PBXFileReference'])
+
+    def _set_pbx_remoteGlobalIDString(self, value):
+        if isinstance(value, baseobject.PBXBaseObject):
+            value = value.guid
+        self._setpbxattr(u'pbx_remoteGlobalIDString', value)
 
     def _accepted_owner(self, obj):
         if not isinstance(obj, baseobject.PBXBaseObject):
@@ -63,3 +65,4 @@ class PBXContainerItemProxy(baseobject.PBXBaseObject):
             pbxhelper.pbxobj_validate_pbxobj_attr(self, u'pbx_containerPortal', throw_exception=True)
         return super(PBXContainerItemProxy, self)._validate()
 
+attr.reg_attrs(PBXContainerItemProxy, weak=[u'pbx_containerPortal']) # refers to rootObject
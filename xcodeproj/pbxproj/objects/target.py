@@ -10,6 +10,7 @@ if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
 from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import attr
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.utils import func
 
@@ -32,21 +33,24 @@ class PBXTarget(baseobject.PBXBaseObject):
         name                        str, nonnull
         productName                 str, nonnull
     """
+
+    __slots__ = attr.slots([u'buildConfigurationList', u'buildPhases', u'dependencies', u'name', \
+        u'productName'])
+
     def __init__(self, xcproj, guid):
         super(PBXTarget, self).__init__(xcproj, guid)
         self.pbx_buildPhases = [] # [guid]
         self.pbx_dependencies = [] # [guid]
 
-    def __setattr__(self, name, value):
-        if name == u'pbx_buildConfigurationList':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXTarget, name, value, \
-                lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == u'XCConfigurationList')
-        elif name == u'pbx_buildPhases':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, PBXTarget, name, value, self.is_valid_build_phase)
-        elif name == u'pbx_dependencies':
-            pbxhelper.pbxobj_set_pbxlist_attr(self, PBXTarget, name, value, self.is_valid_dependency)
-        else:
-            super(PBXTarget, self).__setattr__(name, value)
+    def _set_pbx_buildConfigurationList(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_buildConfigurationList', value, \
+            lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == u'XCConfigurationList')
+
+    def _set_pbx_buildPhases(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_buildPhases', value, self.is_valid_build_phase)
+
+    def _set_pbx_dependencies(self, value):
+        pbxhelper.pbxobj_set_pbxlist_attr(self, u'pbx_dependencies', value, self.is_valid_dependency)
 
     def displayname(self):
         """ return name to be displayed """
@@ -184,7 +188,9 @@ class PBXTarget(baseobject.PBXBaseObject):
         self.__validate_build_phases(resolved, issues)
         return resolved, issues
 
-        
+attr.reg_attrs(PBXTarget)
+
+
 class PBXNativeTarget(PBXTarget):
     """
     pbx-attr:
@@ -192,20 +198,21 @@ class PBXNativeTarget(PBXTarget):
         productReference    PBXFileReference, nonnull
         productType         str, nonnull
     """
+
+    __slots__ = attr.slots([u'buildRules', u'productReference', u'productType'])
+
     def __init__(self, xcproj, guid):
         super(PBXNativeTarget, self).__init__(xcproj, guid)
         self.pbx_buildRules = [] # []
 
-    def __setattr__(self, name, value):
-        if name == 'pbx_productReference':
-            pbxhelper.pbxobj_set_pbxobj_attr(self, PBXNativeTarget, name, value, \
-                lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == 'PBXFileReference')
-        else:
-            super(PBXNativeTarget, self).__setattr__(name, value)
+    def _set_pbx_productReference(self, value):
+        pbxhelper.pbxobj_set_pbxobj_attr(self, u'pbx_productReference', value, \
+            lambda o:isinstance(o, baseobject.PBXBaseObject) and o.isa == 'PBXFileReference')
 
+attr.reg_attrs(PBXNativeTarget)
 
 class PBXAggregateTarget(PBXTarget):
-    pass
+    __slots__ = ()
 
 
 
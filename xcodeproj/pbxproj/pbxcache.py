@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+On-disk cache of the parsed object graph of 'project.pbxproj'.
+
+A cache file is a sequence of 3 pickles:
+    header:     {version, path, size, mtime, sha1} of the source file
+    isa map:    {guid: isa} of all the objects
+    payload:    (project attributes, {guid: object attributes})
+references between objects are pickled as persistent ids, so the graph is stored flatly
+and restored without re-building the referrer graph.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import hashlib
+import weakref
+
+from xcodeproj.utils import logger
+from xcodeproj.pbxproj import baseobject
+from xcodeproj.pbxproj import objects as objclasses
+
+# bump it whenever the layout of the pbx-objects changes, the old cache files will be ignored.
+CACHE_VERSION = 8
+
+CACHE_DIR_ENV = u'XCODEPROJ_CACHE_DIR'
+CACHE_FILE_EXT = u'.pbxcache'
+
+_PROJECT_ID = u'#' # persistent id of the project, never conflicts with guids
+_WEAK_PREFIX = u'~' # prefix of the persistent ids of the weakrefs to the objects
+
+def cache_dir():
+    """ directory of the cache files, can be overridden by env 'XCODEPROJ_CACHE_DIR' """
+    path = os.environ.get(CACHE_DIR_ENV)
+    if not path:
+        path = os.path.join(os.path.expanduser(u'~'), u'.cache', u'xcodeproj')
+    return path
+
+def cache_path(pbxproj_path):
+    """ return the cache file path for the pbxproj file """
+    pbxproj_path = os.path.normpath(os.path.abspath(pbxproj_path))
+    if not isinstance(pbxproj_path, bytes):
+        pbxproj_path = pbxproj_path.encode('utf-8')
+    return os.path.join(cache_dir(), hashlib.sha1(pbxproj_path).hexdigest() + CACHE_FILE_EXT)
+
+def file_header(pbxproj_path, data):
+    """
+    return the header to identify the content of the pbxproj file.
+    :param data:    bytes of the pbxproj file
+    """
+    st = os.stat(pbxproj_path)
+    return {
+        u'version': CACHE_VERSION,
+        u'path': os.path.normpath(os.path.abspath(pbxproj_path)),
+        u'size': st.st_size,
+        u'mtime': st.st_mtime,
+        u'sha1': hashlib.sha1(data).hexdigest(),
+    }
+
+def load(xcproj, pbxproj_path, header):
+    """
+    restore the objects of 'xcproj' from cache.
+    return the project attributes {pbxkey: value}, or None if the cache is missing or stale.
+    :param header:  file_header() of the current pbxproj file
+    """
+    path = cache_path(pbxproj_path)
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, 'rb') as fp:
+            unpickler = pickle.Unpickler(fp)
+            if not unpickler.load() == header:
+                logger.verbose(u'[XcodeProj] stale cache: {0}'.format(path))
+                return None
+
+            isa_map = unpickler.load()
+            objects = {_PROJECT_ID: weakref.ref(xcproj)}
+            for guid, isa in isa_map.items():
+                cls = objclasses.isa_class(isa)
+                if cls is None:
+                    raise ValueError(u'unknown isa: {0}'.format(isa))
+                objects[guid] = cls.__new__(cls)
+
+            def __persistent_load(pid):
+                if pid.startswith(_WEAK_PREFIX):
+                    return weakref.ref(objects[pid[len(_WEAK_PREFIX):]])
+                return objects[pid]
+            # end of __persistent_load
+
+            unpickler.persistent_load = __persistent_load
+            attrs, states = unpickler.load()
+    except Exception as e:
+        logger.warn(u'[XcodeProj] bad cache: {0}; {1}'.format(path, e))
+        return None
+
+    for guid, state in states.items():
+        obj = objects[guid]
+        obj.__setstate__(state)
+        xcproj.add_object(obj)
+    return attrs
+
+def dump(xcproj, pbxproj_path, header):
+    """
+    write the parsed objects of 'xcproj' to cache.
+    :param header:  file_header() of the pbxproj file that 'xcproj' was parsed from
+    """
+    def __persistent_id(obj):
+        if isinstance(obj, baseobject.PBXBaseObject):
+            return obj.guid
+        elif isinstance(obj, weakref.ref) and obj() is xcproj:
+            return _PROJECT_ID # the weak pointer of the objects to the project
+        elif isinstance(obj, weakref.ref) and isinstance(obj(), baseobject.PBXBaseObject):
+            return _WEAK_PREFIX + obj().guid # the back-edges, eg: the referrers
+        return None
+    # end of __persistent_id
+
+    path = cache_path(pbxproj_path)
+    tmppath = u'{0}.{1}.tmp'.format(path, os.getpid())
+    try:
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        objects = [o for guid, o in xcproj.objects().guid_items()]
+        attrs = {k: v for k, v in xcproj.__dict__.items() \
+            if k.startswith(u'pbx_')}
+
+        with open(tmppath, 'wb') as fp:
+            pickler = pickle.Pickler(fp, pickle.HIGHEST_PROTOCOL)
+            pickler.dump(header)
+            pickler.dump({o.guid: o.isa for o in objects})
+            pickler.persistent_id = __persistent_id
+            pickler.dump((attrs, {o.guid: o.__getstate__() for o in objects}))
+        os.rename(tmppath, path)
+    except Exception as e:
+        logger.warn(u'[XcodeProj] failed to write cache: {0}; {1}'.format(path, e))
+        if os.path.isfile(tmppath):
+            os.remove(tmppath)
+
+def clear(pbxproj_path=None):
+    """
+    remove the cache file of 'pbxproj_path', or all the cache files if 'pbxproj_path' is None
+    """
+    if not pbxproj_path is None:
+        paths = [cache_path(pbxproj_path)]
+    elif os.path.isdir(cache_dir()):
+        paths = [os.path.join(cache_dir(), f) for f in os.listdir(cache_dir()) \
+            if f.endswith(CACHE_FILE_EXT)]
+    else:
+        paths = []
+
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
@@ -17,6 +17,13 @@ OBJECT_VERSION = 50 # xcode 9.3
 
 PBX_ATTR_PREFIX = u'pbx_'
 
+# the objects indexed by realpath, see XcodeProj.fileref_for_path
+PATH_INDEXED_ISAS = (u'PBXFileReference', u'PBXVariantGroup', u'PBXReferenceProxy')
+
+# the objects affecting the resolved build settings, see XcodeProj.effective_buildsettings
+BUILD_SETTINGS_ISAS = frozenset([u'XCBuildConfiguration', u'XCConfigurationList', u'PBXProject', \
+    u'PBXNativeTarget', u'PBXAggregateTarget', u'PBXFileReference'])
+
 SOURCE_TREE = template.enum(
     group           = u'<group>',
     absolute        = u'<absolute>',
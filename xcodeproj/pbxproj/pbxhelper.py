@@ -9,14 +9,21 @@ ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
+import re
+
 from xcodeproj.utils import func
 from xcodeproj.utils import logger
+from xcodeproj.utils import template
 from xcodeproj.pbxproj import pbxconsts
+from xcodeproj.pbxproj import pbxlist
+
+_GUID_REG = re.compile(u'[0-9A-F]{{{0}}}\\Z'.format(pbxconsts.REFID_LEN))
 
 def is_valid_guid(obj):
     """ return True if 'obj' is valid pbxobject refid """
-    import re
-    return re.match('^[\dA-F]{{{0}}}$'.format(pbxconsts.REFID_LEN), str(obj))
+    return func.isstr(obj) and len(obj) == pbxconsts.REFID_LEN and not _GUID_REG.match(obj) is None
+
+_PBXSTR_UNQUOTED_REG = re.compile(u'[a-zA-Z0-9\\._/]*\\Z')
 
 def pbxstr_escape(val):
     replacements = [
@@ -27,15 +34,14 @@ def pbxstr_escape(val):
                     (u'\t', u'\\\t'),
                     (u'\'', u'\\\''),
                     ]
-    import re
     val = func.to_unicode(val)
-    if len(val) == 0 or not re.match('[a-zA-Z0-9\\._/]*', val).group(0) == val:
+    if len(val) == 0 or _PBXSTR_UNQUOTED_REG.match(val) is None:
         for k, v in replacements:
             val = val.replace(k, v)
         return u'"{0}"'.format(val)
     return val
 
-def pbxobj_set_pbxobj_attr(obj, objclass, attr, value, validator):
+def pbxobj_set_pbxobj_attr(obj, attr, value, validator):
     """
     set value for attribute 'name'. the value is instance of PBXBaseObject
     """
@@ -44,7 +50,7 @@ def pbxobj_set_pbxobj_attr(obj, objclass, attr, value, validator):
         oldval.remove_referrer(obj)
 
     if validator(value):
-        super(objclass, obj).__setattr__(attr, value)
+        obj._setpbxattr(attr, value)
         value.add_referrer(obj, attr)
     elif value is None:
         delattr(obj, attr)
@@ -75,7 +81,7 @@ def pbxobj_validate_pbxobj_attr(obj, attr, throw_exception=False, issues=[]):
                 .format(attr=attr[len(pbxconsts.PBX_ATTR_PREFIX):], ex=e))
 
 
-def pbxobj_set_pbxlist_attr(obj, objclass, attr, value, validator):
+def pbxobj_set_pbxlist_attr(obj, attr, value, validator):
     """
     obj.attr is type of [PBXBaseObject] 
     """
@@ -98,7 +104,7 @@ def pbxobj_set_pbxlist_attr(obj, objclass, attr, value, validator):
                 .format(obj=obj, attr=attr[len(pbxconsts.PBX_ATTR_PREFIX):], \
                     v='\n\t'.join([str(v) for v in rejects])))
 
-        super(objclass, obj).__setattr__(attr, value)
+        obj._setpbxattr(attr, pbxlist.PBXList(value))
         for v in value:
             v.add_referrer(obj, attr)
 
@@ -134,7 +140,7 @@ def pbxobj_has_pbxlist_value(obj, attr, value, validator):
         guid = value
     elif validator(value):
         guid = value.guid
-    return not guid is None and len(func.take(lambda o: o.guid == guid, getattr(obj, attr, []))) > 0
+    return not guid is None and pbxlist.hasguid(getattr(obj, attr, []), guid)
 
 def pbxobj_pbxlist_value_index(obj, attr, value, validator):
     """
@@ -149,7 +155,10 @@ def pbxobj_pbxlist_value_index(obj, attr, value, validator):
     if guid is None:
         return -1
 
-    for index, val in enumerate(getattr(obj, attr, [])):
+    vallist = getattr(obj, attr, [])
+    if isinstance(vallist, pbxlist.PBXList):
+        return vallist.guid_index(guid)
+    for index, val in enumerate(vallist):
         if val.guid == guid:
             return index
     return -1
@@ -195,6 +204,8 @@ def pbxobj_remove_pbxlist_value(obj, attr, val, validator):
 
     if not guid is None:
         attrval = getattr(obj, attr, [])
+        if not pbxlist.hasguid(attrval, guid):
+            return
         index = 0
         while index < len(attrval):
             o = attrval[index]
@@ -205,28 +216,27 @@ def pbxobj_remove_pbxlist_value(obj, attr, val, validator):
             index += 1
 
 def pbxobj_replace_pbxlist_value(obj, attr, oldval, newval, validator):   
-    if not validator(val):
+    if not validator(newval):
         raise ValueError(\
             u'{obj} invalid {attr}: {v}'\
             .format(obj=obj, attr=attr[len(pbxconsts.PBX_ATTR_PREFIX):], v=newval))
 
-    if not guid is None:
-        attrval = getattr(obj, attr, [])
-        for index, o in enumerate(attrval):
-            if oldval.guid == o.guid:
-                attrval[index] = newval
-                o.remove_referrer(obj)
-                newval.add_referrer(obj, attr)
-                break
+    index = pbxobj_pbxlist_value_index(obj, attr, oldval, validator)
+    if index >= 0:
+        attrval = getattr(obj, attr)
+        o = attrval[index]
+        attrval[index] = newval
+        o.remove_referrer(obj)
+        newval.add_referrer(obj, attr)
 
-def pbxobj_replace_pbxobj_attr(obj, objclass, attr, oldval, newval, validator):
+def pbxobj_replace_pbxobj_attr(obj, attr, oldval, newval, validator):
     """
     check if 'oldval' is the value of 'attr', 
     if True, replace it with 'newval', otherwise, do nothing
     """
     attrval = getattr(obj, attr, None)
     if not attrval is None and attrval.guid == oldval.guid:
-        pbxobj_set_pbxobj_attr(obj, objclass, attr, newval, validator)
+        pbxobj_set_pbxobj_attr(obj, attr, newval, validator)
 
 def pbxobj_deduplicate_pbxlist_value(obj, attr, key, action, resolved, issues):
     items = getattr(obj, attr, None)
@@ -247,22 +257,87 @@ def pbxobj_deduplicate_pbxlist_value(obj, attr, key, action, resolved, issues):
                 .format(attr=attr[len(pbxconsts.PBX_ATTR_PREFIX):],\
                     r=str(reserved), dels=u'\n\t'.join([str(o) for o in lst])))
 
+# (magic number, mimetype) of the binary files, tested in order
+_FILE_MAGICS = [
+    (b'\xfe\xed\xfa\xce', u'application/x-mach-binary'),    # 32-bit
+    (b'\xce\xfa\xed\xfe', u'application/x-mach-binary'),
+    (b'\xfe\xed\xfa\xcf', u'application/x-mach-binary'),    # 64-bit
+    (b'\xcf\xfa\xed\xfe', u'application/x-mach-binary'),
+    (b'\xca\xfe\xba\xbe', u'application/x-mach-binary'),    # universal
+    (b'!<arch>\n', u'application/x-archive'),
+    (b'\x89PNG\r\n\x1a\n', u'image/png'),
+    (b'\xff\xd8\xff', u'image/jpeg'),
+]
+
+# (BOM, charset) of the text files
+_TEXT_BOMS = [
+    (b'\xef\xbb\xbf', u'utf-8'),
+    (b'\xff\xfe', u'utf-16le'),
+    (b'\xfe\xff', u'utf-16be'),
+]
+
+_FILE_HEADER_SIZE = 1024
+
+_FILE_INFO_CACHE = template.LRUCache(8192) # {path: (stamp, (mimetype, charset))}
+
+def file_stamp(st):
+    """ 
+    return the stamp of a file by its stat 'st', which changes when the file is modified or
+    replaced, even by a file of the same size and mtime (eg: renamed over it).
+    """
+    return (st.st_size, getattr(st, 'st_mtime_ns', st.st_mtime), st.st_ino)
+
+def _sniff_file_info(header):
+    """ return (mimetype, charset) of the file starts with bytes 'header' """
+    if len(header) == 0:
+        return (u'inode/x-empty', u'binary')
+    for magic, mime in _FILE_MAGICS:
+        if header.startswith(magic):
+            return (mime, u'binary')
+    for bom, charset in _TEXT_BOMS:
+        if header.startswith(bom):
+            return (u'text/plain', charset)
+
+    if b'\0' in header:
+        return (u'application/octet-stream', u'binary')
+    try:
+        header.decode('ascii')
+        return (u'text/plain', u'us-ascii')
+    except UnicodeDecodeError as e:
+        pass
+    try:
+        header.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # the header may end in the middle of a multi-byte character
+        if len(header) < _FILE_HEADER_SIZE or e.start < len(header) - 3:
+            return (u'application/octet-stream', u'binary')
+    return (u'text/plain', u'utf-8')
+
 def get_file_info(file):
     """
-    return a tuple of the file's mimetype and charset
+    return a tuple of the file's mimetype and charset, the same as `file -I` reports for
+    the types in pbxconsts.MIME_TO_FILETYPE.
+    the type is detected from the header of the file, and memoized by the path and file_stamp().
     """
-    import re
-    import subprocess
-
-    p = subprocess.Popen(['/usr/bin/file', '-I', file], stdout=subprocess.PIPE)
-    stdout, stderr = p.communicate()
-    if p.returncode == 0:
-        matchs = re.search('.*:\s*(.+);.*\s*charset=(.+)', stdout)
-        if matchs:
-            mime = matchs.group(1)
-            charset = matchs.group(2)
-            return (mime, charset)
-    return (None, None)
+    try:
+        st = os.stat(file)
+    except OSError as e:
+        return (None, None)
+    if os.path.isdir(file):
+        return (u'inode/directory', u'binary')
+
+    stamp = file_stamp(st)
+    cached = _FILE_INFO_CACHE.get(file)
+    if not cached is None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        with open(file, 'rb') as fp:
+            info = _sniff_file_info(fp.read(_FILE_HEADER_SIZE))
+    except IOError as e:
+        return (None, None)
+    _FILE_INFO_CACHE[file] = (stamp, info)
+    return info
 
 def osx_charset_num(charset):
     """
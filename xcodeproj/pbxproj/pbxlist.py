@@ -0,0 +1,350 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import weakref
+
+
+class _Owned(object):
+    """
+    mixin of the containers of the pbx-attribute values, which notify their owner pbx-object
+    by markdirty() before they are changed in place, so that the changes are never missed by
+    the caches of the owner (eg: its rendered text) and by validate().
+    a container not bound to any owner (eg: being unpickled) works as the plain one.
+    the owner is held weakly, as it holds the container.
+    """
+
+    __slots__ = ()
+
+    def owner(self):
+        """ return the pbx-object that the container belongs to, None if not bound """
+        try:
+            ref = self._owner
+        except AttributeError as e:
+            return None
+        return ref() if not ref is None else None
+
+    def _bind(self, owner):
+        self._owner = weakref.ref(owner) if not owner is None else None
+        return self
+
+    def _willchange(self):
+        """ notify the owner before a change in place, return the owner """
+        owner = self.owner()
+        if not owner is None:
+            owner.markdirty()
+        return owner
+
+    def __getstate__(self):
+        return (self.owner(),) # the owner is pickled as a reference, see pbxcache
+
+    def __setstate__(self, state):
+        self._bind(state[0])
+
+
+class PBXDict(_Owned, dict):
+    """
+    dict of a pbx-attribute value, eg: XCBuildConfiguration.buildSettings.
+    the values stored into it are converted by owned(), so the nested containers notify the owner too.
+    """
+
+    __slots__ = (u'_owner',)
+
+    def __setitem__(self, key, value):
+        owner = self._willchange()
+        if not owner is None:
+            key, value = owned(key, owner), owned(value, owner)
+        super(PBXDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._willchange()
+        super(PBXDict, self).__delitem__(key)
+
+    def clear(self):
+        self._willchange()
+        super(PBXDict, self).clear()
+
+    def pop(self, *args):
+        self._willchange()
+        return super(PBXDict, self).pop(*args)
+
+    def popitem(self):
+        self._willchange()
+        return super(PBXDict, self).popitem()
+
+    def setdefault(self, key, default=None):
+        if not key in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class PBXArray(_Owned, list):
+    """
+    list of a pbx-attribute value that is not a list of pbx-objects, eg: PBXProject.knownRegions.
+    the items stored into it are converted by owned(), so the nested containers notify the owner too.
+    """
+
+    __slots__ = (u'_owner',)
+
+    def __owned(self, items):
+        owner = self._willchange()
+        return items if owner is None else [owned(item, owner) for item in items]
+
+    def append(self, item):
+        super(PBXArray, self).append(self.__owned([item])[0])
+
+    def insert(self, index, item):
+        super(PBXArray, self).insert(index, self.__owned([item])[0])
+
+    def extend(self, items):
+        super(PBXArray, self).extend(self.__owned(list(items)))
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        self._willchange()
+        return super(PBXArray, self).__imul__(count)
+
+    def pop(self, index=-1):
+        self._willchange()
+        return super(PBXArray, self).pop(index)
+
+    def remove(self, item):
+        self._willchange()
+        super(PBXArray, self).remove(item)
+
+    def reverse(self):
+        self._willchange()
+        super(PBXArray, self).reverse()
+
+    def sort(self, *args, **kwargs):
+        self._willchange()
+        super(PBXArray, self).sort(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = self.__owned(list(value))
+        else:
+            value = self.__owned([value])[0]
+        super(PBXArray, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._willchange()
+        super(PBXArray, self).__delitem__(key)
+
+    def __setslice__(self, i, j, value):
+        # python 2 only
+        self.__setitem__(slice(max(i, 0), max(j, 0)), value)
+
+    def __delslice__(self, i, j):
+        # python 2 only
+        self.__delitem__(slice(max(i, 0), max(j, 0)))
+
+
+class PBXList(_Owned, list):
+    """
+    list of pbx-objects, eg: PBXGroup.children, PBXBuildPhase.files.
+    keeps the order of the items, and a side index {guid: count} of them,
+    so the membership test of a guid is O(1).
+    the positions {guid: index of the first one} are kept too, for guid_index(), they are
+    extended by append() and extend(), and rebuilt after the other changes, which move the items.
+    the indexes are built on first use, so the items may be unpickled before their guids.
+    """
+
+    __slots__ = (u'__guids', u'__positions', u'_owner') # {guid: count}, {guid: index}, owner
+
+    def __built_index(self):
+        """ return the index, None if it is not built yet """
+        try:
+            return self.__guids
+        except AttributeError as e:
+            return None
+
+    def __index(self):
+        guids = self.__built_index()
+        if guids is None:
+            guids = {}
+            for item in list.__iter__(self):
+                guids[item.guid] = guids.get(item.guid, 0) + 1
+            self.__guids = guids
+        return guids
+
+    def __added(self, items):
+        guids = self.__built_index()
+        if not guids is None:
+            for item in items:
+                guids[item.guid] = guids.get(item.guid, 0) + 1
+
+    def __built_positions(self):
+        """ return the positions, None if they are not built yet or out of date """
+        try:
+            return self.__positions
+        except AttributeError as e:
+            return None
+
+    def __appended(self, items):
+        """ 'items' are appended to the end, the positions of the others are not moved """
+        positions = self.__built_positions()
+        if not positions is None:
+            start = len(self) - len(items)
+            for offset, item in enumerate(items):
+                positions.setdefault(item.guid, start + offset)
+
+    def __moved(self):
+        """ the items are moved, the positions are out of date """
+        self.__positions = None
+
+    def __removed(self, items):
+        guids = self.__built_index()
+        if not guids is None:
+            for item in items:
+                count = guids.get(item.guid, 0) - 1
+                if count > 0:
+                    guids[item.guid] = count
+                else:
+                    guids.pop(item.guid, None)
+
+    def hasguid(self, guid):
+        """ return True if the list contains the object with 'guid' """
+        return guid in self.__index()
+
+    def guid_index(self, guid):
+        """ return the index of the first object with 'guid', -1 if not found """
+        if not guid in self.__index():
+            return -1
+        positions = self.__built_positions()
+        if positions is None:
+            positions = {}
+            for index, item in enumerate(list.__iter__(self)):
+                positions.setdefault(item.guid, index)
+            self.__positions = positions
+        return positions.get(guid, -1)
+
+    def __contains__(self, item):
+        guid = getattr(item, u'guid', None)
+        if guid is None or not guid in self.__index():
+            return False
+        return super(PBXList, self).__contains__(item)
+
+    def append(self, item):
+        self._willchange()
+        super(PBXList, self).append(item)
+        self.__added([item])
+        self.__appended([item])
+
+    def insert(self, index, item):
+        self._willchange()
+        super(PBXList, self).insert(index, item)
+        self.__added([item])
+        self.__moved()
+
+    def extend(self, items):
+        items = list(items)
+        self._willchange()
+        super(PBXList, self).extend(items)
+        self.__added(items)
+        self.__appended(items)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        self[:] = list(self) * count
+        return self
+
+    def pop(self, index=-1):
+        self._willchange()
+        item = super(PBXList, self).pop(index)
+        self.__removed([item])
+        self.__moved()
+        return item
+
+    def remove(self, item):
+        self._willchange()
+        super(PBXList, self).remove(item)
+        self.__removed([item])
+        self.__moved()
+
+    def reverse(self):
+        self._willchange()
+        super(PBXList, self).reverse()
+        self.__moved()
+
+    def sort(self, *args, **kwargs):
+        self._willchange()
+        super(PBXList, self).sort(*args, **kwargs)
+        self.__moved()
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = list(value)
+            olditems = self[key]
+        else:
+            olditems = [self[key]]
+        self._willchange()
+        super(PBXList, self).__setitem__(key, value)
+        self.__removed(olditems)
+        self.__added(value if isinstance(key, slice) else [value])
+        self.__moved()
+
+    def __delitem__(self, key):
+        olditems = self[key] if isinstance(key, slice) else [self[key]]
+        self._willchange()
+        super(PBXList, self).__delitem__(key)
+        self.__removed(olditems)
+        self.__moved()
+
+    def __setslice__(self, i, j, value):
+        # python 2 only
+        self.__setitem__(slice(max(i, 0), max(j, 0)), value)
+
+    def __delslice__(self, i, j):
+        # python 2 only
+        self.__delitem__(slice(max(i, 0), max(j, 0)))
+
+
+def hasguid(seq, guid):
+    """ return True if the sequence of pbx-objects contains the object with 'guid' """
+    if isinstance(seq, PBXList):
+        return seq.hasguid(guid)
+    for item in seq:
+        if item.guid == guid:
+            return True
+    return False
+
+def owned(value, owner):
+    """
+    return 'value' in the canonical form of the pbx-attribute values of 'owner':
+    str is decoded to unicode, the dicts and the other sequences are copied into PBXDict and
+    PBXArray bound to 'owner', a PBXList is bound to 'owner' unless it belongs to another one.
+    the containers already bound to 'owner' are returned as they are.
+    """
+    cls = type(value)
+    if cls is str:
+        return value.decode('utf-8')
+    elif cls is PBXList:
+        current = value.owner()
+        if current is None or current is owner:
+            return value._bind(owner)
+        return PBXList(value)._bind(owner)
+    elif (cls is PBXDict or cls is PBXArray) and value.owner() is owner:
+        return value
+    elif isinstance(value, dict):
+        return PBXDict([(owned(k, owner), owned(v, owner)) for k, v in value.items()])._bind(owner)
+    elif isinstance(value, (list, tuple, set)):
+        return PBXArray([owned(v, owner) for v in value])._bind(owner)
+    return value
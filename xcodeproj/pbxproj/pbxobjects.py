@@ -9,17 +9,30 @@ ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
+import bisect
+
 from xcodeproj.pbxproj import abstract
 from xcodeproj.pbxproj import baseobject
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.utils import func
 
+# check the consistency of the objects and sections after every change, it costs O(n) a change.
+ENABLE_CHECKS = False
+
 class PBXObjects(abstract.PBXAbstract):
+    """
+    the objects of the project, {guid: object} and the sections {isa: {guid: object}}.
+    the isa of a guid is the isa of its object, so a change touches exactly one section.
+    the guids of each section are kept in order for write(), the new guids are appended 
+    and sorted on the next write, which is linear as the list is mostly sorted.
+    """
 
     def __init__(self):
         super(PBXObjects, self).__init__()
         self.__objects = dict()
         self.__sections = dict()
+        self.__orders = dict() # {isa: [guid]}, the guids of the section in order
+        self.__unsorted = set() # isa of the sections that have guids appended since sorted
 
     def guids(self):
         return self.__objects.keys()
@@ -39,35 +52,62 @@ class PBXObjects(abstract.PBXAbstract):
         return self.__sections.get(key, default)
 
     def pop(self, key, default=None):
-        try:        
-            if pbxhelper.is_valid_guid(key):
-                obj = self.__objects.pop(key, default)
-                for sec in self.__sections.values():
-                    sec.pop(key, None)
-                return obj
+        if pbxhelper.is_valid_guid(key):
+            obj = self.__objects.pop(key, None)
+            if obj is None:
+                return default
+            self.__remove_from_section(key, obj.isa)
+        elif key in self.__sections:
+            obj = self.__sections.pop(key)
+            self.__orders.pop(key, None)
+            self.__unsorted.discard(key)
+            for guid in obj.keys():
+                self.__objects.pop(guid, None)
+        else:
+            return default
+
+        if ENABLE_CHECKS:
+            self.__check()
+        return obj
+
+    def __remove_from_section(self, guid, isa):
+        section = self.__sections.get(isa)
+        if not section is None and guid in section:
+            section.pop(guid)
+            order = self.__orders[isa]
+            if isa in self.__unsorted:
+                order.remove(guid)
             else:
-                if key in self.__sections:
-                    dic = self.__sections[key]
-                    for guid, o in dic.items():
-                        self.__objects.pop(guid, None)
-                    return dic
-                else:
-                    return default
-        finally:
-            assert self.__validate()
+                del order[bisect.bisect_left(order, guid)]
 
+    def __sorted_guids(self, isa):
+        """ return the guids of section 'isa' in order """
+        order = self.__orders[isa]
+        if isa in self.__unsorted:
+            order.sort()
+            self.__unsorted.discard(isa)
+        return order
 
     def __setitem__(self, key, value):
         assert isinstance(value, baseobject.PBXBaseObject)
 
-        isa = getattr(value, u'isa')
-        assert not isa is None
-        if isa in self.__sections:
-            self.__sections[isa][key] = value
-        else:
-            self.__sections[isa] = {key: value}
+        isa = value.isa
+        oldval = self.__objects.get(key)
+        if not oldval is None and not oldval.isa == isa:
+            self.__remove_from_section(key, oldval.isa)
+
+        section = self.__sections.get(isa)
+        if section is None:
+            section = self.__sections[isa] = {}
+            self.__orders[isa] = []
+        if not key in section:
+            self.__orders[isa].append(key)
+            self.__unsorted.add(isa)
+        section[key] = value
         self.__objects[key] = value
-        assert self.__validate()
+
+        if ENABLE_CHECKS:
+            self.__check()
 
     def __getitem__(self, key):
         if pbxhelper.is_valid_guid(key):
@@ -76,37 +116,47 @@ class PBXObjects(abstract.PBXAbstract):
 
     def __delitem__(self, key):
         if pbxhelper.is_valid_guid(key):
-            del self.__objects[key]
-            for sec in self.__sections.values():
-                sec.pop(key, None)
+            obj = self.__objects.pop(key)
+            self.__remove_from_section(key, obj.isa)
         else:
             objs = self.__sections.pop(key)
-            for obj in objs:
-                self.__objects.pop(obj.guid, None)
-        assert self.__validate()
+            self.__orders.pop(key, None)
+            self.__unsorted.discard(key)
+            for guid in objs.keys():
+                self.__objects.pop(guid, None)
+
+        if ENABLE_CHECKS:
+            self.__check()
 
     def __contains__(self, key):
         if pbxhelper.is_valid_guid(key):
             return self.__objects.__contains__(key)
         return self.__sections.__contains__(key)
 
-    def __validate(self):
-        count = len(self.__objects)
-        for objs in self.__sections.values():
-            count -= len(objs)
-            if count < 0:
-                break
-        return count == 0
+    def __check(self):
+        """ raise AssertionError if the sections do not match the objects """
+        count = 0
+        for isa, objs in self.__sections.items():
+            count += len(objs)
+            if not sorted(self.__orders[isa]) == sorted(objs.keys()):
+                raise AssertionError(u'[PBXObjects] the order of section {0} mismatched'.format(isa))
+            for guid, obj in objs.items():
+                if not self.__objects.get(guid) is obj or not obj.isa == isa:
+                    raise AssertionError(u'[PBXObjects] {0} is misplaced in section {1}'\
+                        .format(guid, isa))
+        if not count == len(self.__objects):
+            raise AssertionError(u'[PBXObjects] {0} objects but {1} in sections'\
+                .format(len(self.__objects), count))
 
     def write(self, buff, identstr=u''):
         """ override """
         for isa, objsdict in sorted(self.__sections.items(), key=lambda o: o[0]):
-            self.safely_write(buff, u'{sep}/* Begin {isa} section */{sep}'\
+            buff.write(u'{sep}/* Begin {isa} section */{sep}'\
                 .format(isa=isa, sep=os.linesep))
 
-            for guid, obj in sorted(objsdict.items(), key=lambda o:o[0]):
-                obj.write(buff, identstr+u'\t')
-                self.safely_write(buff, u'{sep}'.format(sep=os.linesep))
+            for guid in self.__sorted_guids(isa):
+                objsdict[guid].write(buff, identstr+u'\t')
+                buff.write(os.linesep)
             
-            self.safely_write(buff, u'/* End {isa} section */{sep}'.format(isa=isa, sep=os.linesep))
+            buff.write(u'/* End {isa} section */{sep}'.format(isa=isa, sep=os.linesep))
 
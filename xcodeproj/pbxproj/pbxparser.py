@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+In-process parser for the old-style (OpenStep) ASCII plist format of 'project.pbxproj'.
+
+The result has the same structure as `plutil -convert json` produces: dicts, lists and
+unicode strings (numbers are kept as strings, the same as plutil does). the data literals
+'<hex>' have no json type, they are rejected the same as plutil does.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import re
+
+class PBXParseError(Exception):
+    pass
+
+# token kinds, the index of the capturing group in _TOKEN_REG
+TOKEN_PUNCT = 1
+TOKEN_QUOTED = 2
+TOKEN_UNQUOTED = 3
+TOKEN_DATA = 4
+
+# every match consumes the leading spaces / comments and exactly one token.
+# the alternatives of _SKIP never overlap (one space, a comment to its first '*/', a line comment
+# to its end), so a failed match backtracks linearly instead of trying every split of the spaces.
+_SKIP = br'(?:\s|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|//[^\n]*(?![^\n]))*'
+_TOKEN_REG = re.compile(_SKIP +
+                        br'(?:([{}()=;,])'
+                        br'|"([^"\\]*(?:\\.[^"\\]*)*)"'
+                        br'|([A-Za-z0-9_$+/:.\-]+)'
+                        br'|<([0-9A-Fa-f\s]*)>)', re.S)
+_SKIP_REG = re.compile(_SKIP, re.S)
+_TAIL_REG = re.compile(_SKIP + br'$', re.S)
+
+_ESCAPE_REG = re.compile(u'\\\\(?:U([0-9a-fA-F]{4})|([0-7]{1,3})|(.))', re.S)
+
+_ESCAPES = {
+    u'a': u'\a',
+    u'b': u'\b',
+    u'f': u'\f',
+    u'n': u'\n',
+    u'r': u'\r',
+    u't': u'\t',
+    u'v': u'\v',
+}
+
+def _unescape_match(match):
+    if not match.group(1) is None:
+        return unichr(int(match.group(1), 16))
+    elif not match.group(2) is None:
+        return unichr(int(match.group(2), 8))
+    char = match.group(3)
+    return _ESCAPES.get(char, char)
+
+def unescape(raw):
+    """ decode the content of a quoted string """
+    return _unescape(raw.decode('utf-8'))
+
+def _unescape(val):
+    if u'\\' in val:
+        val = _ESCAPE_REG.sub(_unescape_match, val)
+    return val
+
+def _error(data, pos, msg):
+    line = data.count(b'\n', 0, pos) + 1
+    return PBXParseError(u'{msg} at line {line}'.format(msg=msg, line=line))
+
+def _decode(data, pos, raw):
+    """ return the token 'raw' at 'pos' decoded, raise PBXParseError if it is not utf-8 """
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise _error(data, pos + e.start, u'invalid utf-8 byte {0!r}'.format(raw[e.start:e.start+1]))
+
+# parser states
+_EXPECT_VALUE = 0       # root value, or dict value after '='
+_EXPECT_KEY = 1         # dict key or '}'
+_EXPECT_ASSIGN = 2      # '=' after dict key
+_EXPECT_SEMICOLON = 3   # ';' after dict value
+_EXPECT_ITEM = 4        # array item or ')'
+_EXPECT_SEPARATOR = 5   # ',' or ')' after array item
+
+def _parse(data, spans=None):
+    """
+    iterative (stack based) parser, a single regex match per token, 
+    so the cost is linear in the size of data, the malformed data included.
+    the equal unquoted strings are decoded once and share one object, so the guids
+    referred many times cost no more memory and compare by identity.
+    """
+    stack = []  # [(container, key)] of the enclosing containers
+    container = None
+    key = None
+    state = _EXPECT_VALUE
+    root = None
+    done = False
+    pos = 0
+    objects = None # the dict of root.objects, if spans are recorded
+    keystart = 0
+    strings = {} # {token: unicode}, the unquoted strings (guids, isa, keys) are shared
+
+    match = _TOKEN_REG.match
+    while not done:
+        m = match(data, pos) # anchored, never searches forward for the next token
+        if m is None:
+            break
+        pos = m.end()
+        kind = m.lastindex
+        tok = m.group(kind)
+
+        if kind == TOKEN_PUNCT:
+            if state == _EXPECT_SEMICOLON and tok == b';':
+                if container is objects:
+                    spans[key] = (keystart, pos)
+                state = _EXPECT_KEY
+                continue
+            elif state == _EXPECT_SEPARATOR and tok == b',':
+                state = _EXPECT_ITEM
+                continue
+            elif state == _EXPECT_ASSIGN and tok == b'=':
+                state = _EXPECT_VALUE
+                continue
+            elif (state == _EXPECT_KEY and tok == b'}') \
+                or ((state == _EXPECT_ITEM or state == _EXPECT_SEPARATOR) and tok == b')'):
+                # close the container and deliver it as a value to the parent
+                value = container
+                container, key = stack.pop()
+            elif (state == _EXPECT_VALUE or state == _EXPECT_ITEM) and tok == b'{':
+                stack.append((container, key))
+                container = {}
+                state = _EXPECT_KEY
+                if not spans is None and len(stack) == 2 and key == u'objects':
+                    objects = container
+                continue
+            elif (state == _EXPECT_VALUE or state == _EXPECT_ITEM) and tok == b'(':
+                stack.append((container, key))
+                container = []
+                state = _EXPECT_ITEM
+                continue
+            else:
+                raise _error(data, m.start(kind), u'unexpected "{0}"'.format(tok.decode('ascii')))
+
+        elif state == _EXPECT_KEY:
+            if kind == TOKEN_UNQUOTED:
+                key = strings.get(tok)
+                if key is None:
+                    key = strings[tok] = tok.decode('utf-8')
+            elif kind == TOKEN_QUOTED:
+                key = _unescape(_decode(data, m.start(kind), tok))
+            else:
+                raise _error(data, m.start(kind), u'invalid dict key')
+            if container is objects:
+                keystart = m.start(kind) if kind == TOKEN_UNQUOTED else m.start(kind) - 1
+            state = _EXPECT_ASSIGN
+            continue
+
+        elif state == _EXPECT_VALUE or state == _EXPECT_ITEM:
+            if kind == TOKEN_UNQUOTED:
+                value = strings.get(tok)
+                if value is None:
+                    value = strings[tok] = tok.decode('utf-8')
+            elif kind == TOKEN_QUOTED:
+                value = _unescape(_decode(data, m.start(kind), tok))
+            else:
+                raise _error(data, m.start(kind), u'data literal is not supported')
+
+        else:
+            raise _error(data, m.start(kind), \
+                u'unexpected "{0}"'.format(tok.decode('utf-8', 'replace')))
+
+        # deliver 'value' to the enclosing container
+        if container is None:
+            root = value
+            done = True
+        elif type(container) is list:
+            container.append(value)
+            state = _EXPECT_SEPARATOR
+        else:
+            container[key] = value
+            state = _EXPECT_SEMICOLON
+
+    if not done:
+        if not _TAIL_REG.match(data, pos) is None:
+            raise _error(data, pos, u'unexpected end of data')
+        pos = _SKIP_REG.match(data, pos).end()
+        raise _error(data, pos, u'unexpected character {0!r}'.format(data[pos:pos+1]))
+    if _TAIL_REG.match(data, pos) is None:
+        raise _error(data, pos, u'unexpected data after the root object')
+    return root
+
+
+def loads(data, spans=None):
+    """
+    parse the content of a pbxproj file.
+    :param data:    bytes of the file
+    :param spans:   if not None, it is filled with {guid: (start, end)}, the byte range of 
+                    each entry of 'objects', from the guid to the ending ';'
+    """
+    import gc
+    gc_enabled = gc.isenabled()
+    gc.disable() # the parser only creates acyclic containers, skip the cycle collector
+    try:
+        return _parse(data, spans)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def load(path):
+    """ parse the pbxproj file at 'path' """
+    with open(path, 'rb') as fp:
+        data = fp.read()
+    return loads(data)
@@ -9,23 +9,38 @@ ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
 
+import re
+
 from xcodeproj.utils import func
 from xcodeproj.utils import logger
 from xcodeproj.pbxproj import pbxconsts
 
 PATH_ENV_REG = u'(^(\s*)\$[\{\(]?([\d\w_]+)[\}\)]?)'
+_PATH_ENV_REG = re.compile(PATH_ENV_REG)
+
+# the env-vars resolved by the project itself, see XcodeProj.buildsettings()
+PROJECT_PATH_ENVS = frozenset([u'PROJECT_DIR', u'SRCROOT', u'SOURCE_ROOT', \
+    u'PROJECT_NAME', u'PROJECT_FILE_PATH'])
 
 def is_variant_path(path):
-    import re
-    return re.search(PATH_ENV_REG, path)
+    return _PATH_ENV_REG.search(path)
+
+def is_project_path(path):
+    """ 
+    return True if the realpath of 'path' is resolved by the project, not by the environment,
+    so it only changes with 'path'.
+    """
+    if path is None:
+        return False
+    match = _PATH_ENV_REG.search(path)
+    return match is None or match.group(3) in PROJECT_PATH_ENVS
 
 def normalize_path(path, autocomplete=True):
     """ normalize the path in xcodeproj """
     if path is None:
         return None
 
-    import re
-    match = re.search(PATH_ENV_REG, path)
+    match = _PATH_ENV_REG.search(path)
     if match:
         repstr = match.group(1)
         envname = match.group(3)
@@ -75,8 +90,7 @@ def realpath(xcproj, objpath):
     if objpath is None or xcproj is None:
         return None
 
-    import re
-    match = re.search(PATH_ENV_REG, objpath)
+    match = _PATH_ENV_REG.search(objpath)
     if match:
         repstr = match.group(1)
         envname = match.group(3)
@@ -121,10 +135,10 @@ def set_path_with_source_tree(obj, path, source_tree=pbxconsts.SOURCE_TREE.group
     obj.pbx_sourceTree = source_tree
 
 
-def set_group_file_path(obj, objtype, path):
+def set_group_file_path(obj, path):
     path = normalize_path(path, autocomplete=False)
     if not path == u'.':
-        super(objtype, obj).__setattr__(u'pbx_path', path)
+        obj._setpbxattr(u'pbx_path', path)
     if obj.pbx_name is None and os.sep in path:
         dirname, dirext = os.path.splitext(os.path.dirname(path))
         if dirext == u'.lproj':
@@ -5,6 +5,8 @@
 
 import os
 import sys
+import shutil
+import contextlib
 ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
 if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
     sys.path.append(ModuleRoot)
@@ -16,6 +18,10 @@ from xcodeproj.pbxproj import pbxobjects
 from xcodeproj.pbxproj import abstract
 from xcodeproj.pbxproj import pbxhelper
 from xcodeproj.pbxproj import pbxconsts
+from xcodeproj.pbxproj import pbxparser
+from xcodeproj.pbxproj import pbxcache
+from xcodeproj.pbxproj import buildsettings as settings_imp
+from xcodeproj.pbxproj import objects as objclasses
 
 class XcodeProj(abstract.PBXAbstract):
     """
@@ -36,6 +42,23 @@ class XcodeProj(abstract.PBXAbstract):
         self.__objects = pbxobjects.PBXObjects()
         self.__project_file_path = None
         self.__plist_objects = None
+        self.__lazy = False
+        self.__faults = [] # lazy load: objects created but not parsed yet
+        self.__plist_referrers = None # lazy load: {guid: [referrer guid]} of unparsed objects
+        self.__plist_spans = None # {guid: (start, end)}, byte range of objects in loaded file
+        self.__origin_stat = None # (size, mtime) of the loaded file
+        self.__loading = 0
+        self.__path_index = None # {isa: {realpath: [object]}}, built on first lookup
+        self.__path_index_keys = {} # {guid: (isa, realpath)}, the keys of indexed objects
+        self.__path_index_stale = set() # guids of the objects need re-index
+        self.__changed_objects = {} # {guid: object}, the objects changed since last validation
+        self.__gc_pending = False # an edge of the object graph is removed since last gc
+        self.__batch_depth = 0
+        self.__batch_invalidated = {} # {guid: object}, batch: the deferred comment invalidations
+        self.__undo = None # batch: {guid: (object, state before the batch or None if added)}
+        self.__revision = 0 # the number of the changes of the objects
+        self.__sync_snapshots = {} # sync_group: {(group guid, dirpath): (subtree, snapshot)}
+        self.__settings_resolver = None # memoized build settings, created on first use
 
     @staticmethod
     def create(project_dir, product_name, deployment_target, \
@@ -73,12 +96,20 @@ class XcodeProj(abstract.PBXAbstract):
         return xcproj
 
     @staticmethod
-    def load(xcprojpath, pbxprojfile=u'project.pbxproj'):
+    def load(xcprojpath, pbxprojfile=u'project.pbxproj', lazy=False, use_cache=False):
         """
         load and parse pbxproj file.
         :param xcprojpath:      path to ".xcodeproj".
         :param pbxprojfile:     default is 'project.pbxproj', 
                                 you can specified another name if needed
+        :param lazy:            if True, objects are created and parsed on demand when they are 
+                                first reached, the rest stay as raw dicts. 
+                                suitable for read-only scripts that touch a few objects.
+                                the objects must be reached while the project is alive.
+        :param use_cache:       if True, restore the parsed objects from the on-disk cache 
+                                when the pbxproj file is unchanged (size, mtime and content hash),
+                                otherwise parse the file and write the cache. 
+                                'lazy' is ignored when the cache is used.
         """
         xcprojpath = os.path.normpath(os.path.abspath(xcprojpath))
 
@@ -92,56 +123,155 @@ class XcodeProj(abstract.PBXAbstract):
             logger.error(u'[XcodeProj] Illegal Project file: "%s"' % pbxproj_path)
             sys.exit(1)
 
-        import subprocess
-        cmd_args = (
-            u'/usr/bin/plutil',
-            u'-convert', u'json',
-            u'-o', u'-',
-            pbxproj_path
-        )
-        p = subprocess.Popen(cmd_args, stdout=subprocess.PIPE)
-        stdout, stderr = p.communicate()
-        if not p.returncode == 0:
-            logger.error(u'[XcodeProj] Incomprehensible file: %s; %s' % (pbxproj_path, stderr))
+        xcproj = XcodeProj()
+        xcproj.__project_file_path = xcprojpath
+        xcproj.__pbxfile = pbxprojfile
+
+        with open(pbxproj_path, 'rb') as fp:
+            data = fp.read()
+        st = os.stat(pbxproj_path)
+        xcproj.__origin_stat = (st.st_size, st.st_mtime)
+
+        header = None
+        if use_cache:
+            header = pbxcache.file_header(pbxproj_path, data)
+            attrs = pbxcache.load(xcproj, pbxproj_path, header)
+            if not attrs is None:
+                for pbxkey, v in attrs.items():
+                    setattr(xcproj, pbxkey, v)
+                return xcproj
+
+        spans = dict()
+        try:
+            plist_dict = pbxparser.loads(data, spans=spans)
+        except pbxparser.PBXParseError as e:
+            logger.error(u'[XcodeProj] Incomprehensible file: %s; %s' % (pbxproj_path, e))
             sys.exit(1)
 
-        import json
-        plist_dict = json.loads(stdout)
         if not func.isdict(plist_dict):
-            logger.error(u'[XcodeProj] Bad format: %s; %s' % (pbxproj_path, stderr))
+            logger.error(u'[XcodeProj] Bad format: %s' % pbxproj_path)
             sys.exit(1)
 
         # parse objects
-        xcproj = XcodeProj()
-        xcproj.__project_file_path = xcprojpath
-        xcproj.__pbxfile = pbxprojfile
-
+        xcproj.__lazy = lazy and not use_cache
+        xcproj.__plist_spans = spans
         xcproj.__parse(plist_dict)
+
+        if use_cache:
+            pbxcache.dump(xcproj, pbxproj_path, header)
         return xcproj
 
+    @staticmethod
+    def clear_cache(xcprojpath=None, pbxprojfile=u'project.pbxproj'):
+        """
+        remove the cache written by XcodeProj.load(use_cache=True).
+        :param xcprojpath:      path to ".xcodeproj", if None, remove the caches of all projects.
+        """
+        if xcprojpath is None:
+            pbxcache.clear()
+        else:
+            xcprojpath = os.path.normpath(os.path.abspath(xcprojpath))
+            pbxcache.clear(os.path.join(xcprojpath, pbxprojfile))
+
     def __parse(self, plist_dict):
         objects = plist_dict.pop(u'objects', None)
         self.__plist_objects = objects if func.isdict(objects) else None
 
-        for k, v in plist_dict.items():
-            plist_dict.pop(k)
-            pbxkey = u'pbx_{name}'.format(name=k)
-            if k == u'rootObject':
-                v = self.get_object(v)
-            setattr(self, pbxkey, v)
-
+        self.__loading += 1
+        try:
+            for k, v in plist_dict.items():
+                plist_dict.pop(k)
+                pbxkey = u'pbx_{name}'.format(name=k)
+                if k == u'rootObject':
+                    v = self.get_object(v)
+                setattr(self, pbxkey, v)
+        finally:
+            self.__loading -= 1
+
+        if not self.__lazy:
+            self.__finish_parse()
+
+    def __finish_parse(self):
         if len(self.__plist_objects) > 0:
             logger.warn(u'[XcodeProj] isolate objects are not be parsed:\n\t{0}'\
                 .format(u'\n\t'.join([u'{0}:{1}'.format(k, v.get(u'isa')) \
                     for k, v in self.__plist_objects.items()])))
         self.__plist_objects = None # process complete
+        self.__lazy = False
+        self.__faults = []
+        self.__plist_referrers = None
+        self.__plist_spans = None
+
+    def __load_all(self):
+        """ lazy load: load all the objects reachable from rootObject and leave lazy mode """
+        if not self.__lazy:
+            return
+        while len(self.__faults) > 0:
+            self.__faults.pop().fire_fault()
+        self.__finish_parse()
 
-
-    def __validate_files(self):
-        def __remove_multi_owners(obj, resolved):
+    def _fire_fault(self, obj):
+        """ lazy load: parse the attributes of 'obj' """
+        if self.__plist_objects is None:
+            return
+        objdict = self.__plist_objects.pop(obj.guid, None)
+        if func.isdict(objdict):
+            self.__loading += 1
+            try:
+                obj.parse(objdict)
+            finally:
+                self.__loading -= 1
+
+    def isloading(self):
+        """ return True if the objects are being parsed from the loaded file """
+        return self.__loading > 0
+
+    def _fire_referrers_fault(self, obj):
+        """ lazy load: load the unparsed objects that refer to 'obj' """
+        def __scan_refs(val, refs):
+            if func.isstr(val):
+                if pbxhelper.is_valid_guid(val):
+                    refs.add(val)
+            elif func.isseq(val):
+                for v in val:
+                    __scan_refs(v, refs)
+            elif func.isdict(val):
+                for v in val.values():
+                    __scan_refs(v, refs)
+        # end of __scan_refs
+
+        if self.__plist_objects is None:
+            return
+        if self.__plist_referrers is None:
+            self.__plist_referrers = dict()
+            for guid, objdict in self.__plist_objects.items():
+                refs = set()
+                __scan_refs(objdict, refs)
+                for ref in refs:
+                    self.__plist_referrers.setdefault(ref, []).append(guid)
+
+        for guid in self.__plist_referrers.pop(obj.guid, []):
+            refer = self.get_object(guid)
+            if not refer is None:
+                refer.fire_fault()
+
+
+    def __validate_files(self, objs):
+        """ resolve the file references and groups in 'objs', which have changed """
+        def __located_in(obj, owner, realpath):
+            """ return True if 'obj' is located at 'realpath' when it is a child of 'owner' """
+            if realpath is None or not obj.pbx_sourceTree == pbxconsts.SOURCE_TREE.group:
+                return True
+            ownerpath = owner.realpath()
+            return not ownerpath is None and not obj.pbx_path is None \
+                and os.path.normpath(os.path.join(ownerpath, obj.pbx_path)) == realpath
+
+        def __remove_multi_owners(obj, resolved, realpath=None):
             for owner in obj.owners().values():
                 owner.validate()
-            owners = sorted(obj.owners().values(), key=lambda o:o.guid)
+            # keep the owner that 'obj' is located in, then the oldest one
+            owners = sorted(obj.owners().values(), \
+                key=lambda o: (not __located_in(obj, o, realpath), o.guid))
             if len(owners) > 1:
                 owners.pop(0)
                 for owner in owners:
@@ -149,26 +279,26 @@ class XcodeProj(abstract.PBXAbstract):
                 resolved.append(u'{f} remove redundant owners:\n\t{o}'\
                     .format(f=obj, o=u'\n\t'.join(map(lambda o:str(o), owners))))
 
+        def __changed_objects(isa):
+            return [o for o in objs if o.isa == isa and self.__objects.get(o.guid) is o]
+
         def __resolve_isolate_files(isa, resolved):
             isolate_files = []
-            if isa in self.__objects:
-                for file in self.__objects[isa].values():
-                    if len(file.owners()) == 0:
-                        isolate_files.append(file)
-                        self.remove_object(file)
+            for file in __changed_objects(isa):
+                if len(file.owners()) == 0:
+                    isolate_files.append(file)
+                    self.remove_object(file)
 
             if len(isolate_files) > 0:
                 resolved.append(u'remove isolate files:\n\t{fs}'\
                     .format(fs=u'\n\t'.join([str(f) for f in isolate_files])))
 
         def __deduplicate_files(isa, resolved):
-            if not isa in self.__objects:
-                return
-            import itertools
-            grouped_files = sorted(self.__objects[isa].values(), key=lambda f: f.realpath())
-            grouped_files = itertools.groupby(grouped_files, lambda f:f.realpath())
-            for path, files in grouped_files:
-                files = list(files)
+            for file in __changed_objects(isa):
+                if not self.__objects.get(file.guid) is file:
+                    continue # merged
+                realpath = file.realpath()
+                files = sorted(self._objects_for_path(isa, realpath), key=lambda f: f.guid)
                 reserved = files.pop(0)
                 if len(files) > 0:
                     for f in files:
@@ -176,11 +306,11 @@ class XcodeProj(abstract.PBXAbstract):
                     resolved.append(u'merge duplicate files to {f}:\n\t{d}'\
                         .format(f=reserved, d=u'\n\t'.join(map(lambda o:str(o), files))))
 
-                __remove_multi_owners(reserved, resolved) 
+                __remove_multi_owners(reserved, resolved, realpath)
         # end of __deduplicate_files
 
         def __verify_groups(resolved):
-            for obj in self.__objects[u'PBXGroup'].values():
+            for obj in __changed_objects(u'PBXGroup'):
                 __remove_multi_owners(obj, resolved)
         # end of __verify_groups
 
@@ -200,33 +330,106 @@ class XcodeProj(abstract.PBXAbstract):
         """
         validate project's objects,  remove the invalid objects.
         canonize the pbxproj by removing duplcated objects, resolve the object tree.
+        only the objects changed since last validation are visited, 
+        until the changes made by the validation itself are resolved.
+        inside a batch(), it is deferred to the end of the batch.
         """
-        self.__validate_files()
-
-        while self.need_validate():
-            for guid, obj in self.__objects.guid_items():
+        if self.__batch_depth > 0:
+            return
+        self.__load_all()
+
+        visited = {}
+        while len(self.__changed_objects) > 0:
+            changes = self.__changed_objects
+            self.__changed_objects = {}
+            objs = [o for guid, o in changes.items() if self.__objects.get(guid) is o]
+            visited.update(changes)
+
+            self.__validate_files(objs)
+            for obj in objs:
+                if not self.__objects.get(obj.guid) is obj:
+                    continue # removed by validation
                 try:
                     obj.validate()
-                except PBXValidationError as e:
+                except baseobject.PBXValidationError as e:
                     self.remove_object(obj)
-        
-        isolate_objs = [obj for guid, obj in self.__objects.guid_items() \
-            if not obj == self.pbx_rootObject and len(obj.referrers()) == 0]
-        if len(isolate_objs) > 0:
-            logger.warn(u'[XcodeProj] isolate objects:\n\t{0}'\
-                .format(u'\n\t'.join([str(o) for o in isolate_objs])))
+
+            if len(self.__changed_objects) == 0 and self.__need_gc(visited):
+                self.collect_garbage() # the referrers of the removed objects are revisited
+
+    def __need_gc(self, visited):
+        """ return True if an edge is removed, or any object in 'visited' is isolate """
+        if self.__gc_pending:
+            return True
+        for guid, obj in visited.items():
+            if self.__objects.get(guid) is obj and not obj == self.pbx_rootObject \
+                and len(obj.referrers()) == 0:
+                return True
+        return False
+
+    def collect_garbage(self):
+        """
+        remove the objects unreachable from rootObject, including the isolate objects and 
+        the cycles of objects that only refer to each other.
+        the reachable objects are marked along the references from rootObject, and the rest 
+        are removed in bulk, so the cost is linear in the number of objects and references.
+        it is done by validate() and save() when needed.
+        return [object] of the removed objects.
+        """
+        self.__load_all()
+        self.__gc_pending = False
+        if not isinstance(self.pbx_rootObject, baseobject.PBXBaseObject):
+            return []
+
+        reachable = set([self.pbx_rootObject.guid])
+        pending = [self.pbx_rootObject]
+        while len(pending) > 0:
+            obj = pending.pop()
+            for guid in obj.dependencies():
+                if not guid in reachable:
+                    dep = self.__objects.get(guid)
+                    if not dep is None:
+                        reachable.add(guid)
+                        pending.append(dep)
+
+        garbage = [o for guid, o in self.__objects.guid_items() if not guid in reachable]
+        for obj in garbage:
+            self._will_change(obj)
+            self.__objects.pop(obj.guid)
+            self.__path_stale(obj)
+        self.__drop_references(garbage)
+
+        if len(garbage) > 0:
+            logger.verbose(u'[XcodeProj] remove unreachable objects:\n\t{0}'\
+                .format(u'\n\t'.join([str(o) for o in garbage])))
+        return garbage
+
+    def __drop_references(self, objs):
+        """ remove 'objs', which have been removed from project, from the referrers of the rest """
+        referrers = {} # {guid: [guid of the removed referrers]}
+        for obj in objs:
+            for guid in obj.dependencies():
+                referrers.setdefault(guid, []).append(obj.guid)
+        for guid, refs in referrers.items():
+            obj = self.__objects.get(guid)
+            if not obj is None:
+                obj._drop_referrers(refs)
 
     def need_validate(self):
         """
         return True if there is any object need validate.
         """
-        return len(func.take(lambda o: o[1].isdirty() and len(o[1].referrers()) > 0, \
-            self.__objects.guid_items())) > 0
+        self.__load_all()
+        return len(func.take(lambda o: o.isdirty() and len(o.referrers()) > 0, \
+            self.__changed_objects.values())) > 0
 
-    def save(self, tofile=None):
+    def save(self, tofile=None, minimal_diff=False):
         """
         save project objects to file.
-        :param tofile:  the path of file to write to.
+        :param tofile:          the path of file to write to.
+        :param minimal_diff:    if True, the objects that are not changed since loaded are copied
+                                verbatim from the loaded file, only the added and changed objects
+                                are formatted.
         """
         if self.__project_file_path is None:
             logger.error(u'project file path is not set!')
@@ -235,33 +438,58 @@ class XcodeProj(abstract.PBXAbstract):
         if not os.path.isdir(self.__project_file_path):
             os.makedirs(self.__project_file_path)
 
-        buff = []
-        self.write(buff)
-        if len(buff) == 0:
-            return
-
-        bakup_file = None
+        pbxproj_path = os.path.join(self.__project_file_path, self.__pbxfile)
         if tofile is None:
-            tofile = os.path.join(self.__project_file_path, self.__pbxfile)
-            if os.path.isfile(tofile):
-                bakup_file = tofile + u'.bak'
-                os.rename(tofile, bakup_file)
+            tofile = pbxproj_path
+
+        if len(self.__changed_objects) > 0 and self.__need_gc(self.__changed_objects):
+            self.collect_garbage() # the orphans are not written even if validate() is not called
 
+        # written to a temporary file and renamed over 'tofile', so the loaded file mapped as
+        # the origin is never truncated under the mapping, and 'tofile' is intact on failure.
+        tmpfile = u'{0}.{1}.tmp'.format(tofile, os.getpid())
+        origin = self.__map_origin() if minimal_diff else None
         try:
-            with open(tofile, u'w') as fp:
-                fp.writelines(u''.join(buff).encode('utf-8'))
+            with open(tmpfile, 'wb') as fp:
+                buff = abstract.PBXWriter(fp, origin=origin)
+                self.write(buff)
+                buff.flush()
+            if os.path.isfile(tofile):
+                shutil.copymode(tofile, tmpfile)
+            os.rename(tmpfile, tofile)
         except Exception as e:
             logger.error(u'[XcodeProj] Can not write to file "{tofile}"; error:"{error}"'\
                 .format(tofile=tofile, error=e))
-            if not bakup_file is None and os.path.isfile(bakup_file):
-                os.rename(bakup_file, tofile)
-                logger.info(u'[XcodeProj] restore {pbxfile}'.format(pbxfile=self.__pbxfile))
+            if os.path.isfile(tmpfile):
+                os.remove(tmpfile)
         else:
-            # write correctly, delete backup file
-            if not bakup_file is None and os.path.isfile(bakup_file):
-                os.remove(bakup_file)
+            if os.path.realpath(tofile) == os.path.realpath(pbxproj_path):
+                self.__origin_stat = None # the loaded file is replaced
+        finally:
+            if not origin is None:
+                origin.close()
+
+    def __map_origin(self):
+        """ return the mmap of the loaded file, None if it has been modified since loaded """
+        import mmap
+
+        pbxproj_path = os.path.join(self.__project_file_path, self.__pbxfile)
+        if self.__origin_stat is None or not os.path.isfile(pbxproj_path):
+            return None
+
+        st = os.stat(pbxproj_path)
+        if not (st.st_size, st.st_mtime) == self.__origin_stat:
+            logger.warn(u'[XcodeProj] {0} is modified since loaded, rewrite all objects.'\
+                .format(pbxproj_path))
+            return None
+        if st.st_size == 0:
+            return None
+
+        with open(pbxproj_path, 'rb') as fp:
+            return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
 
     def pbxdict(self):
+        self.__load_all()
         plist_dic = super(XcodeProj, self).pbxdict()
         plist_dic[u'objects'] = self.__objects
         return plist_dic
@@ -273,20 +501,21 @@ class XcodeProj(abstract.PBXAbstract):
         # plist_dic = {k[len(pbxconsts.PBX_ATTR_PREFIX):]:v \
         #     for k, v in self.__dict__.items() if func.hasprefix(k, pbxconsts.PBX_ATTR_PREFIX)}
         # plist_dic[u'objects'] = self.__objects
+        self.__flush_batch()
         plist_dic = self.pbxdict()
 
-        self.safely_write(buff, u'// !$*UTF8*$!')
-        self.safely_write(buff, os.linesep)
-        self.safely_write(buff, u'{')
-        self.safely_write(buff, os.linesep)
+        buff.write(u'// !$*UTF8*$!')
+        buff.write(os.linesep)
+        buff.write(u'{')
+        buff.write(os.linesep)
         for k, v in sorted(plist_dic.items(), key=lambda o: o[0]):
             if k == u'objects':
-                self.safely_write(buff, u'\tobjects = {{{sep}'.format(sep=os.linesep))
+                buff.write(u'\tobjects = {{{sep}'.format(sep=os.linesep))
                 v.write(buff, u'\t')
-                self.safely_write(buff, u'\t}};{sep}'.format(sep=os.linesep))
+                buff.write(u'\t}};{sep}'.format(sep=os.linesep))
             else:
                 self._print_kv(buff, k, v, u'\t', singleline=False)
-        self.safely_write(buff, u'}')
+        buff.write(u'}')
 
     def get_object(self, guid):
         """ 
@@ -296,13 +525,22 @@ class XcodeProj(abstract.PBXAbstract):
         obj = self.__objects.get(guid)
         if obj is None and not self.__plist_objects is None:
             # self.__plist_objects is None indicates that the parsing process is finished
-            objdict = self.__plist_objects.pop(guid, None)
+            if self.__lazy:
+                objdict = self.__plist_objects.get(guid) # popped when the fault fires
+            else:
+                objdict = self.__plist_objects.pop(guid, None)
             if func.isdict(objdict):
-                objcls = objdict.pop(u'isa', None)
+                objcls = objdict.get(u'isa')
                 if not objcls is None:
                     try:
                         obj = self.__new_object(objcls, guid)
-                        obj.parse(objdict)
+                        if not self.__plist_spans is None:
+                            obj._set_origin(self.__plist_spans.get(guid))
+                        if self.__lazy:
+                            obj._mark_fault()
+                            self.__faults.append(obj)
+                        else:
+                            obj.parse(objdict)
                     except Exception as e:
                         logger.warn(e)
                         raise
@@ -316,6 +554,7 @@ class XcodeProj(abstract.PBXAbstract):
 
     def objects(self):
         """ return all pbx-objects """
+        self.__load_all()
         return self.__objects
 
     def __new_object(self, isa, guid=None):
@@ -325,18 +564,19 @@ class XcodeProj(abstract.PBXAbstract):
 
             for x in xrange(1,10):
                 guid = unicode(uuid.uuid1().hex[0:pbxconsts.REFID_LEN].upper())
-                if not guid in self.__objects:
+                if not guid in self.__objects and \
+                    (self.__plist_objects is None or not guid in self.__plist_objects):
                     return guid
                 raise ValueError(u'[XcodeProj] Failed to generate valid guid!')
         # end of __new_guid
-        module = __import__('xcodeproj.pbxproj.objects', fromlist=['*'])
-        if hasattr(module, isa):
-            if guid is None:
-                guid = __new_guid()
-            obj = getattr(module, isa)(self, guid)
-            self.add_object(obj)
-            return obj
-        raise ValueError(u'[XcodeProj] Unknown object type:"{isa}"'.format(isa=isa))
+        cls = objclasses.isa_class(isa)
+        if cls is None:
+            raise ValueError(u'[XcodeProj] Unknown object type:"{isa}"'.format(isa=isa))
+        if guid is None:
+            guid = __new_guid()
+        obj = cls(self, guid)
+        self.add_object(obj)
+        return obj
 
     def new_object(self, isa):
         """ create new object with 'isa' and add to the project """
@@ -351,12 +591,15 @@ class XcodeProj(abstract.PBXAbstract):
         """ add object to project """
         assert isinstance(obj, baseobject.PBXBaseObject)
         assert obj.project() == self
-        res = self.get_object(obj.guid)
+        res = self.__objects.get(obj.guid)
         if res == obj:
             # obj._xcproj = self
             return
         elif res is None: # or res.isa == obj.isa:
+            if not self.__undo is None:
+                self.__undo.setdefault(obj.guid, (obj, None))
             self.__objects[obj.guid] = obj
+            self._object_changed(obj)
             # obj._xcproj = self
         else:
             raise ValueError(\
@@ -365,22 +608,31 @@ class XcodeProj(abstract.PBXAbstract):
     def remove_object(self, obj):
         """ remove object from project """
         if pbxhelper.is_valid_guid(obj):
-            obj = get_object(obj)
+            obj = self.get_object(obj)
 
         if isinstance(obj, baseobject.PBXBaseObject):
+            self._will_change(obj)
             for guid, refer in obj.referrers().items():
                 obj.remove_referrer(refer)
             self.__objects.pop(obj.guid)
+            self.__drop_references([obj])
+            self._object_changed(obj)
             # obj._xcproj = None
 
-    def buildsettings(self, name, target=None, config=None, default=None):
+    def buildsettings(self, name, target=None, config=None, default=None, resolve=False):
         """ 
         get the project's common build settings,
         :param name:    the name of build setting
         :param target:  the 'PBXTarget' or 'guid' or 'target name', 
                         from which to get the build setting
         :param config:  the 'XCBuildConfiguration' or 'guid' or 'config name'
+        :param resolve: if True, return the effective value, see effective_buildsettings(),
+                        otherwise the raw value of the configuration
         """
+        if resolve:
+            settings = self.effective_buildsettings(target, config)
+            return settings.get(name, default) if not settings is None else default
+
         if name in [u'PROJECT_DIR', u'SRCROOT', u'SOURCE_ROOT']:
             return self.project_dir()
         elif name == u'PROJECT_NAME':
@@ -424,6 +676,23 @@ class XcodeProj(abstract.PBXAbstract):
             return os.getenv(name) 
         return None
 
+    def effective_buildsettings(self, target=None, config=None, sdk=None, arch=None):
+        """
+        return the effective build settings (buildsettings.BuildSettings) of 'target' and 'config',
+        with the project settings, the xcconfig files and the $(VAR) expansion applied.
+        the values are memoized until a configuration, target, the project or an xcconfig file
+        is changed.
+        :param target:  the 'PBXTarget' or 'guid' or 'target name', None for the project settings
+        :param config:  the 'XCBuildConfiguration' or 'guid' or 'config name', 
+                        None for the default configuration
+        :param sdk:     the sdk to match the conditional settings, eg: 'iphoneos11.0', 
+                        the SDKROOT setting if None
+        :param arch:    the arch to match the conditional settings, eg: 'arm64'
+        """
+        if self.__settings_resolver is None:
+            self.__settings_resolver = settings_imp.Resolver(self)
+        return self.__settings_resolver.settings(target, config, sdk, arch)
+
     def project_name(self):
         """ return the name of '.xcodeproj' """
         if self.__project_file_path is None:
@@ -449,17 +718,188 @@ class XcodeProj(abstract.PBXAbstract):
             return None
         return self.pbx_rootObject.gettarget(name)
 
+    @contextlib.contextmanager
+    def batch(self, rollback=True):
+        """
+        context of a batch of edits:
+            with xcproj.batch():
+                projhelper.addfile(xcproj, ...)
+                ...
+        inside the batch, validate() and the invalidation of the comments and rendered text are
+        deferred, they are done once when the batch exits.
+        if an exception is raised out of the batch, all the objects are restored to the state 
+        before the batch, and the exception is re-raised. the state of an object is recorded
+        before its first change in the batch, so the cost is in the number of the changed objects.
+        the nested batches join the outermost one.
+        :param rollback:    if False, the states are not recorded and not restored on exception.
+        """
+        outermost = self.__batch_depth == 0
+        snapshot = self.__snapshot() if outermost and rollback else None
+        self.__batch_depth += 1
+        try:
+            try:
+                yield self
+            finally:
+                self.__batch_depth -= 1
+            if outermost:
+                self.__flush_batch()
+                self.validate()
+        except BaseException:
+            if not snapshot is None:
+                self.__restore(snapshot)
+                logger.verbose(u'[XcodeProj] batch is rolled back')
+            raise
+        finally:
+            if outermost:
+                self.__undo = None
+
+    def __snapshot(self):
+        """ 
+        batch: return the state of the project, and start to record the state of each object
+        before its first change, see _will_change()
+        """
+        self.__load_all() # no fault is fired inside the batch
+        attrs = {k: baseobject.copy_value(v) for k, v in self.__dict__.items() \
+            if k.startswith(pbxconsts.PBX_ATTR_PREFIX)}
+        self.__undo = {}
+        return attrs, self.__undo, dict(self.__changed_objects)
+
+    def _will_change(self, obj):
+        """ 
+        batch: mark up that 'obj' is going to change, or to be removed from project.
+        the state of the object is recorded on its first change in the batch.
+        """
+        undo = self.__undo
+        if undo is None or obj.guid in undo:
+            return
+        if self.__objects.get(obj.guid) is obj:
+            undo[obj.guid] = (obj, obj._snapshot())
+        # else: not added yet, it will be recorded as an added one by add_object()
+
+    def __restore(self, snapshot):
+        """ 
+        batch: restore the state from __snapshot(), the changed and removed objects are
+        restored from their recorded states, the objects added after it are dropped
+        """
+        attrs, undo, changes = snapshot
+        for k in [k for k in self.__dict__ if k.startswith(pbxconsts.PBX_ATTR_PREFIX)]:
+            del self.__dict__[k]
+        self.__dict__.update(attrs)
+
+        for guid, (obj, state) in undo.items():
+            if state is None and self.__objects.get(guid) is obj:
+                self.__objects.pop(guid) # added in the batch
+        restored = [obj for guid, (obj, state) in undo.items() if not state is None]
+        for obj in restored:
+            obj._restore(undo[obj.guid][1])
+            if not self.__objects.get(obj.guid) is obj:
+                self.__objects[obj.guid] = obj
+        self.__undo = None
+        self.__changed_objects = changes
+        self.__revision += 1
+        self.__settings_resolver = None
+        self.__gc_pending = True
+        self.__batch_invalidated = {}
+        self.__path_index = None
+        # the paths and comments of the others may be derived from the changed states
+        for obj in restored:
+            self._path_changed(obj)
+            obj._invalidate_comment()
+
+    def _defer_invalidation(self, obj):
+        """ 
+        batch: defer the comment invalidation of 'obj' to the end of the batch.
+        return False if not in a batch.
+        """
+        if self.__batch_depth == 0:
+            return False
+        self.__batch_invalidated[obj.guid] = obj
+        return True
+
+    def __flush_batch(self):
+        """ batch: do the deferred comment invalidations """
+        if len(self.__batch_invalidated) == 0:
+            return
+        invalidated = self.__batch_invalidated
+        self.__batch_invalidated = {}
+        depth = self.__batch_depth
+        self.__batch_depth = 0
+        try:
+            for guid, obj in invalidated.items():
+                obj._invalidate_comment()
+        finally:
+            self.__batch_depth = depth
+
+    def _referrer_removed(self, obj):
+        """ mark up that a referrer of 'obj' is removed, 'obj' may become unreachable """
+        self.__gc_pending = True
+        self._object_changed(obj)
+
+    def _object_changed(self, obj):
+        """
+        mark up that 'obj' or its referrers have changed, it will be visited by next validate().
+        """
+        self.__changed_objects[obj.guid] = obj
+        self.__revision += 1
+        self.__path_stale(obj) # added, removed or its owners changed
+        self.__settings_stale(obj)
+
+    def _path_changed(self, obj):
+        """ 
+        mark up that the realpath of 'obj' may have changed, eg: path / sourceTree / owner changed.
+        the cached paths of 'obj' are dropped by obj._invalidate_path(), which reports the
+        descendants back to here, and all of them are re-indexed by the next lookup of the index.
+        """
+        self.__path_stale(obj)
+        self.__settings_stale(obj) # eg: the path of an xcconfig file
+        obj._invalidate_path()
+
+    def __path_stale(self, obj):
+        """ mark up that the entry of 'obj' in the path index may be stale """
+        if not self.__path_index is None and obj.isa in pbxconsts.PATH_INDEXED_ISAS:
+            self.__path_index_stale.add(obj.guid)
+
+    def __settings_stale(self, obj):
+        """ mark up that the memoized build settings may be stale """
+        if not self.__settings_resolver is None and obj.isa in pbxconsts.BUILD_SETTINGS_ISAS:
+            self.__settings_resolver.clear()
+
+    def _objects_for_path(self, isa, abspath):
+        """ 
+        return [object] of 'isa' with realpath 'abspath', using the path index. 
+        'isa' should be one of pbxconsts.PATH_INDEXED_ISAS
+        """
+        self.__load_all()
+        if self.__path_index is None:
+            self.__path_index = {i: dict() for i in pbxconsts.PATH_INDEXED_ISAS}
+            self.__path_index_keys = {}
+            self.__path_index_stale = set()
+            for i in pbxconsts.PATH_INDEXED_ISAS:
+                self.__path_index_stale.update(self.__objects.get(i, default=dict()).keys())
+
+        while len(self.__path_index_stale) > 0:
+            guid = self.__path_index_stale.pop()
+            oldkey = self.__path_index_keys.pop(guid, None)
+            if not oldkey is None:
+                objs = self.__path_index[oldkey[0]].get(oldkey[1], [])
+                objs[:] = [o for o in objs if not o.guid == guid]
+
+            obj = self.__objects.get(guid)
+            if not obj is None and obj.isa in self.__path_index:
+                key = (obj.isa, obj.realpath())
+                self.__path_index[key[0]].setdefault(key[1], []).append(obj)
+                self.__path_index_keys[guid] = key
+
+        return self.__path_index[isa].get(abspath, [])
+
     def fileref_for_path(self, abspath):
         """ return the filereferece object with abspath in disk """
-        return func.get_list_item(\
-            func.take(lambda o: o.realpath() == abspath, \
-                self.__objects.get(u'PBXFileReference', default=dict()).values()), 0)
+        return func.get_list_item(self._objects_for_path(u'PBXFileReference', abspath), 0)
 
     def get_variant_group(self, abspath, name):
         """ return the variant group in specified path and name """
-        return func.get_list_item(\
-            func.take(lambda o: o.realpath() == abspath and o.pbx_name == name, \
-                self.__objects.get(u'PBXVariantGroup', default=dict()).values()), 0)
+        return func.get_list_item(func.take(lambda o: o.pbx_name == name, \
+            self._objects_for_path(u'PBXVariantGroup', abspath)), 0)
 
     def addfile(self, path, group, target=None, copy=False, settings=None):
         """
@@ -468,3 +908,19 @@ class XcodeProj(abstract.PBXAbstract):
         """
         from xcodeproj.pbxproj import projhelper
         projhelper.addfile(self, path, group, target, copy, settings)
+
+    def sync_group(self, group, dirpath, target=None, settings=None):
+        """
+        make the subtree of 'group' mirror the directory 'dirpath', see projhelper.sync_group().
+        return ([added path], [removed path], [(old path, new path)])
+        """
+        from xcodeproj.pbxproj import projhelper
+        return projhelper.sync_group(self, group, dirpath, target, settings)
+
+    def revision(self):
+        """ return a number increased whenever an object is changed, added or removed """
+        return self.__revision
+
+    def _sync_snapshots(self):
+        """ sync_group: {(group guid, dirpath): (subtree, snapshot)} of the last syncs """
+        return self.__sync_snapshots
@@ -18,63 +18,204 @@ from xcodeproj.pbxproj import pbxconsts
 from xcodeproj.pbxproj import pbxpath
 from xcodeproj.pbxproj import pbxproj
 
+import atexit
 import shutil
+import stat
+import threading
+
+try:
+    from os import scandir as _scandir
+except ImportError:
+    try:
+        from scandir import scandir as _scandir # the backport for python 2
+    except ImportError:
+        _scandir = None
+
+# the max number of the threads to walk a file tree, 1 to walk it in the calling thread
+SCAN_JOBS = 8
+
+# the bound of the threads of the shared pool, whatever 'jobs' is asked
+MAX_SCAN_JOBS = 32
+
+# the pool shared by the walks, kept alive since shutting down a pool costs ~0.1s in python 2.
+# it is created on first use, grown when more threads are asked, and closed at exit.
+_THREAD_POOL = {u'pool': None, u'size': 0}
+_THREAD_POOL_LOCK = threading.Lock()
+
+def _thread_pool(size):
+    """ return the shared pool of at least 'size' threads, up to MAX_SCAN_JOBS """
+    size = min(size, MAX_SCAN_JOBS)
+    with _THREAD_POOL_LOCK:
+        if _THREAD_POOL[u'size'] < size:
+            from multiprocessing.pool import ThreadPool
+            if _THREAD_POOL[u'pool'] is None:
+                atexit.register(_close_thread_pool)
+            else:
+                _THREAD_POOL[u'pool'].close() # the running tasks are finished in it
+            _THREAD_POOL[u'pool'] = ThreadPool(size)
+            _THREAD_POOL[u'size'] = size
+        return _THREAD_POOL[u'pool']
+
+def _close_thread_pool():
+    """ shut down the shared pool, called at exit """
+    with _THREAD_POOL_LOCK:
+        pool = _THREAD_POOL[u'pool']
+        _THREAD_POOL[u'pool'] = None
+        _THREAD_POOL[u'size'] = 0
+    if not pool is None:
+        pool.close()
+        pool.join()
+
+def _map(function, items, jobs):
+    """ 
+    return [function(item)] of 'items', computed by at most 'jobs' threads of the shared pool.
+    the items are dealt into 'jobs' chunks, so a larger pool never runs more of them at once.
+    """
+    jobs = min(jobs, len(items), MAX_SCAN_JOBS)
+    if jobs <= 1:
+        return [function(item) for item in items]
+
+    chunks = [items[idx::jobs] for idx in range(jobs)]
+    results = [None] * len(items)
+    for idx, chunk in enumerate(_thread_pool(jobs).map(lambda c: [function(i) for i in c], chunks)):
+        results[idx::jobs] = chunk
+    return results
 
-def addfile(xcproj, path, groupobj, targetobj=None, copy=False, settings=None):
+def _listdir(dirpath):
+    """
+    return [(path, isdir, inode)] of the entries in 'dirpath', 
+    the hidden entries and the ones neither file nor directory are skipped.
+    """
+    entries = []
+    if not _scandir is None:
+        for entry in _scandir(dirpath):
+            if func.hasprefix(entry.name, u'.'):
+                continue
+            if entry.is_file():
+                entries.append((entry.path, False, entry.inode()))
+            elif entry.is_dir():
+                entries.append((entry.path, True, entry.inode()))
+    else:
+        for fn in os.listdir(dirpath):
+            if func.hasprefix(fn, u'.'):
+                continue
+            path = os.path.join(dirpath, fn)
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                continue # broken link
+            if stat.S_ISREG(st.st_mode):
+                entries.append((path, False, st.st_ino))
+            elif stat.S_ISDIR(st.st_mode):
+                entries.append((path, True, st.st_ino))
+    return entries
+
+def _new_node(path, isdir, inode=None):
+    """ return the node [path, filetype, children, inode] of a file tree """
+    if not isdir:
+        return [path, None, None, inode] # the file type is detected after the walk
+    filetype = pbxconsts.FILETYPE_BY_EXT.get(os.path.splitext(path)[1])
+    if not filetype is None and filetype in pbxconsts.FOLDER_FILE_TYPE:
+        return [path, filetype, None, inode] # added as a file, eg: xxx.bundle
+    return [path, None, [], inode]
+
+def _walk(root, jobs):
+    """
+    fill the children of the directory node 'root' and its sub-directories, 
+    return [node] of the files whose type is not detected yet.
+    the directories of the same depth are listed in a pool of 'jobs' threads.
+    """
+    files = []
+    level = [root]
+    while len(level) > 0:
+        nextlevel = []
+        for node, entries in zip(level, _map(_listdir, [n[0] for n in level], jobs)):
+            for entrypath, isdir, inode in entries:
+                child = _new_node(entrypath, isdir, inode)
+                node[2].append(child)
+                if not child[2] is None:
+                    nextlevel.append(child)
+                elif child[1] is None:
+                    files.append(child)
+        level = nextlevel
+    return files
+
+def _detect_filetypes(nodes, jobs):
+    """ set the file types of the file 'nodes', in a pool of 'jobs' threads """
+    for node, filetype in zip(nodes, _map(pbxhelper.get_filetype, [n[0] for n in nodes], jobs)):
+        node[1] = filetype
+
+def scan_tree(path, jobs=None):
+    """
+    walk the file tree at 'path', return the root node [path, filetype, children, inode],
+    or None if 'path' is hidden or not exists. 
+    'children' is None for the files and the folders added as files, the hidden files are skipped.
+    the directories of the same depth are listed, and the file types are detected, 
+    in a pool of 'jobs' threads.
+    """
+    if func.hasprefix(os.path.basename(path), u'.'):
+        return None
+    if os.path.isfile(path):
+        root = _new_node(path, False)
+    elif os.path.isdir(path):
+        root = _new_node(path, True)
+    else:
+        return None
+
+    jobs = SCAN_JOBS if jobs is None else jobs
+    if root[2] is None:
+        files = [root] if root[1] is None else []
+    else:
+        files = _walk(root, jobs)
+    _detect_filetypes(files, jobs)
+    return root
+
+def _add_file(targetobj, parentgroup, filepath, filetype, settings=None):
+    """ add single file, and its build file to 'targetobj' """
+    fileref = None
+    dirname, dirext = os.path.splitext(os.path.basename(os.path.dirname(filepath)))
+    if dirext == u'.lproj':
+        # create variant group
+        group_name = os.path.basename(filepath)
+        group_path = os.path.abspath(os.path.dirname(os.path.dirname(filepath)))
+        vgroup = parentgroup.add_variant_group(group_path, group_name)
+        lproj_ref = vgroup.addfile(filepath, filetype=filetype)
+        fileref = vgroup
+    else:
+        # create file reference and add to group
+        fileref = parentgroup.addfile(filepath, filetype=filetype)
+
+    if not targetobj is None and not fileref is None and fileref.isa == u'PBXFileReference':
+        # create buildfile if not header file
+        bpisa = pbxhelper.buildphase_for_filetype(fileref.filetype())
+        if not bpisa == u'PBXHeadersBuildPhase':
+            bp = targetobj.get_build_phase(bpisa, create=True)
+            bp.add_file_reference(fileref, settings=settings)
+
+def _add_tree(targetobj, parentgroup, node, settings=None):
+    """ add the file tree of 'node' (see scan_tree()) to 'parentgroup' """
+    path, filetype, children = node[:3]
+    if children is None:
+        _add_file(targetobj, parentgroup, path, filetype, settings)
+    else:
+        subgroup = parentgroup.addgroup(path)
+        for child in children:
+            _add_tree(targetobj, subgroup, child, settings)
+
+def addfile(xcproj, path, groupobj, targetobj=None, copy=False, settings=None, jobs=None):
     """
     add file/directory at 'filepath' to 'groupobj', 
-    and create buildfile for files and then add to 'targetobj'
+    and create buildfile for files and then add to 'targetobj'.
+    the file tree is walked by scan_tree() first, then the groups, file references and build files 
+    are added in one batch of 'xcproj', without touching the disk.
     :param xcproj:      the xcodeproj
     :param targetobj:   the target to add buildfile for files in filepath
     :param groupobj:    the group where files added to.
     :param copy:        if True and if filepath is not in PROJECT_DIR, copy files to PROJECT_DIR
     :param settings:    the build settings for build file
+    :param jobs:        the number of threads to walk the file tree, SCAN_JOBS if None
     """
-
-    def __addfile(xcproj, targetobj, parentgroup, filepath, settings=None):
-        """ add single file """
-        if func.hasprefix(os.path.basename(filepath), u'.'):
-            return
-
-        fileref = None
-        dirname, dirext = os.path.splitext(os.path.basename(os.path.dirname(filepath)))
-        if dirext == u'.lproj':
-            # create variant group
-            group_name = os.path.basename(filepath)
-            group_path = os.path.abspath(os.path.dirname(os.path.dirname(filepath)))
-            vgroup = parentgroup.add_variant_group(group_path, group_name)
-            lproj_ref = vgroup.addfile(filepath)
-            fileref = vgroup
-        else:
-            # create file reference and add to group
-            fileref = parentgroup.addfile(filepath)
-
-        if not targetobj is None and not fileref is None and fileref.isa == u'PBXFileReference':
-            # create buildfile if not header file
-            bpisa = pbxhelper.buildphase_for_filetype(fileref.filetype())
-            if not bpisa == u'PBXHeadersBuildPhase':
-                bp = targetobj.get_build_phase(bpisa, create=True)
-                bp.add_file_reference(fileref, settings=settings)
-    # end of __addfile()
-
-    def __recursively_add(xcproj, targetobj, parentgroup, path, settings):
-        if func.hasprefix(os.path.basename(path), u'.'):
-            return
-
-        if os.path.isfile(path):
-            __addfile(xcproj, targetobj, parentgroup, path, settings)
-        elif os.path.isdir(path):
-            dirext = os.path.splitext(path)[1]
-            filetype = pbxconsts.FILETYPE_BY_EXT.get(dirext)
-            if not filetype is None and filetype in pbxconsts.FOLDER_FILE_TYPE:
-                __addfile(xcproj, targetobj, parentgroup, path, settings)
-            else:
-                subgroup = parentgroup.addgroup(path)
-                for fn in os.listdir(path):
-                    __recursively_add(xcproj, targetobj, subgroup, os.path.join(path, fn), settings)
-    # end of __recursively_add
-
-    filepath = os.path.abspath(filepath)
+    filepath = os.path.abspath(path)
     if not pbxpath.issubpath(filepath, xcproj.project_dir()) and copy:
         dstpath = os.path.join(groupobj.realpath(), os.path.basename(filepath))
         if os.path.isdir(filepath):
@@ -86,7 +227,174 @@ def addfile(xcproj, path, groupobj, targetobj=None, copy=False, settings=None):
             shutil.copy2(filepath, dstpath)
         filepath = dstpath
 
-    __recursively_add(xcproj, targetobj, groupobj, filepath, settings)
+    root = scan_tree(filepath, jobs)
+    if not root is None:
+        with xcproj.batch(rollback=False):
+            _add_tree(targetobj, groupobj, root, settings)
+
+
+def _group_tree(groupobj, dirpath):
+    """
+    return ({realpath: PBXFileReference}, {realpath: PBXGroup}) in the subtree of 'groupobj', 
+    which are located in 'dirpath'. the files of the variant groups are included.
+    """
+    filerefs = {}
+    groups = {}
+    def __collect(parent):
+        for child in parent.pbx_children:
+            if child.isa == u'PBXFileReference':
+                path = child.realpath()
+                if pbxpath.issubpath(path, dirpath) and not path in filerefs:
+                    filerefs[path] = child
+            elif child.isa == u'PBXGroup' or child.isa == u'PBXVariantGroup':
+                path = child.realpath()
+                if child.isa == u'PBXGroup' and pbxpath.issubpath(path, dirpath) \
+                    and not path in groups:
+                    groups[path] = child
+                __collect(child)
+    # end of __collect
+
+    __collect(groupobj)
+    return filerefs, groups
+
+def _tree_key(filerefs, groups):
+    """ return the key of the subtree by _group_tree(), which changes with its objects and paths """
+    return frozenset([(p, o.guid) for p, o in filerefs.items()] \
+        + [(p, o.guid) for p, o in groups.items()])
+
+def _is_hidden(path, dirpath):
+    """ return True if 'path' is hidden or in a hidden directory of 'dirpath', see _listdir() """
+    return any([func.hasprefix(n, u'.') for n in os.path.relpath(path, dirpath).split(os.sep)])
+
+def _tree_nodes(root):
+    """ return [node] of all the files and directories under the directory node 'root' """
+    nodes = []
+    dirs = [root]
+    while len(dirs) > 0:
+        for child in dirs.pop()[2]:
+            nodes.append(child)
+            if not child[2] is None:
+                dirs.append(child)
+    return nodes
+
+def _in_lproj(path):
+    """ return True if 'path' is a localized file, eg: xxx.lproj/Localizable.strings """
+    return os.path.splitext(os.path.dirname(path))[1] == u'.lproj'
+
+# the source trees of the file references which can be moved by sync_group()
+_MOVABLE_SOURCE_TREES = frozenset([pbxconsts.SOURCE_TREE.group, \
+    pbxconsts.SOURCE_TREE.source_root, pbxconsts.SOURCE_TREE.absolute])
+
+def sync_group(xcproj, groupobj, dirpath, targetobj=None, settings=None, jobs=None):
+    """
+    make the subtree of 'groupobj' mirror the directory 'dirpath':
+        the files and directories new on disk are added as addfile() does, 
+        build files of the new files are added to 'targetobj';
+        the file references and groups located in 'dirpath' but gone from disk are removed,
+        with their build files;
+        the files moved or renamed on disk (the same inode as the last sync) are moved,
+        keeping their build files.
+    the objects not located in 'dirpath', and the hidden ones which are never listed, 
+    are left untouched.
+    the snapshots of the directory and the group subtree are kept in 'xcproj', if neither of 
+    them changed since the last sync, nothing is done after the directory is listed.
+    return ([added path], [removed path], [(old path, new path)])
+    """
+    dirpath = os.path.normpath(os.path.abspath(dirpath))
+    if not os.path.isdir(dirpath):
+        raise ValueError(u'not a directory: {0}'.format(dirpath))
+
+    jobs = SCAN_JOBS if jobs is None else jobs
+    root = [dirpath, None, [], None] # even if 'dirpath' looks like a folder file, eg: xxx.bundle
+    _walk(root, jobs)
+    nodes = _tree_nodes(root)
+    snapshot = {n[0]: (not n[2] is None, n[3]) for n in nodes} # {path: (isgroup, inode)}
+
+    filerefs, groups = _group_tree(groupobj, dirpath)
+    tree = _tree_key(filerefs, groups)
+    key = (groupobj.guid, dirpath)
+    last_tree, last_snapshot = xcproj._sync_snapshots().get(key, (None, None))
+    if last_tree == tree and last_snapshot == snapshot:
+        return [], [], [] # nothing changed
+
+    removed = [p for p in filerefs \
+        if snapshot.get(p, (True,))[0] and not _is_hidden(p, dirpath)]
+    added = [p for p, (isgroup, inode) in snapshot.items() if not isgroup and not p in filerefs]
+
+    # the moved files: the same inode as the removed ones in the last snapshot
+    moved = []
+    if not last_snapshot is None and len(removed) > 0 and len(added) > 0:
+        removed_by_inode = {}
+        for path in removed:
+            isgroup, inode = last_snapshot.get(path, (True, None))
+            if not isgroup and not inode is None and not _in_lproj(path) \
+                and filerefs[path].pbx_sourceTree in _MOVABLE_SOURCE_TREES:
+                removed_by_inode[inode] = path
+        for path in added:
+            oldpath = removed_by_inode.pop(snapshot[path][1], None)
+            if not oldpath is None and not _in_lproj(path) \
+                and pbxhelper.get_filetype(path) == filerefs[oldpath].filetype():
+                moved.append((oldpath, path))
+        movedpaths = set([p for pair in moved for p in pair])
+        removed = [p for p in removed if not p in movedpaths]
+        added = [p for p in added if not p in movedpaths]
+
+    # the directories to visit: the new ones and the ancestors of the new or moved files
+    visiting = set([p for p, (isgroup, inode) in snapshot.items() if isgroup and not p in groups])
+    for path in added + [newpath for oldpath, newpath in moved]:
+        path = os.path.dirname(path)
+        while not path == dirpath and not path in visiting:
+            visiting.add(path)
+            path = os.path.dirname(path)
+    addset = set(added)
+    dirgroups = {dirpath: groupobj}
+
+    def __add(parentgroup, node):
+        for child in node[2]:
+            if not child[2] is None:
+                if child[0] in visiting:
+                    dirgroups[child[0]] = parentgroup.addgroup(child[0])
+                    __add(dirgroups[child[0]], child)
+            elif child[0] in addset:
+                _add_file(targetobj, parentgroup, child[0], child[1], settings)
+    # end of __add
+
+    _detect_filetypes([n for n in nodes if n[0] in addset and n[1] is None], jobs)
+    revision = xcproj.revision()
+    with xcproj.batch(rollback=False):
+        __add(groupobj, root)
+
+        for oldpath, newpath in moved:
+            fileref = filerefs[oldpath]
+            parentgroup = dirgroups[os.path.dirname(newpath)]
+            parentgroup.addchild(fileref, move=True)
+            if fileref.pbx_name == os.path.basename(oldpath):
+                fileref.pbx_name = os.path.basename(newpath)
+            pbxpath.set_path_with_source_tree(fileref, newpath, \
+                source_tree=fileref.pbx_sourceTree, parent_group=parentgroup)
+
+        for path in removed:
+            fileref = filerefs[path]
+            owners = list(fileref.owners().values())
+            xcproj.remove_object(fileref)
+            for owner in owners:
+                if owner.isa == u'PBXVariantGroup' and len(owner.pbx_children) == 0:
+                    xcproj.remove_object(owner)
+
+        # the empty groups of the directories gone, the deepest first
+        for path in sorted([p for p in groups \
+            if not snapshot.get(p, (False,))[0] and not _is_hidden(p, dirpath)], \
+            key=len, reverse=True):
+            if len(groups[path].pbx_children) == 0:
+                xcproj.remove_object(groups[path])
+
+    if not revision == xcproj.revision():
+        tree = _tree_key(*_group_tree(groupobj, dirpath))
+    xcproj._sync_snapshots()[key] = (tree, snapshot)
+    if len(added) + len(removed) + len(moved) > 0:
+        logger.verbose(u'[XcodeProj] sync {0}: {1} added, {2} removed, {3} moved'\
+            .format(dirpath, len(added), len(removed), len(moved)))
+    return added, removed, moved
 
 
 def default_project_configuration(config, platform=pbxconsts.PLATFORM.ios, \
@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# encoding:utf-8
+#
+# copyright (c) Alex Lee, All rights reserved.
+
+"""
+Parser of the xcconfig files, eg: the baseConfigurationReference of XCBuildConfiguration.
+
+    // comment
+    #include "Shared.xcconfig"          // relative to the including file
+    #include? "Optional.xcconfig"       // no warning if not exists
+    OTHER_LDFLAGS = $(inherited) -ObjC
+    OTHER_LDFLAGS[sdk=iphonesimulator*][arch=x86_64] = $(inherited) -lsim
+
+the settings of a file and its includes are flattened into {key: value}, the later assignment
+of a key wins, and its $(inherited) is expanded to the earlier one, if any. otherwise it is
+left to refer to the lower layer of the build settings. the conditional keys are kept as they
+are written, without spaces, see split_conditions() and match_conditions().
+every file is parsed once per process while its size, mtime and inode do not change, so an
+include shared by many configurations is parsed once. the least recently used files are dropped
+from the caches beyond CACHE_SIZE.
+"""
+
+import os
+import sys
+ModuleRoot = os.path.abspath(os.path.join(__file__, '../../..'))
+if os.path.isdir(ModuleRoot) and not ModuleRoot in sys.path:
+    sys.path.append(ModuleRoot)
+
+import re
+import fnmatch
+
+from xcodeproj.utils import logger
+from xcodeproj.utils import template
+from xcodeproj.pbxproj import pbxhelper
+
+_INCLUDE_REG = re.compile(u'^\\s*#include(\\?)?\\s*"([^"]*)"')
+_SETTING_REG = re.compile(u'^\\s*([A-Za-z_][A-Za-z0-9_]*)((?:\\s*\\[[^\\]]*\\])*)\\s*=\\s*(.*?)\\s*;?\\s*$')
+_CONDITION_REG = re.compile(u'\\[([^\\]]*)\\]')
+_INHERITED_REG = re.compile(u'\\$(?:\\(inherited\\)|\\{inherited\\})')
+
+# the kinds of the entries of a parsed file
+ENTRY_INCLUDE = 0 # (ENTRY_INCLUDE, path, optional)
+ENTRY_SETTING = 1 # (ENTRY_SETTING, key, value)
+
+CACHE_SIZE = 256 # the max number of the files in each cache
+
+_FILE_CACHE = template.LRUCache(CACHE_SIZE) # {path: (stamp, [entry])}, the parsed files
+_FLAT_CACHE = template.LRUCache(CACHE_SIZE) # {path: ({path: stamp}, {key: value})}, with includes
+
+def _stamp(path):
+    """ return pbxhelper.file_stamp() of the file at 'path', None if not exists """
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        return None
+    return pbxhelper.file_stamp(st)
+
+def _strip_comment(line):
+    """ return 'line' without the '//' comment, the '//' in double quotes is kept """
+    start = line.find(u'//')
+    while start >= 0:
+        if line.count(u'"', 0, start) % 2 == 0:
+            return line[:start]
+        start = line.find(u'//', start + 2)
+    return line
+
+def parse(text, dirpath):
+    """
+    return [entry] of the content of a xcconfig file
+    :param dirpath: the directory of the file, which the include paths are relative to
+    """
+    entries = []
+    for line in text.splitlines():
+        line = _strip_comment(line)
+        match = _INCLUDE_REG.match(line)
+        if not match is None:
+            path = os.path.normpath(os.path.join(dirpath, match.group(2)))
+            entries.append((ENTRY_INCLUDE, path, not match.group(1) is None))
+            continue
+
+        match = _SETTING_REG.match(line)
+        if not match is None:
+            key = match.group(1) + re.sub(u'\\s+', u'', match.group(2))
+            entries.append((ENTRY_SETTING, key, match.group(3)))
+        elif len(line.strip()) > 0:
+            logger.warn(u'[xcconfig] illegal line: {0}'.format(line))
+    return entries
+
+def parse_file(path):
+    """ return [entry] of the xcconfig file at 'path', None if not exists """
+    stamp = _stamp(path)
+    if stamp is None:
+        return None
+    cached = _FILE_CACHE.get(path)
+    if not cached is None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, 'rb') as fp:
+        text = fp.read().decode('utf-8')
+    entries = parse(text, os.path.dirname(path))
+    _FILE_CACHE[path] = (stamp, entries)
+    return entries
+
+def load(path):
+    """
+    return the settings {key: value} of the xcconfig file at 'path' and its includes,
+    {} if not exists. the result is shared, do not change it.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    cached = _FLAT_CACHE.get(path)
+    if not cached is None \
+        and all([_stamp(p) == stamp for p, stamp in cached[0].items()]):
+        return cached[1]
+
+    stamps = {}
+    settings = {}
+    def __inherit(key, value):
+        """ return 'value' with its $(inherited) expanded to the earlier assignment of 'key' """
+        earlier = settings.get(key)
+        if earlier is None or not u'inherited' in value:
+            return value
+        return _INHERITED_REG.sub(lambda m: earlier, value)
+    # end of __inherit
+
+    def __load(path, optional, including):
+        stamps[path] = _stamp(path)
+        entries = parse_file(path)
+        if entries is None:
+            if not optional:
+                logger.warn(u'[xcconfig] not found: {0}'.format(path))
+            return
+
+        for entry in entries:
+            if entry[0] == ENTRY_SETTING:
+                settings[entry[1]] = __inherit(entry[1], entry[2])
+            elif entry[1] in including:
+                logger.warn(u'[xcconfig] recursive include: {0}'.format(entry[1]))
+            else:
+                __load(entry[1], entry[2], including + [entry[1]])
+    # end of __load
+
+    __load(path, False, [path])
+    _FLAT_CACHE[path] = (stamps, settings)
+    return settings
+
+def clear_cache():
+    """ forget all the parsed files """
+    _FILE_CACHE.clear()
+    _FLAT_CACHE.clear()
+
+def split_conditions(key):
+    """
+    split the setting key to (name, ((condition, pattern), ...)),
+    eg: 'OTHER_LDFLAGS[sdk=iphoneos*][arch=arm64]' =>
+            ('OTHER_LDFLAGS', (('sdk', 'iphoneos*'), ('arch', 'arm64')))
+    """
+    start = key.find(u'[')
+    if start < 0:
+        return key, ()
+    conditions = []
+    for group in _CONDITION_REG.findall(key[start:]):
+        for cond in group.split(u','):
+            name, sep, pattern = cond.partition(u'=')
+            conditions.append((name.strip(), pattern.strip()))
+    return key[:start].strip(), tuple(conditions)
+
+def match_conditions(conditions, context):
+    """
+    return True if all the 'conditions' match 'context',
+    :param context: function(condition) to return the current value of a condition,
+                    eg: 'sdk' => 'iphoneos11.0', None if it is unknown, which never matches.
+    """
+    for name, pattern in conditions:
+        value = context(name)
+        if value is None or not fnmatch.fnmatchcase(value, pattern):
+            return False
+    return True
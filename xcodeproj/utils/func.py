@@ -48,9 +48,13 @@ def remove_list_item(l, item, remove_all=False):
 def take(func, l, s=1):
     """ take first 's' items from sequence 'l' with filter 'func' """
     ret = []
+    if s <= 0:
+        return ret
     for item in l:
-        if func(item) and len(ret) < s:
+        if func(item):
             ret.append(item)
+            if len(ret) >= s:
+                break
     return ret
 
 def filter_items(func, l):
@@ -1,6 +1,9 @@
 #!/usr/bin/python
 #encoding:utf-8
 
+import collections
+import threading
+
 
 # 用装饰器实现单例
 def singleton(cls, *args, **kw):
@@ -15,3 +18,44 @@ def singleton(cls, *args, **kw):
 
 def enum(**enums):
     return type('Enum', (), enums)
+
+
+class LRUCache(object):
+    """
+    the cache of at most 'capacity' items, the least recently used ones are dropped first.
+    it is thread safe, eg: filled by the threads walking a file tree.
+    """
+
+    def __init__(self, capacity):
+        self.__capacity = capacity
+        self.__items = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def capacity(self):
+        return self.__capacity
+
+    def get(self, key, default=None):
+        """ return the value of 'key' and mark it as the most recently used """
+        with self.__lock:
+            if not key in self.__items:
+                return default
+            value = self.__items.pop(key)
+            self.__items[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        with self.__lock:
+            self.__items.pop(key, None)
+            self.__items[key] = value
+            while len(self.__items) > self.__capacity:
+                self.__items.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.__items
+
+    def __len__(self):
+        return len(self.__items)
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()